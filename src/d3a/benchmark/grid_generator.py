@@ -0,0 +1,159 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of D3A.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from contextlib import contextmanager
+from pendulum import duration, datetime
+
+from d3a.constants import TIME_ZONE
+from d3a.models.area import Area
+from d3a.models.config import SimulationConfig
+from d3a.models.strategy.commercial_producer import CommercialStrategy
+from d3a.models.strategy.load_hours import LoadHoursStrategy
+from d3a.models.strategy.pv import PVStrategy
+from d3a.models.strategy.storage import StorageStrategy
+from d3a_interface.constants_limits import ConstSettings
+from d3a_interface.exceptions import D3AException
+
+BENCHMARK_START_DATE = datetime(2021, 6, 1, tz=TIME_ZONE)
+BENCHMARK_SLOT_LENGTH = duration(minutes=15)
+
+
+def _load(house_name, device_number):
+    return Area(f"{house_name} Load {device_number}",
+                strategy=LoadHoursStrategy(avg_power_W=200, hrs_per_day=24,
+                                           hrs_of_day=list(range(24)),
+                                           final_buying_rate=35))
+
+
+def _pv(house_name, device_number):
+    return Area(f"{house_name} PV {device_number}",
+                strategy=PVStrategy(panel_count=4, initial_selling_rate=30,
+                                    final_selling_rate=5))
+
+
+def _storage(house_name, device_number):
+    return Area(f"{house_name} Storage {device_number}",
+                strategy=StorageStrategy(initial_soc=50))
+
+
+# The devices of a house are created by cycling through this list
+DEVICE_FACTORIES = (_load, _pv, _storage)
+
+
+class GridParameters:
+    """
+    Parameters of a synthetic grid:
+    :param houses: Number of houses
+    :param depth: Number of area levels above the houses, 1 means that all houses are
+                  children of the grid area. Every additional level splits the houses in two.
+    :param devices_per_house: Number of devices per house, alternately load, PV and storage
+    :param market_type: 1 (one sided), 2 (two sided pay as bid), 3 (two sided pay as clear)
+    :param market_count: Number of future markets
+    :param ticks_per_slot: Number of ticks per 15 minutes market slot
+    :param slots: Number of market slots that a simulation of the grid runs for
+    """
+    fields = ("houses", "depth", "devices_per_house", "market_type", "market_count",
+              "ticks_per_slot", "slots")
+
+    def __init__(self, houses=10, depth=1, devices_per_house=3, market_type=1, market_count=1,
+                 ticks_per_slot=15, slots=4):
+        self.houses = houses
+        self.depth = depth
+        self.devices_per_house = devices_per_house
+        self.market_type = market_type
+        self.market_count = market_count
+        self.ticks_per_slot = ticks_per_slot
+        self.slots = slots
+        self._validate()
+
+    def _validate(self):
+        if self.houses < 1 or self.depth < 1 or self.devices_per_house < 1:
+            raise D3AException("The benchmark grid needs at least one house, one area level "
+                               "and one device per house.")
+        if self.market_type not in (1, 2, 3):
+            raise D3AException(f"Invalid market type {self.market_type}.")
+        if BENCHMARK_SLOT_LENGTH.in_seconds() % self.ticks_per_slot != 0:
+            raise D3AException(f"{self.ticks_per_slot} ticks do not evenly divide the "
+                               f"{BENCHMARK_SLOT_LENGTH.in_minutes()} minutes market slot.")
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.fields}
+
+    def __repr__(self):
+        return "<GridParameters({})>".format(
+            ", ".join(f"{k}={v}" for k, v in self.as_dict().items()))
+
+
+def create_simulation_config(parameters: GridParameters):
+    return SimulationConfig(
+        sim_duration=BENCHMARK_SLOT_LENGTH * parameters.slots,
+        slot_length=BENCHMARK_SLOT_LENGTH,
+        tick_length=duration(
+            seconds=BENCHMARK_SLOT_LENGTH.in_seconds() // parameters.ticks_per_slot),
+        market_count=parameters.market_count,
+        cloud_coverage=ConstSettings.PVSettings.DEFAULT_POWER_PROFILE,
+        start_date=BENCHMARK_START_DATE,
+        external_connection_enabled=False
+    )
+
+
+@contextmanager
+def market_type_setting(market_type):
+    """Temporarily switch ConstSettings.IAASettings.MARKET_TYPE"""
+    previous_market_type = ConstSettings.IAASettings.MARKET_TYPE
+    ConstSettings.IAASettings.MARKET_TYPE = market_type
+    try:
+        yield
+    finally:
+        ConstSettings.IAASettings.MARKET_TYPE = previous_market_type
+
+
+def _generate_house(house_number, parameters):
+    house_name = f"House {house_number}"
+    return Area(house_name, [
+        DEVICE_FACTORIES[i % len(DEVICE_FACTORIES)](house_name, i + 1)
+        for i in range(parameters.devices_per_house)
+    ])
+
+
+def _generate_level(name, house_numbers, remaining_depth, parameters):
+    if remaining_depth <= 1 or len(house_numbers) <= 1:
+        return [_generate_house(number, parameters) for number in house_numbers]
+    half = (len(house_numbers) + 1) // 2
+    return [
+        Area(f"{name}-{index}",
+             _generate_level(f"{name}-{index}", numbers, remaining_depth - 1, parameters))
+        for index, numbers in enumerate((house_numbers[:half], house_numbers[half:]), start=1)
+    ]
+
+
+def generate_grid(parameters: GridParameters, config: SimulationConfig):
+    """
+    Create the area tree of a synthetic grid. A commercial energy producer is connected to the
+    top level area in order to guarantee that all loads can be supplied.
+    """
+    house_numbers = list(range(1, parameters.houses + 1))
+    return Area(
+        "Grid",
+        [*_generate_level("Street", house_numbers, parameters.depth, parameters),
+         Area("Commercial Energy Producer", strategy=CommercialStrategy(energy_rate=30))],
+        config=config
+    )
+
+
+def count_areas(area):
+    return 1 + sum(count_areas(child) for child in area.children)
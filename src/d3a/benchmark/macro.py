@@ -0,0 +1,67 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of D3A.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from pendulum import now
+
+from d3a.benchmark.grid_generator import GridParameters, create_simulation_config, \
+    generate_grid, market_type_setting
+from d3a.constants import TIME_ZONE
+from d3a.d3a_core.simulation import Simulation
+
+
+class _GeneratedSetupModule:
+    """Stands in for a d3a.setup module, returning the synthetic grid"""
+
+    def __init__(self, parameters: GridParameters):
+        self.parameters = parameters
+
+    def get_setup(self, config):
+        return generate_grid(self.parameters, config)
+
+
+class BenchmarkSimulation(Simulation):
+    """Simulation of a synthetic grid that runs headless (no console input) and without export"""
+
+    def __init__(self, parameters: GridParameters, seed=0):
+        self.grid_parameters = parameters
+        super().__init__(setup_module_name="benchmark",
+                         simulation_config=create_simulation_config(parameters),
+                         seed=seed, no_export=True)
+
+    def _load_setup_module(self):
+        self.setup_module = _GeneratedSetupModule(self.grid_parameters)
+
+    def run(self, initial_slot=0):
+        self.sim_status = "running"
+        self.is_stopped = False
+        self.run_start = now(tz=TIME_ZONE)
+        self.paused_time = 0
+        self._execute_simulation(initial_slot, 0)
+
+
+def simulation_run(parameters: GridParameters, seed=0):
+    """
+    Prepare the simulation of the synthetic grid and return the callable that runs all of its
+    market slots
+    """
+    with market_type_setting(parameters.market_type):
+        simulation = BenchmarkSimulation(parameters, seed=seed)
+
+    def run():
+        with market_type_setting(parameters.market_type):
+            simulation.run()
+    return run
@@ -0,0 +1,103 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of D3A.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import json
+import tracemalloc
+
+from d3a.benchmark.grid_generator import BENCHMARK_START_DATE
+from d3a.models.market.market_structures import Offer, BalancingOffer, Bid, Trade, \
+    BalancingTrade, TradeBidOfferInfo
+
+MEMORY_RESULTS_FORMAT_VERSION = 1
+
+
+def _offer(i):
+    return Offer(f"offer-{i}", BENCHMARK_START_DATE, 2.0, 1.0, "Seller", 2.0, "Seller")
+
+
+# Market structure name -> (factory of the attribute values, constructor)
+# The attribute values are created before the measurement, in order for the footprint to
+# only contain the market structure itself.
+MARKET_STRUCTURES = {
+    "Offer": (lambda i: (f"offer-{i}", BENCHMARK_START_DATE, 2.0, 1.0, "Seller", 2.0,
+                         "Seller"), Offer),
+    "BalancingOffer": (lambda i: (f"offer-{i}", BENCHMARK_START_DATE, 2.0, 1.0, "Seller",
+                                  2.0, "Seller"), BalancingOffer),
+    "Bid": (lambda i: (f"bid-{i}", BENCHMARK_START_DATE, 2.0, 1.0, "Buyer", 2.0, "Buyer"),
+            Bid),
+    "Trade": (lambda i: (f"trade-{i}", BENCHMARK_START_DATE, _offer(i), "Seller", "Buyer",
+                         None, False, None, "Seller", "Buyer", 0.0), Trade),
+    "BalancingTrade": (lambda i: (f"trade-{i}", BENCHMARK_START_DATE, _offer(i), "Seller",
+                                  "Buyer", None, None, "Seller", "Buyer", 0.0),
+                       BalancingTrade),
+    "TradeBidOfferInfo": (lambda i: (2.0, 2.0, 1.0, 1.0, 1.5), TradeBidOfferInfo),
+}
+
+
+def object_footprint(value_factory, constructor, count):
+    """
+    Average number of bytes that are allocated per object by constructor, measured with
+    tracemalloc over count objects
+    """
+    arguments = [value_factory(i) for i in range(count)]
+    objects = [None] * count
+    tracemalloc.start()
+    try:
+        start_size, _ = tracemalloc.get_traced_memory()
+        for i, args in enumerate(arguments):
+            objects[i] = constructor(*args)
+        end_size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (end_size - start_size) / count
+
+
+def measure_market_structures(count=10000):
+    return {
+        "format_version": MEMORY_RESULTS_FORMAT_VERSION,
+        "count": count,
+        "structures": {
+            name: {"bytes_per_object": object_footprint(value_factory, constructor, count)}
+            for name, (value_factory, constructor) in MARKET_STRUCTURES.items()
+        }
+    }
+
+
+def write_memory_results(results, path):
+    with open(path, "w") as outfile:
+        json.dump(results, outfile, indent=2)
+
+
+def read_memory_results(path):
+    with open(path, "r") as infile:
+        return json.load(infile)
+
+
+def format_memory_results(results, baseline=None):
+    """Table of the per-object footprints, next to the ones of baseline if provided"""
+    baseline_structures = baseline["structures"] if baseline is not None else {}
+    lines = [f"{'structure':<20} {'baseline [B]':>14} {'bytes/object':>14} {'ratio':>8}"]
+    for name, result in results["structures"].items():
+        footprint = result["bytes_per_object"]
+        if name in baseline_structures:
+            baseline_footprint = baseline_structures[name]["bytes_per_object"]
+            baseline_str = f"{baseline_footprint:.1f}"
+            ratio = f"{footprint / baseline_footprint:.3f}" if baseline_footprint else "-"
+        else:
+            baseline_str, ratio = "-", "-"
+        lines.append(f"{name:<20} {baseline_str:>14} {footprint:>14.1f} {ratio:>8}")
+    return "\n".join(lines)
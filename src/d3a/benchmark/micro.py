@@ -0,0 +1,89 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of D3A.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from d3a.benchmark.grid_generator import BENCHMARK_START_DATE
+from d3a.models.area import Area
+from d3a.models.market.one_sided import OneSidedMarket
+from d3a.models.market.two_sided_pay_as_bid import TwoSidedPayAsBid
+from d3a.models.market.two_sided_pay_as_clear import TwoSidedPayAsClear
+from d3a.models.strategy.area_agents.one_sided_agent import OneSidedAgent
+
+
+def _order_parameters(size, random_generator):
+    energy_rates = random_generator.uniform(10, 35, size)
+    energies = random_generator.uniform(0.1, 2, size)
+    return [(float(rate * energy), float(energy)) for rate, energy in zip(energy_rates, energies)]
+
+
+def _post_offers(market, orders):
+    for i, (price, energy) in enumerate(orders):
+        market.offer(price, energy, f"Seller {i}", f"Seller {i}")
+
+
+def _post_bids(market, orders):
+    for i, (price, energy) in enumerate(orders):
+        market.bid(price, energy, f"Buyer {i}", f"Buyer {i}")
+
+
+def offer_insertion(size, random_generator):
+    market = OneSidedMarket(time_slot=BENCHMARK_START_DATE, name="Benchmark")
+    orders = _order_parameters(size, random_generator)
+    return lambda: _post_offers(market, orders)
+
+
+def bid_insertion(size, random_generator):
+    market = TwoSidedPayAsBid(time_slot=BENCHMARK_START_DATE, name="Benchmark")
+    orders = _order_parameters(size, random_generator)
+    return lambda: _post_bids(market, orders)
+
+
+def pay_as_bid_matching(size, random_generator):
+    market = TwoSidedPayAsBid(time_slot=BENCHMARK_START_DATE, name="Benchmark")
+    _post_offers(market, _order_parameters(size, random_generator))
+    _post_bids(market, _order_parameters(size, random_generator))
+    return market.match_offers_bids
+
+
+def pay_as_clear_matching(size, random_generator):
+    market = TwoSidedPayAsClear(time_slot=BENCHMARK_START_DATE, name="Benchmark")
+    # Market clearing only takes place on the ticks of the clearing interval
+    market.update_clock(int(market.mcp_update_point) - 1)
+    _post_offers(market, _order_parameters(size, random_generator))
+    _post_bids(market, _order_parameters(size, random_generator))
+    return market.match_offers_bids
+
+
+def offer_forwarding(size, random_generator):
+    lower_market = OneSidedMarket(time_slot=BENCHMARK_START_DATE, name="House 1")
+    higher_market = OneSidedMarket(time_slot=BENCHMARK_START_DATE, name="Grid")
+    agent = OneSidedAgent(owner=Area("House 1"), higher_market=higher_market,
+                          lower_market=lower_market, min_offer_age=0)
+    engine = next(engine for engine in agent.engines
+                  if engine.markets.source is lower_market)
+    _post_offers(lower_market, _order_parameters(size, random_generator))
+    return lambda: engine.propagate_offer(current_tick=0)
+
+
+# Every micro benchmark receives the number of orders and a random generator, prepares its
+# fixture and returns the callable whose execution is timed.
+MICRO_BENCHMARKS = {
+    "offer_insertion": offer_insertion,
+    "bid_insertion": bid_insertion,
+    "pay_as_bid_matching": pay_as_bid_matching,
+    "pay_as_clear_matching": pay_as_clear_matching,
+    "offer_forwarding": offer_forwarding,
+}
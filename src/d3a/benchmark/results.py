@@ -0,0 +1,141 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of D3A.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import json
+import platform
+import statistics
+from time import perf_counter
+
+from numpy.random import RandomState
+from pendulum import now
+
+from d3a.constants import TIME_ZONE, DATE_TIME_FORMAT
+
+BENCHMARK_RESULTS_FORMAT_VERSION = 1
+DEFAULT_REGRESSION_THRESHOLD = 0.1
+
+
+def time_benchmark(prepare, repeat):
+    """
+    Time a benchmark repeat times.
+    :param prepare: Callable that creates a fresh fixture and returns the callable to time
+    :param repeat: Number of timed executions
+    :return: Result dict containing the timing samples and their statistics in seconds
+    """
+    samples = []
+    for _ in range(repeat):
+        benchmark = prepare()
+        start = perf_counter()
+        benchmark()
+        samples.append(perf_counter() - start)
+    return {
+        "repeat": repeat,
+        "min_s": min(samples),
+        "max_s": max(samples),
+        "mean_s": statistics.mean(samples),
+        "median_s": statistics.median(samples),
+        "samples_s": samples,
+    }
+
+
+def run_benchmarks(benchmarks, repeat, seed=0):
+    """
+    :param benchmarks: Dict of benchmark name -> (kind, parameters dict, benchmark function),
+                       benchmark function being called with a seeded random generator and
+                       returning the callable to time
+    """
+    results = {}
+    for name, (kind, parameters, benchmark) in benchmarks.items():
+        random_generator = RandomState(seed)
+        results[name] = {
+            "kind": kind,
+            "parameters": parameters,
+            **time_benchmark(lambda: benchmark(random_generator), repeat),
+        }
+    return {
+        "format_version": BENCHMARK_RESULTS_FORMAT_VERSION,
+        "created": now(tz=TIME_ZONE).format(f"{DATE_TIME_FORMAT}:ss"),
+        "seed": seed,
+        "environment": {
+            "python_implementation": platform.python_implementation(),
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "benchmarks": results,
+    }
+
+
+def write_results(results, path):
+    with open(path, "w") as outfile:
+        json.dump(results, outfile, indent=2)
+
+
+def read_results(path):
+    with open(path, "r") as infile:
+        return json.load(infile)
+
+
+def compare_results(baseline, candidate, threshold=DEFAULT_REGRESSION_THRESHOLD):
+    """
+    Compare the median timings of two benchmark runs.
+    :param threshold: Relative slowdown (e.g. 0.1 for 10%) above which a benchmark is flagged
+                      as a regression, respectively speedup for an improvement
+    :return: List of dicts with the name, both medians, the ratio candidate / baseline and the
+             status (regression, improvement, unchanged, added, removed) per benchmark
+    """
+    baseline_benchmarks = baseline["benchmarks"]
+    candidate_benchmarks = candidate["benchmarks"]
+    comparison = []
+    for name in sorted(set(baseline_benchmarks) | set(candidate_benchmarks)):
+        if name not in candidate_benchmarks:
+            comparison.append({"name": name, "baseline_s": baseline_benchmarks[name]["median_s"],
+                               "candidate_s": None, "ratio": None, "status": "removed"})
+            continue
+        if name not in baseline_benchmarks:
+            comparison.append({"name": name, "baseline_s": None,
+                               "candidate_s": candidate_benchmarks[name]["median_s"],
+                               "ratio": None, "status": "added"})
+            continue
+        baseline_s = baseline_benchmarks[name]["median_s"]
+        candidate_s = candidate_benchmarks[name]["median_s"]
+        ratio = candidate_s / baseline_s if baseline_s > 0 else float("inf")
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "unchanged"
+        comparison.append({"name": name, "baseline_s": baseline_s, "candidate_s": candidate_s,
+                           "ratio": ratio, "status": status})
+    return comparison
+
+
+def has_regressions(comparison):
+    return any(row["status"] == "regression" for row in comparison)
+
+
+def format_comparison(comparison):
+    def _format_seconds(value):
+        return "-" if value is None else f"{value:.6f}"
+
+    lines = [f"{'benchmark':<50} {'baseline [s]':>14} {'candidate [s]':>14} "
+             f"{'ratio':>8}  status"]
+    for row in comparison:
+        ratio = "-" if row["ratio"] is None else f"{row['ratio']:.3f}"
+        lines.append(f"{row['name']:<50} {_format_seconds(row['baseline_s']):>14} "
+                     f"{_format_seconds(row['candidate_s']):>14} {ratio:>8}  {row['status']}")
+    return "\n".join(lines)
@@ -0,0 +1,62 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of D3A.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from itertools import product
+
+from d3a.benchmark.grid_generator import GridParameters
+from d3a.benchmark.macro import simulation_run
+from d3a.benchmark.micro import MICRO_BENCHMARKS
+
+
+def micro_benchmark_name(benchmark_name, size):
+    return f"micro/{benchmark_name}[size={size}]"
+
+
+def macro_benchmark_name(parameters: GridParameters):
+    return "macro/simulation[{}]".format(
+        ",".join(f"{k}={v}" for k, v in parameters.as_dict().items()))
+
+
+def build_micro_benchmarks(sizes):
+    return {
+        micro_benchmark_name(name, size): (
+            "micro", {"size": size},
+            lambda random_generator, benchmark=benchmark, size=size:
+                benchmark(size, random_generator))
+        for name, benchmark in MICRO_BENCHMARKS.items()
+        for size in sizes
+    }
+
+
+def build_macro_benchmarks(grid_parameter_list, seed=0):
+    return {
+        macro_benchmark_name(parameters): (
+            "macro", parameters.as_dict(),
+            lambda _, parameters=parameters: simulation_run(parameters, seed))
+        for parameters in grid_parameter_list
+    }
+
+
+def grid_parameter_matrix(houses, depths, devices_per_house, market_types, market_counts,
+                          ticks_per_slot, slots):
+    """GridParameters for the cartesian product of the given value lists"""
+    return [
+        GridParameters(houses=h, depth=d, devices_per_house=dev, market_type=mt,
+                       market_count=mc, ticks_per_slot=t, slots=slots)
+        for h, d, dev, mt, mc, t in product(houses, depths, devices_per_house, market_types,
+                                            market_counts, ticks_per_slot)
+    ]
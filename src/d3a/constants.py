@@ -46,3 +46,12 @@ IS_CANARY_NETWORK = False
 CN_PROFILE_EXPANSION_DAYS = 7
 
 RUN_IN_REALTIME = False
+
+# Records the time spent per tick, phase, area, strategy and market type and exports it as
+# tick_profile.json / tick_profile.csv next to the simulation results
+ENABLE_TICK_PROFILING = False
+
+# Publishes the intermediate results as deltas that only contain what changed since the
+# previous report, instead of the full results of every market slot. Enabled for the
+# simulations of the redis job queue via the environment variable D3A_INCREMENTAL_RESULTS=yes
+INCREMENTAL_RESULTS = False
@@ -35,7 +35,14 @@ from d3a.d3a_core.util import IntervalType, read_settings_from_file, \
     DateType, available_simulation_scenarios
 from d3a.d3a_core.simulation import run_simulation
 from d3a.constants import TIME_ZONE, DATE_TIME_FORMAT, DATE_FORMAT, TIME_FORMAT
+import d3a.constants
 from d3a_interface.settings_validators import validate_global_settings
+from d3a.benchmark.results import run_benchmarks, write_results, read_results, \
+    compare_results, format_comparison, has_regressions, DEFAULT_REGRESSION_THRESHOLD
+from d3a.benchmark.suite import build_micro_benchmarks, build_macro_benchmarks, \
+    grid_parameter_matrix
+from d3a.benchmark.memory import measure_market_structures, write_memory_results, \
+    read_memory_results, format_memory_results
 
 log = getLogger(__name__)
 
@@ -100,14 +107,20 @@ _setup_modules = available_simulation_scenarios
 @click.option('--start-date', type=DateType(DATE_FORMAT),
               default=today(tz=TIME_ZONE).format(DATE_FORMAT), show_default=True,
               help=f"Start date of the Simulation ({DATE_FORMAT})")
+@click.option('--enable-tick-profiling', is_flag=True, default=False,
+              help="Profile the time spent per tick, phase, area, strategy and market type "
+                   "and export it next to the simulation results")
 def run(setup_module_name, settings_file, duration, slot_length, tick_length,
         market_count, cloud_coverage, compare_alt_pricing, enable_external_connection, start_date,
-        pause_at, slot_length_realtime, **kwargs):
+        pause_at, slot_length_realtime, enable_tick_profiling, **kwargs):
 
     # Force the multiprocessing start method to be 'fork' on macOS.
     if platform.system() == 'Darwin':
         multiprocessing.set_start_method('fork')
 
+    if enable_tick_profiling:
+        d3a.constants.ENABLE_TICK_PROFILING = True
+
     try:
         if settings_file is not None:
             simulation_settings, advanced_settings = read_settings_from_file(settings_file)
@@ -153,3 +166,84 @@ def run(setup_module_name, settings_file, duration, slot_length, tick_length,
 
     except D3AException as ex:
         raise click.BadOptionUsage(ex.args[0])
+
+
+@main.group()
+def benchmark():
+    """Benchmarks of the simulation core"""
+
+
+@benchmark.command("run")
+@click.option('-o', '--output', type=click.Path(dir_okay=False, writable=True),
+              default="benchmark_results.json", show_default=True,
+              help="JSON file the results are written to")
+@click.option('--micro/--no-micro', default=True, show_default=True,
+              help="Run the market and inter area agent micro benchmarks")
+@click.option('--macro/--no-macro', default=True, show_default=True,
+              help="Run headless simulations of synthetic grids")
+@click.option('--size', 'sizes', type=int, multiple=True, default=(100, 1000), show_default=True,
+              help="Number of orders of the micro benchmarks (repeatable)")
+@click.option('--houses', type=int, multiple=True, default=(10, ), show_default=True,
+              help="Number of houses of the synthetic grid (repeatable)")
+@click.option('--depth', 'depths', type=int, multiple=True, default=(1, ), show_default=True,
+              help="Number of area levels above the houses (repeatable)")
+@click.option('--devices-per-house', type=int, multiple=True, default=(3, ), show_default=True,
+              help="Number of devices per house (repeatable)")
+@click.option('--market-type', 'market_types', type=Choice(["1", "2", "3"]), multiple=True,
+              default=("1", "2", "3"), show_default=True,
+              help="Market type of the synthetic grid (repeatable)")
+@click.option('-m', '--market-count', 'market_counts', type=int, multiple=True, default=(1, ),
+              show_default=True, help="Number of future markets (repeatable)")
+@click.option('--ticks-per-slot', type=int, multiple=True, default=(15, ), show_default=True,
+              help="Number of ticks per 15 minutes market slot (repeatable)")
+@click.option('--slots', type=int, default=4, show_default=True,
+              help="Number of market slots that every simulation runs for")
+@click.option('-r', '--repeat', type=int, default=3, show_default=True,
+              help="Number of timed executions per benchmark")
+@click.option('--seed', type=int, default=0, show_default=True, help="Random seed")
+def run_benchmark(output, micro, macro, sizes, houses, depths, devices_per_house, market_types,
+                  market_counts, ticks_per_slot, slots, repeat, seed):
+    benchmarks = {}
+    try:
+        if micro:
+            benchmarks.update(build_micro_benchmarks(sizes))
+        if macro:
+            benchmarks.update(build_macro_benchmarks(grid_parameter_matrix(
+                houses, depths, devices_per_house, [int(mt) for mt in market_types],
+                market_counts, ticks_per_slot, slots), seed))
+    except D3AException as ex:
+        raise click.BadOptionUsage(ex.args[0])
+    results = run_benchmarks(benchmarks, repeat, seed)
+    write_results(results, output)
+    for name, result in results["benchmarks"].items():
+        log.info(f"{name}: median {result['median_s']:.6f}s, min {result['min_s']:.6f}s")
+    log.info(f"Benchmark results written to {output}.")
+
+
+@benchmark.command("compare")
+@click.argument('baseline', type=click.Path(exists=True, dir_okay=False))
+@click.argument('candidate', type=click.Path(exists=True, dir_okay=False))
+@click.option('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD, show_default=True,
+              help="Relative slowdown of the median above which a benchmark is a regression")
+def compare_benchmark(baseline, candidate, threshold):
+    """Compare two benchmark result files, exits with 1 if a regression was found"""
+    comparison = compare_results(read_results(baseline), read_results(candidate), threshold)
+    click.echo(format_comparison(comparison))
+    if has_regressions(comparison):
+        raise click.exceptions.Exit(1)
+
+
+@benchmark.command("memory")
+@click.option('-o', '--output', type=click.Path(dir_okay=False, writable=True), default=None,
+              help="JSON file the results are written to")
+@click.option('--baseline', type=click.Path(exists=True, dir_okay=False), default=None,
+              help="Results of a previous run to compare against")
+@click.option('--count', type=int, default=10000, show_default=True,
+              help="Number of objects created per market structure")
+def memory_benchmark(output, baseline, count):
+    """Memory footprint per object of the market structures (offers, bids, trades)"""
+    results = measure_market_structures(count)
+    if output is not None:
+        write_memory_results(results, output)
+    click.echo(format_memory_results(
+        results, read_memory_results(baseline) if baseline is not None else None))
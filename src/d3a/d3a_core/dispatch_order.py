@@ -0,0 +1,58 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of D3A.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from numpy import random
+
+
+class DispatchOrder:
+    """
+    Random order in which events are delivered to a group of receivers (child areas, inter
+    area agents, market listeners or IAA engines), in order to not favour any of them.
+
+    One permutation is drawn per receiver group, group size and tick from the global NumPy
+    random generator, which is seeded by the simulation, and reused for all events of the
+    group during that tick. The order stays uniformly random across ticks and reproducible
+    for a given seed, while avoiding a sort and a random draw per receiver on every event.
+    """
+    __slots__ = ("_tick", "_permutations")
+
+    def __init__(self):
+        self._tick = None
+        self._permutations = {}
+
+    def shuffled(self, group, receivers, current_tick):
+        """
+        :param group: Hashable that identifies the receiver group
+        :param receivers: Receivers, iterated in a stable order between calls
+        :param current_tick: Tick of the event, a new order is drawn for every tick. None draws
+                             a new order on every call, for receivers without a tick count
+        :return: List of the receivers in the random order of the current tick
+        """
+        receivers = list(receivers)
+        receiver_count = len(receivers)
+        if receiver_count < 2:
+            return receivers
+        if current_tick is None:
+            return [receivers[index] for index in random.permutation(receiver_count).tolist()]
+        if current_tick != self._tick:
+            self._tick = current_tick
+            self._permutations = {}
+        key = (group, receiver_count)
+        permutation = self._permutations.get(key)
+        if permutation is None:
+            permutation = self._permutations[key] = random.permutation(receiver_count).tolist()
+        return [receivers[index] for index in permutation]
@@ -0,0 +1,57 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of D3A.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import os
+import uuid
+from itertools import count
+
+_COUNTER_LIMIT = 0xffffffff
+
+
+class MonotonicIdGenerator:
+    """
+    Generator of unique ids for offers, bids and trades that do not need to be registered
+    on a blockchain.
+
+    The ids have the string format of a UUID, which keeps them compatible with the ids that
+    external clients receive. Instead of drawing random bytes for every id, the first
+    8 hex digits are an increasing counter and the rest of the id is drawn once from uuid4.
+    The rest is drawn again if the counter overflows and in forked child processes, so that
+    ids stay unique across processes. The digits of the counter are written in reverse
+    order, in order for consecutive ids to differ in the first characters, which are the
+    ones that are shown in the logs.
+    """
+
+    def __init__(self):
+        self._renew()
+
+    def _renew(self):
+        self._suffix = str(uuid.uuid4())[8:]
+        self._counter = count()
+
+    def next_id(self):
+        number = next(self._counter)
+        if number > _COUNTER_LIMIT:
+            self._renew()
+            number = next(self._counter)
+        return f"{number:08x}"[::-1] + self._suffix
+
+
+id_generator = MonotonicIdGenerator()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=id_generator._renew)
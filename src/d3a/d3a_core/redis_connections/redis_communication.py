@@ -178,13 +178,26 @@ class RedisSimulationCommunication:
             return
         result_report = endpoint_buffer.generate_result_report()
         results_validator(result_report)
+        self._publish_result_report(result_report)
 
+    def publish_intermediate_results(self, endpoint_buffer):
+        if not self.is_enabled():
+            return
+        result_report = endpoint_buffer.generate_intermediate_result_report()
+        # Delta reports are incomplete by design, only full reports can be validated
+        if not result_report.get("is_delta", False):
+            results_validator(result_report)
+        if not self._publish_result_report(result_report):
+            # the changes of the dropped report are only contained in a full snapshot
+            endpoint_buffer.request_full_snapshot()
+
+    def _publish_result_report(self, result_report):
         results = json.dumps(result_report)
         message_size = utf8len(results)
         if message_size > 64000:
             log.error(f"Do not publish message bigger than 64 MB, current message size "
                       f"{message_size / 1000.0} MB.")
-            return
+            return False
         log.debug(f"Publishing {message_size} KB of data via Redis.")
 
         results = results.encode('utf-8')
@@ -192,10 +205,7 @@ class RedisSimulationCommunication:
 
         self._handle_redis_job_metadata()
         self.redis_db.publish(self.result_channel, results)
-
-    def publish_intermediate_results(self, endpoint_buffer):
-        # Should have a different format in the future, hence the code duplication
-        self.publish_results(endpoint_buffer)
+        return True
 
     def is_enabled(self):
         return hasattr(self, 'pubsub')
@@ -1,6 +1,7 @@
 import logging
 import ast
 import json
+import os
 import pickle
 from datetime import datetime, date
 from pendulum import duration, instance
@@ -24,6 +25,8 @@ def decompress_and_decode_queued_strings(queued_string):
 def launch_simulation_from_rq_job(scenario, settings, events, aggregator_device_mapping,
                                   saved_state, job_id):
     logging.getLogger().setLevel(logging.ERROR)
+    d3a.constants.INCREMENTAL_RESULTS = \
+        os.environ.get("D3A_INCREMENTAL_RESULTS", "no") == "yes"
     scenario = decompress_and_decode_queued_strings(scenario)
     if "collaboration_uuid" in scenario:
         d3a.constants.COLLABORATION_ID = scenario.pop("collaboration_uuid")
@@ -33,6 +33,7 @@ from d3a.models.strategy.load_hours import LoadHoursStrategy
 from d3a.models.strategy.finite_power_plant import FinitePowerPlant
 from d3a.models.strategy.infinite_bus import InfiniteBusStrategy
 from d3a.models.strategy.market_maker_strategy import MarketMakerStrategy
+import d3a.constants
 
 _NO_VALUE = {
     'min': None,
@@ -42,8 +43,20 @@ _NO_VALUE = {
 
 
 class SimulationEndpointBuffer:
-    def __init__(self, job_id, initial_params, area, should_export_plots):
+    def __init__(self, job_id, initial_params, area, should_export_plots,
+                 incremental_results=None):
         self.job_id = job_id
+        self.incremental_results = d3a.constants.INCREMENTAL_RESULTS \
+            if incremental_results is None else incremental_results
+        # Changes since the last generated result report, for the incremental results mode
+        self._full_snapshot_requested = True
+        self._area_tree_changed = True
+        self._result_area_uuids_changed = True
+        # area uuid -> entries of the area state that changed
+        self._area_state_changes = {}
+        # area uuid -> keys of the area state that were removed
+        self._removed_area_state_keys = {}
+        self._area_tree_signature = None
         self.result_area_uuids = set()
         self.current_market_time_slot_str = ""
         self.current_market_ui_time_slot_str = ""
@@ -101,6 +114,21 @@ class SimulationEndpointBuffer:
             )
         return area_result_dict
 
+    @classmethod
+    def _get_area_tree_signature(cls, area):
+        return (area.name, area.uuid, area.strategy.__class__,
+                tuple(cls._get_area_tree_signature(child) for child in area.children))
+
+    def _update_area_tree_dict(self, area):
+        if not self.incremental_results:
+            self.area_result_dict = self._create_area_tree_dict(area)
+            return
+        area_tree_signature = self._get_area_tree_signature(area)
+        if area_tree_signature != self._area_tree_signature:
+            self._area_tree_signature = area_tree_signature
+            self.area_result_dict = self._create_area_tree_dict(area)
+            self._area_tree_changed = True
+
     def update_results_area_uuids(self, area):
         if area.strategy is not None or (area.strategy is None and area.children):
             self.result_area_uuids.update({area.uuid})
@@ -123,6 +151,66 @@ class SimulationEndpointBuffer:
             "configuration_tree": self.area_result_dict
         }
 
+    def request_full_snapshot(self):
+        """The next intermediate result report contains the full results"""
+        self._full_snapshot_requested = True
+
+    def _reset_changes(self):
+        self._full_snapshot_requested = False
+        self._area_tree_changed = False
+        self._result_area_uuids_changed = False
+        self._area_state_changes = {}
+        self._removed_area_state_keys = {}
+
+    def generate_intermediate_result_report(self):
+        """
+        Result report that is published after every market slot. In the incremental results
+        mode, only the first report (and every report after request_full_snapshot) contains
+        the full results, all other reports are deltas (see generate_result_delta_report).
+        """
+        if not self.incremental_results or self._full_snapshot_requested:
+            self._reset_changes()
+            return self.generate_result_report()
+        return self.generate_result_delta_report()
+
+    def generate_result_delta_report(self):
+        """
+        Changes of the result report since the previous report. Results of the current market
+        slot ("simulation_raw_data", "bids_offers_trades") replace the ones of the previous
+        slot, omitting areas without offers, bids or trades in "bids_offers_trades". The area
+        states of "simulation_state" only contain the entries that changed, which update the
+        previous area states, and "removed_area_state_keys" (if not empty) lists the keys that
+        were removed from them. "configuration_tree" and "results_area_uuids" are only
+        contained if they changed.
+        """
+        report = {
+            "job_id": self.job_id,
+            "is_delta": True,
+            "current_market": self.current_market_time_slot_str,
+            "current_market_ui_time_slot_str": self.current_market_ui_time_slot_str,
+            "random_seed": self.random_seed,
+            "status": self.status,
+            "progress_info": self.simulation_progress,
+            "bids_offers_trades": {
+                area_uuid: area_results
+                for area_uuid, area_results in self.bids_offers_trades.items()
+                if any(area_results.values())},
+            "simulation_state": {
+                "general": self.simulation_state["general"],
+                "areas": self._area_state_changes},
+            "simulation_raw_data": self.flattened_area_core_stats_dict,
+        }
+        if self._removed_area_state_keys:
+            report["simulation_state"]["removed_area_state_keys"] = {
+                area_uuid: sorted(keys)
+                for area_uuid, keys in self._removed_area_state_keys.items()}
+        if self._result_area_uuids_changed:
+            report["results_area_uuids"] = list(self.result_area_uuids)
+        if self._area_tree_changed:
+            report["configuration_tree"] = self.area_result_dict
+        self._reset_changes()
+        return report
+
     def generate_json_report(self):
         return {
             "job_id": self.job_id,
@@ -220,13 +308,35 @@ class SimulationEndpointBuffer:
 
         self.flattened_area_core_stats_dict[area.uuid] = core_stats_dict
 
-        self.simulation_state["areas"][area.uuid] = area.get_state()
+        area_state = area.get_state()
+        if self.incremental_results:
+            self._track_area_state_changes(area.uuid, area_state)
+        self.simulation_state["areas"][area.uuid] = area_state
 
         for child in area.children:
             self._populate_core_stats_and_sim_state(child)
 
+    def _track_area_state_changes(self, area_uuid, area_state):
+        previous_area_state = self.simulation_state["areas"].get(area_uuid)
+        if previous_area_state is None:
+            self._area_state_changes.setdefault(area_uuid, {}).update(area_state)
+            return
+        changes = {key: value for key, value in area_state.items()
+                   if key not in previous_area_state or previous_area_state[key] != value}
+        if changes:
+            self._area_state_changes.setdefault(area_uuid, {}).update(changes)
+            removed_keys = self._removed_area_state_keys.get(area_uuid)
+            if removed_keys:
+                removed_keys.difference_update(changes)
+        removed_keys = previous_area_state.keys() - area_state.keys()
+        if removed_keys:
+            self._removed_area_state_keys.setdefault(area_uuid, set()).update(removed_keys)
+            area_state_changes = self._area_state_changes.get(area_uuid, {})
+            for key in removed_keys:
+                area_state_changes.pop(key, None)
+
     def update_stats(self, area, simulation_status, progress_info, sim_state):
-        self.area_result_dict = self._create_area_tree_dict(area)
+        self._update_area_tree_dict(area)
         self.status = simulation_status
         if area.current_market is not None:
             self.current_market_time_slot_str = area.current_market.time_slot_str
@@ -286,8 +396,11 @@ class SimulationEndpointBuffer:
                 ConstSettings.GeneralSettings.EXPORT_ENERGY_TRADE_PROFILE_HR:
             self.area_market_stocks_stats.update(area)
 
+        previous_result_area_uuids = self.result_area_uuids
         self.result_area_uuids = set()
         self.update_results_area_uuids(area)
+        if self.result_area_uuids != previous_result_area_uuids:
+            self._result_area_uuids_changed = True
         self.update_offer_bid_trade()
 
     def update_area_aggregated_stats(self, area_dict):
@@ -49,6 +49,8 @@ from d3a.models.area.event_deserializer import deserialize_events_to_areas
 from d3a.d3a_core.live_events import LiveEvents
 from d3a.d3a_core.sim_results.file_export_endpoints import FileExportEndpoints
 from d3a.d3a_core.global_objects import GlobalObjects
+from d3a.d3a_core.tick_profiler import tick_profiler
+from d3a.models.read_user_profile import profile_cache
 from d3a.blockchain.constants import ENABLE_SUBSTRATE
 import d3a.constants
 
@@ -159,6 +161,7 @@ class Simulation:
         self.paused = paused
         self.pause_after = pause_after
         self.slot_length_realtime = slot_length_realtime
+        tick_profiler.reset(enabled=d3a.constants.ENABLE_TICK_PROFILING)
 
         if seed is not None:
             random.seed(int(seed))
@@ -293,9 +296,8 @@ class Simulation:
         self.progress_info.current_slot_number = slot_no
 
     def set_area_current_tick(self, area, current_tick):
+        # All areas of the tree share the clock of the root area
         area.current_tick = current_tick
-        for child in area.children:
-            self.set_area_current_tick(child, current_tick)
 
     def _execute_simulation(self, slot_resume, tick_resume, console=None):
         self.current_expected_tick_time = self.run_start
@@ -336,11 +338,16 @@ class Simulation:
                         f"{self.progress_info.elapsed_time} elapsed, "
                         f"ETA: {self.progress_info.eta}")
 
+            tick_profiler.start_slot(slot_no, self.progress_info.current_slot_str)
+
             self.global_objects.update(self.area)
 
-            self.area.cycle_markets()
-            self._update_and_send_results()
-            self.live_events.handle_all_events(self.area)
+            with tick_profiler.measure("cycle_markets"):
+                self.area.cycle_markets()
+            with tick_profiler.measure("update_and_send_results"):
+                self._update_and_send_results()
+            with tick_profiler.measure("live_events"):
+                self.live_events.handle_all_events(self.area)
 
             gc.collect()
             process = psutil.Process(os.getpid())
@@ -357,20 +364,31 @@ class Simulation:
                 log.trace(f"Tick {tick_no + 1} of {config.ticks_per_slot} in slot "
                           f"{slot_no + 1} ({(tick_no + 1) / config.ticks_per_slot * 100:.1f}%)")
 
-                self.simulation_config.external_redis_communicator.\
-                    approve_aggregator_commands()
+                tick_profiler.start_tick(tick_no)
 
-                self.area.tick_and_dispatch()
-                self.area.update_area_current_tick()
+                with tick_profiler.measure("aggregator_commands"):
+                    self.simulation_config.external_redis_communicator.\
+                        approve_aggregator_commands()
 
-                self.simulation_config.external_redis_communicator.\
-                    publish_aggregator_commands_responses_events()
+                with tick_profiler.measure("tick_and_dispatch"):
+                    self.area.tick_and_dispatch()
+                with tick_profiler.measure("update_area_current_tick"):
+                    self.area.update_area_current_tick()
+
+                with tick_profiler.measure("aggregator_commands"):
+                    self.simulation_config.external_redis_communicator.\
+                        publish_aggregator_commands_responses_events()
+
+                tick_profiler.end_tick()
 
                 self.handle_slowdown_and_realtime(tick_no)
                 self.tick_time_counter = time()
 
             if self.export_on_finish and self.should_export_results:
-                self.export.data_to_csv(self.area, True if slot_no == 0 else False)
+                with tick_profiler.measure("export_csv"):
+                    self.export.data_to_csv(self.area, True if slot_no == 0 else False)
+
+            tick_profiler.end_slot(memory_mb=mbs_used)
 
             if self.is_stopped:
                 log.info("Received stop command.")
@@ -402,9 +420,24 @@ class Simulation:
             else:
                 self.export.export(self.should_export_results)
 
+        if tick_profiler.enabled:
+            self._export_tick_profile()
+
+        profile_cache.log_stats()
+        profile_cache.clear()
+
         if self.use_repl:
             self._start_repl()
 
+    def _export_tick_profile(self):
+        if self.export_on_finish and self.should_export_results:
+            tick_profiler.export(self.export.directory)
+            return
+        for category, durations in tick_profiler.totals().items():
+            log.info(f"Tick profile ({category}): " + ", ".join(
+                f"{name}: {duration:.3f}s" for name, duration in
+                sorted(durations.items(), key=lambda item: item[1], reverse=True)))
+
     @property
     def should_export_results(self):
         return not self.redis_connection.is_enabled()
@@ -0,0 +1,111 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of D3A.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from pendulum import DateTime  # noqa
+from typing import Dict  # noqa
+
+from d3a_interface.constants_limits import GlobalConfig
+
+
+class SimulationClock:
+    """
+    Tick counter that is shared by all areas of an area tree and by their markets. It is
+    advanced once per tick and caches the DateTime values that are derived from the current
+    tick, in order to not repeat the pendulum arithmetic on every access of Area.now or
+    Market.now.
+
+    The cached values are recomputed whenever the tick, the start date or the tick length
+    changes. The start date, tick length and ticks per slot are read from the config on every
+    access, so that changes to the config take effect immediately.
+    """
+
+    def __init__(self, config=None):
+        self._config = config
+        self.current_tick = 0
+        self._now_key = None
+        self._now = None
+        self._slot_start_key = None
+        self._slot_start = None
+        self._market_now_key = None
+        self._market_now = {}  # type: Dict[DateTime, DateTime]
+
+    @property
+    def config(self):
+        return self._config if self._config is not None else GlobalConfig
+
+    def advance(self):
+        self.current_tick += 1
+
+    def frozen_market_clock(self):
+        """
+        Clock of a market that does not follow the shared clock any more (e.g. a market that
+        was moved to the past markets), stopped at the current tick in the slot
+        """
+        clock = SimulationClock(self._config)
+        clock.current_tick = self.current_tick_in_slot
+        return clock
+
+    @property
+    def current_slot(self):
+        return self.current_tick // self.config.ticks_per_slot
+
+    @property
+    def current_tick_in_slot(self):
+        return self.current_tick % self.config.ticks_per_slot
+
+    def _is_cached(self, key, tick):
+        config = self.config
+        return key is not None and key[0] == tick and \
+            key[1] is config.start_date and key[2] is config.tick_length
+
+    @property
+    def now(self) -> DateTime:
+        """DateTime of the current tick"""
+        if not self._is_cached(self._now_key, self.current_tick):
+            config = self.config
+            self._now = config.start_date.add(
+                seconds=config.tick_length.seconds * self.current_tick)
+            self._now_key = (self.current_tick, config.start_date, config.tick_length)
+        return self._now
+
+    @property
+    def slot_start(self) -> DateTime:
+        """DateTime of the first tick of the current slot"""
+        slot_start_tick = self.current_tick - self.current_tick_in_slot
+        if not self._is_cached(self._slot_start_key, slot_start_tick):
+            config = self.config
+            self._slot_start = config.start_date.add(
+                seconds=config.tick_length.seconds * slot_start_tick)
+            self._slot_start_key = (slot_start_tick, config.start_date, config.tick_length)
+        return self._slot_start
+
+    def market_now(self, time_slot: DateTime) -> DateTime:
+        """
+        'Current time' of the market of the given time slot, i.e. the time slot shifted by the
+        ticks that have passed in the current slot
+        """
+        config = self.config
+        key = (self.current_tick, config.ticks_per_slot, config.tick_length)
+        if key != self._market_now_key:
+            self._market_now_key = key
+            self._market_now = {}
+        market_now = self._market_now.get(time_slot)
+        if market_now is None:
+            market_now = time_slot.add(
+                seconds=config.tick_length.seconds * self.current_tick_in_slot)
+            self._market_now[time_slot] = market_now
+        return market_now
@@ -0,0 +1,211 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of D3A.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import csv
+import json
+import os
+from collections import defaultdict
+from logging import getLogger
+from time import perf_counter
+
+log = getLogger(__name__)
+
+TICK_PROFILE_FILE_NAME = "tick_profile"
+
+ATTRIBUTION_CATEGORIES = ("phases", "areas", "strategies", "market_types")
+
+
+class _NullTimer:
+    """Returned by TickProfiler.measure when profiling is disabled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _PhaseTimer:
+    __slots__ = ("_profiler", "phase", "area", "strategy", "market_type",
+                 "_start", "children_duration")
+
+    def __init__(self, profiler, phase, area, strategy, market_type):
+        self._profiler = profiler
+        self.phase = phase
+        self.area = area
+        self.strategy = strategy
+        self.market_type = market_type
+        self.children_duration = 0.0
+
+    def __enter__(self):
+        self._profiler._stack.append(self)
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        duration = perf_counter() - self._start
+        stack = self._profiler._stack
+        stack.pop()
+        if stack:
+            stack[-1].children_duration += duration
+        self._profiler._record(self, duration - self.children_duration)
+        return False
+
+
+class TickProfiler:
+    """
+    Opt-in instrumentation of the simulation hot path.
+
+    Every measured phase reports its exclusive time, i.e. the time spent in nested measured
+    phases (for example a strategy reacting to an offer that was posted during the tick of
+    another strategy) is only accounted for in the nested phase. Therefore the phase times of
+    a tick add up to the duration of the tick. Besides the phase, the time is attributed to
+    the area, the strategy class and the market type that were passed to measure().
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.timeline = []
+        self._stack = []
+        self._slot = None
+        self._tick = None
+
+    def reset(self, enabled):
+        self.enabled = enabled
+        self.timeline = []
+        self._stack = []
+        self._slot = None
+        self._tick = None
+
+    def measure(self, phase, area=None, strategy=None, market_type=None):
+        """
+        Context manager that times the enclosed block.
+        :param phase: Name of the measured phase
+        :param area: Name of the area the time should be attributed to
+        :param strategy: Strategy (or inter area agent) object, attributed by class name
+        :param market_type: Market object, attributed by class name
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _PhaseTimer(self, phase, area, strategy, market_type)
+
+    def measure_event(self, kind, event_type, area=None, strategy=None):
+        """
+        Same as measure, for the dispatching of an area or market event. The phase name is
+        composed of kind and the event type name, only if profiling is enabled.
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _PhaseTimer(self, f"{kind}_{event_type.name.lower()}", area, strategy, None)
+
+    def start_slot(self, slot_number, time_slot_str):
+        if not self.enabled:
+            return
+        self._slot = {
+            "slot_number": slot_number,
+            "time_slot": time_slot_str,
+            "start": perf_counter(),
+            "ticks": [],
+            **{category: defaultdict(float) for category in ATTRIBUTION_CATEGORIES}
+        }
+
+    def end_slot(self, memory_mb=None):
+        if not self.enabled or self._slot is None:
+            return
+        slot = self._slot
+        self.timeline.append({
+            "slot_number": slot["slot_number"],
+            "time_slot": slot["time_slot"],
+            "duration_s": perf_counter() - slot["start"],
+            "memory_mb": memory_mb,
+            "ticks": slot["ticks"],
+            **{category: dict(slot[category]) for category in ATTRIBUTION_CATEGORIES}
+        })
+        self._slot = None
+
+    def start_tick(self, tick_number):
+        if not self.enabled:
+            return
+        self._tick = {
+            "tick_number": tick_number,
+            "start": perf_counter(),
+            "phases": defaultdict(float)
+        }
+
+    def end_tick(self):
+        if not self.enabled or self._tick is None:
+            return
+        tick = self._tick
+        if self._slot is not None:
+            self._slot["ticks"].append({
+                "tick_number": tick["tick_number"],
+                "duration_s": perf_counter() - tick["start"],
+                "phases": dict(tick["phases"])
+            })
+        self._tick = None
+
+    def _record(self, timer, duration):
+        if self._tick is not None:
+            self._tick["phases"][timer.phase] += duration
+        slot = self._slot
+        if slot is None:
+            return
+        slot["phases"][timer.phase] += duration
+        if timer.area is not None:
+            slot["areas"][timer.area] += duration
+        if timer.strategy is not None:
+            slot["strategies"][timer.strategy.__class__.__name__] += duration
+        if timer.market_type is not None:
+            slot["market_types"][timer.market_type.__class__.__name__] += duration
+
+    def totals(self):
+        """Accumulated time per category and name over all profiled slots"""
+        totals = {category: defaultdict(float) for category in ATTRIBUTION_CATEGORIES}
+        for slot in self.timeline:
+            for category in ATTRIBUTION_CATEGORIES:
+                for name, duration in slot[category].items():
+                    totals[category][name] += duration
+        return {category: dict(values) for category, values in totals.items()}
+
+    def export(self, directory):
+        """
+        Write the per-slot timeline to <directory>/tick_profile.json and a flattened version
+        (one row per slot, category and name) to <directory>/tick_profile.csv
+        """
+        json_file = os.path.join(directory, f"{TICK_PROFILE_FILE_NAME}.json")
+        with open(json_file, "w") as outfile:
+            json.dump({"slots": self.timeline, "totals": self.totals()}, outfile, indent=2)
+
+        csv_file = os.path.join(directory, f"{TICK_PROFILE_FILE_NAME}.csv")
+        with open(csv_file, "w") as outfile:
+            writer = csv.writer(outfile)
+            writer.writerow(("slot_number", "time_slot", "category", "name", "duration_s"))
+            for slot in self.timeline:
+                writer.writerow((slot["slot_number"], slot["time_slot"],
+                                 "slot", "total", slot["duration_s"]))
+                for category in ATTRIBUTION_CATEGORIES:
+                    for name, duration in sorted(slot[category].items()):
+                        writer.writerow((slot["slot_number"], slot["time_slot"],
+                                         category, name, duration))
+        log.info(f"Tick profile exported to {json_file} and {csv_file}.")
+
+
+tick_profiler = TickProfiler()
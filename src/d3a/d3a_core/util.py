@@ -50,6 +50,9 @@ INTERVAL_MS_RE = rex("/^(?:(?P<minutes>[0-9]{1,4})[m:])?(?:(?P<seconds>[0-9]{1,2
 IMPORT_RE = rex("/^import +[\"'](?P<contract>[^\"']+.sol)[\"'];$/")
 
 _CONTRACT_CACHE = {}
+# (start_date, time_span, slot_length, market_count) -> market slot list
+_MARKET_SLOT_LIST_CACHE = {}
+_MISSING = object()
 
 TRACE = 5
 
@@ -328,13 +331,17 @@ def generate_market_slot_list(start_date=None, time_span=None):
         start_date = GlobalConfig.start_date
     if not time_span:
         time_span = GlobalConfig.sim_duration
-    sim_duration_plus_future_markets = time_span + GlobalConfig.slot_length * \
-        (GlobalConfig.market_count - 1)
-    market_slot_list = \
-        generate_market_slot_list_from_config(sim_duration=sim_duration_plus_future_markets,
-                                              start_date=start_date,
-                                              market_count=GlobalConfig.market_count,
-                                              slot_length=GlobalConfig.slot_length)
+    # The slot list is generated for every profile that is read, therefore it is cached
+    cache_key = (start_date, time_span, GlobalConfig.slot_length, GlobalConfig.market_count)
+    if cache_key not in _MARKET_SLOT_LIST_CACHE:
+        sim_duration_plus_future_markets = time_span + GlobalConfig.slot_length * \
+            (GlobalConfig.market_count - 1)
+        _MARKET_SLOT_LIST_CACHE[cache_key] = generate_market_slot_list_from_config(
+            sim_duration=sim_duration_plus_future_markets,
+            start_date=start_date,
+            market_count=GlobalConfig.market_count,
+            slot_length=GlobalConfig.slot_length)
+    market_slot_list = list(_MARKET_SLOT_LIST_CACHE[cache_key])
 
     if not getattr(GlobalConfig, 'market_slot_list', []):
         GlobalConfig.market_slot_list = market_slot_list
@@ -529,9 +536,113 @@ def convert_area_throughput_kVA_to_kWh(transfer_capacity_kWA, slot_length):
         if transfer_capacity_kWA is not None else 0.
 
 
+MINUTES_PER_DAY = 24 * 60
+
+
+def _minute_of_week(time_slot) -> int:
+    return time_slot.weekday() * MINUTES_PER_DAY + time_slot.hour * 60 + time_slot.minute
+
+
+def compile_weekday_and_time_profile(indict) -> dict:
+    """
+    Resolves the weekday and time folding of find_object_of_same_weekday_and_time for all time
+    stamps of the profile at once.
+    :return: mapping from minute of the week to the value of the profile
+    """
+    if not indict:
+        raise IndexError("Weekday and time of an empty profile can not be resolved")
+    start_date = next(iter(indict)).date()
+    compiled = {}
+    for time_stamp, value in indict.items():
+        minute_of_week = _compiled_minute_of_week(time_stamp, start_date)
+        if minute_of_week is not None:
+            compiled[minute_of_week] = value
+    return compiled
+
+
+def _compiled_minute_of_week(time_stamp, start_date):
+    """
+    Minute of the week under which the value of time_stamp is compiled, None if the value is
+    not part of the compiled profile
+    """
+    if time_stamp.timezone_name != TIME_ZONE:
+        time_stamp = time_stamp.in_timezone(TIME_ZONE)
+    if time_stamp.second != 0 or time_stamp.microsecond != 0:
+        return None
+    if 0 <= (time_stamp.date() - start_date).days < 7:
+        return _minute_of_week(time_stamp)
+    return None
+
+
+class ProfileDict(OrderedDict):
+    """
+    Profile (mapping from time slot to value) that compiles its weekday and time lookup for the
+    canary network once, instead of resolving it for every lookup. Setting the value of an
+    existing time slot updates the compiled lookup, other modifications discard it.
+    """
+
+    _weekday_and_time_profile = None
+
+    def weekday_and_time_profile(self) -> dict:
+        if self._weekday_and_time_profile is None:
+            self._weekday_and_time_profile = compile_weekday_and_time_profile(self)
+        return self._weekday_and_time_profile
+
+    def _modified(self):
+        self._weekday_and_time_profile = None
+
+    def __setitem__(self, key, value):
+        if self._weekday_and_time_profile is not None and key in self:
+            super().__setitem__(key, value)
+            minute_of_week = _compiled_minute_of_week(key, next(iter(self)).date())
+            if minute_of_week is not None:
+                self._weekday_and_time_profile[minute_of_week] = value
+            return
+        super().__setitem__(key, value)
+        self._modified()
+
+    def copy(self):
+        profile_copy = self.__class__(self)
+        if self._weekday_and_time_profile is not None:
+            profile_copy._weekday_and_time_profile = dict(self._weekday_and_time_profile)
+        return profile_copy
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._modified()
+
+    def pop(self, *args):
+        self._modified()
+        return super().pop(*args)
+
+    def popitem(self, last=True):
+        self._modified()
+        return super().popitem(last)
+
+    def setdefault(self, key, default=None):
+        self._modified()
+        return super().setdefault(key, default)
+
+    def clear(self):
+        self._modified()
+        super().clear()
+
+    def move_to_end(self, key, last=True):
+        self._modified()
+        super().move_to_end(key, last)
+
+
 def find_object_of_same_weekday_and_time(indict, time_slot, ignore_not_found=False):
     if d3a.constants.IS_CANARY_NETWORK:
-        start_time = list(indict.keys())[0]
+        if isinstance(indict, ProfileDict):
+            value = indict.weekday_and_time_profile().get(_minute_of_week(time_slot), _MISSING)
+            if value is not _MISSING:
+                return value
+            if not ignore_not_found:
+                log.error(f"Weekday and time not found in dict for {time_slot}")
+            return
+
+        start_time = next(iter(indict))
         add_days = time_slot.weekday() - start_time.weekday()
         if add_days < 0:
             add_days += 7
@@ -565,7 +676,7 @@ def convert_kW_to_kWh(power_W, slot_length):
 def return_ordered_dict(function):
     @wraps(function)
     def wrapper(*args, **kwargs):
-        return OrderedDict(sorted(function(*args, **kwargs).items()))
+        return ProfileDict(sorted(function(*args, **kwargs).items()))
     return wrapper
 
 
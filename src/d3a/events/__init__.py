@@ -44,6 +44,10 @@ class EventMixin:
             return self.event_bid_deleted
         elif event == MarketEvent.BID_SPLIT:
             return self.event_bid_split
+        elif event == MarketEvent.OFFER_UPDATED:
+            return self.event_offer_updated
+        elif event == MarketEvent.BID_UPDATED:
+            return self.event_bid_updated
         elif event == MarketEvent.BALANCING_OFFER:
             return self.event_balancing_offer
         elif event == MarketEvent.BALANCING_OFFER_SPLIT:
@@ -90,6 +94,13 @@ class EventMixin:
     def event_bid_split(self, *, market_id, original_bid, accepted_bid, residual_bid):
         pass
 
+    def event_offer_updated(self, *, market_id, existing_offer, new_offer):
+        # A repriced offer is a new buying opportunity, same as a newly posted offer
+        self.event_offer(market_id=market_id, offer=new_offer)
+
+    def event_bid_updated(self, *, market_id, existing_bid, new_bid):
+        pass
+
     def event_balancing_offer(self, *, market_id, offer):
         pass
 
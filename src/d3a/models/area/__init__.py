@@ -31,6 +31,8 @@ from d3a.d3a_core.util import TaggedLogWrapper
 from d3a_interface.constants_limits import ConstSettings
 from d3a.d3a_core.device_registry import DeviceRegistry
 from d3a.d3a_core.global_objects import GlobalObjects
+from d3a.d3a_core.tick_profiler import tick_profiler
+from d3a.d3a_core.simulation_clock import SimulationClock
 from d3a.constants import TIME_FORMAT
 from d3a.models.area.stats import AreaStats
 from d3a.models.area.event_dispatcher import DispatcherFactory
@@ -111,7 +113,7 @@ class Area:
         self.balancing_spot_trade_ratio = balancing_spot_trade_ratio
         self.active = False
         self.log = TaggedLogWrapper(log, name)
-        self.current_tick = 0
+        self._clock = SimulationClock(config)
         self.__name = name
         self.throughput = throughput
         self.uuid = uuid if uuid is not None else str(uuid4())
@@ -304,16 +306,10 @@ class Area:
         initial area activation.
         """
 
-        current_tick_in_slot = int(self.current_tick % self.config.ticks_per_slot)
-        tick_at_the_slot_start = self.current_tick - current_tick_in_slot
-        if tick_at_the_slot_start == 0:
+        if self.current_slot == 0:
             now_value = self.now
         else:
-            datetime_at_the_slot_start = self.config.start_date.add(
-                seconds=self.config.tick_length.seconds * tick_at_the_slot_start
-            )
-
-            now_value = datetime_at_the_slot_start
+            now_value = self.clock.slot_start
 
         self.events.update_events(now_value)
 
@@ -383,17 +379,15 @@ class Area:
                 self.dispatcher.publish_market_clearing()
             else:
                 for market in self.all_markets:
-                    market.match_offers_bids()
+                    with tick_profiler.measure("match_offers_bids", area=self.name,
+                                               market_type=market):
+                        market.match_offers_bids()
 
         self.events.update_events(self.now)
 
     def update_area_current_tick(self):
-        self.current_tick += 1
-        if self._markets:
-            for market in self._markets.markets.values():
-                market.update_clock(self.current_tick_in_slot)
-        for child in self.children:
-            child.update_area_current_tick()
+        # The clock is shared by the whole area tree and its markets
+        self.clock.advance()
 
     def tick_and_dispatch(self):
         if d3a.constants.DISPATCH_EVENTS_BOTTOM_TO_TOP:
@@ -409,13 +403,27 @@ class Area:
             markets=[t.format(TIME_FORMAT) for t in self._markets.markets.keys()]
         )
 
+    @property
+    def clock(self):
+        if self.parent:
+            return self.parent.clock
+        return self._clock
+
+    @property
+    def current_tick(self):
+        return self.clock.current_tick
+
+    @current_tick.setter
+    def current_tick(self, current_tick):
+        self.clock.current_tick = current_tick
+
     @property
     def current_slot(self):
-        return self.current_tick // self.config.ticks_per_slot
+        return self.clock.current_slot
 
     @property
     def current_tick_in_slot(self):
-        return self.current_tick % self.config.ticks_per_slot
+        return self.clock.current_tick_in_slot
 
     @property
     def config(self):
@@ -462,9 +470,7 @@ class Area:
         In this default implementation 'current time' is defined by the number of ticks that
         have passed.
         """
-        return self.config.start_date.add(
-            seconds=self.config.tick_length.seconds * self.current_tick
-        )
+        return self.clock.now
 
     @property
     def all_markets(self):
@@ -496,7 +502,7 @@ class Area:
         # In case of a tie, max returns the first market occurrence in order to
         # satisfy the most recent market slot
         return max(self.all_markets,
-                   key=lambda m: m.sorted_offers[0].energy_rate)
+                   key=lambda m: m.cheapest_offer.energy_rate)
 
     @property
     def next_market(self):
@@ -15,7 +15,6 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
-from numpy.random import random
 from typing import Union, Dict  # noqa
 from logging import getLogger
 from pendulum import DateTime  # noqa
@@ -35,6 +34,8 @@ from d3a.models.area.redis_dispatcher.market_notify_event_subscriber \
     import MarketNotifyEventSubscriber
 from d3a.models.area.redis_dispatcher.area_to_market_publisher import AreaToMarketEventPublisher
 from d3a.d3a_core.redis_connections.redis_area_market_communicator import RedisCommunicator
+from d3a.d3a_core.tick_profiler import tick_profiler
+from d3a.d3a_core.dispatch_order import DispatchOrder
 from d3a import constants
 
 log = getLogger(__name__)
@@ -47,6 +48,7 @@ class AreaDispatcher:
         self._inter_area_agents = {}  # type: Dict[DateTime, Dict[str, OneSidedAgent]]
         self._balancing_agents = {}  # type: Dict[DateTime, Dict[str, BalancingAgent]]
         self.area = area
+        self._dispatch_order = DispatchOrder()
 
     @property
     def interarea_agents(self):
@@ -76,8 +78,10 @@ class AreaDispatcher:
         if not self.area.events.is_enabled and \
            event_type not in [AreaEvent.ACTIVATE, AreaEvent.MARKET_CYCLE]:
             return
+        current_tick = self.area.current_tick
         # Broadcast to children in random order to ensure fairness
-        for child in sorted(self.area.children, key=lambda _: random()):
+        for child in self._dispatch_order.shuffled("children", self.area.children,
+                                                   current_tick):
             child.dispatcher.event_listener(event_type, **kwargs)
         # Also broadcast to IAAs. Again in random order
         for time_slot, agents in self._inter_area_agents.items():
@@ -87,8 +91,11 @@ class AreaDispatcher:
 
             if not self.area.events.is_connected:
                 break
-            for area_name in sorted(agents, key=lambda _: random()):
-                agents[area_name].event_listener(event_type, **kwargs)
+            for area_name in self._dispatch_order.shuffled(("iaa", time_slot), agents,
+                                                           current_tick):
+                with tick_profiler.measure_event("iaa", event_type, area=area_name,
+                                                 strategy=agents[area_name]):
+                    agents[area_name].event_listener(event_type, **kwargs)
         # Also broadcast to BAs. Again in random order
         # TODO: Refactor to reuse the spot market mechanism
         for time_slot, agents in self._balancing_agents.items():
@@ -98,8 +105,11 @@ class AreaDispatcher:
 
             if not self.area.events.is_connected:
                 break
-            for area_name in sorted(agents, key=lambda _: random()):
-                agents[area_name].event_listener(event_type, **kwargs)
+            for area_name in self._dispatch_order.shuffled(("ba", time_slot), agents,
+                                                           current_tick):
+                with tick_profiler.measure_event("ba", event_type, area=area_name,
+                                                 strategy=agents[area_name]):
+                    agents[area_name].event_listener(event_type, **kwargs)
 
     def _should_dispatch_to_strategies(self, event_type, **kwargs):
         if event_type is AreaEvent.ACTIVATE:
@@ -117,7 +127,9 @@ class AreaDispatcher:
             self.area.activate(**kwargs)
         if self._should_dispatch_to_strategies(event_type, **kwargs):
             if self.area.strategy:
-                self.area.strategy.event_listener(event_type, **kwargs)
+                with tick_profiler.measure_event("strategy", event_type, area=self.area.name,
+                                                 strategy=self.area.strategy):
+                    self.area.strategy.event_listener(event_type, **kwargs)
         elif (not self.area.events.is_enabled or not self.area.events.is_connected) \
                 and event_type == AreaEvent.MARKET_CYCLE and self.area.strategy is not None:
             self.area.strategy.event_on_disabled_area()
@@ -211,11 +223,14 @@ class AreaDispatcher:
                         for engine in agent.engines:
                             del engine.forwarded_offers
                             del engine.offer_age
+                            del engine._pending_offers
                             del engine.trade_residual
                             del engine.ignored_offers
                             if hasattr(engine, "forwarded_bids"):
                                 del engine.forwarded_bids
                                 del engine.bid_age
+                                del engine._pending_bids
+                                del engine._released_bids
                                 del engine.bid_trade_residual
                         del agent.engines
                     agent.higher_market = None
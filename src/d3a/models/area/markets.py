@@ -73,6 +73,9 @@ class AreaMarkets:
             if timeframe < current_time:
                 market = markets.pop(timeframe)
                 market.readonly = True
+                # Past markets are not advanced with the area clock anymore
+                market.clock = market.clock.frozen_market_clock()
+                market.follows_area_clock = False
                 self._delete_past_markets(past_markets)
                 past_markets[timeframe] = market
                 self.log.trace("Moving {t:%H:%M} {m} to past"
@@ -126,6 +129,9 @@ class AreaMarkets:
                     name=area.name,
                     in_sim_duration=is_timeslot_in_simulation_duration(area.config, timeframe)
                 )
+                if is_spot_market:
+                    market.clock = area.clock
+                    market.follows_area_clock = True
 
                 area.dispatcher.create_area_agents(is_spot_market, market)
                 markets[timeframe] = market
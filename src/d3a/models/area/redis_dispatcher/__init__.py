@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from d3a.d3a_core.dispatch_order import DispatchOrder
 
 
 class RedisEventDispatcherBase(ABC):
@@ -11,6 +12,7 @@ class RedisEventDispatcherBase(ABC):
         self.area = area
         self.root_dispatcher = root_dispatcher
         self.redis = redis
+        self.dispatch_order = DispatchOrder()
         self.subscribe_to_event_responses()
         self.subscribe_to_events()
 
@@ -1,5 +1,4 @@
 import json
-from random import random
 from d3a.events import AreaEvent
 from d3a.d3a_core.exceptions import D3ARedisException
 from d3a.models.area.redis_dispatcher import RedisEventDispatcherBase
@@ -31,7 +30,8 @@ class RedisAreaEventDispatcher(RedisEventDispatcherBase):
         self.redis.publish(dispatch_chanel, json.dumps(send_data))
 
     def broadcast_event_redis(self, event_type: AreaEvent, **kwargs):
-        for child in sorted(self.area.children, key=lambda _: random()):
+        current_tick = self.area.current_tick
+        for child in self.dispatch_order.shuffled("children", self.area.children, current_tick):
             self.publish_area_event(child.uuid, event_type, **kwargs)
             self.redis.wait()
             self.root_dispatcher.market_event_dispatcher.wait_for_futures()
@@ -44,7 +44,8 @@ class RedisAreaEventDispatcher(RedisEventDispatcherBase):
 
             if not self.area.events.is_connected:
                 break
-            for area_name in sorted(agents, key=lambda _: random()):
+            for area_name in self.dispatch_order.shuffled(("iaa", time_slot), agents,
+                                                          current_tick):
                 agents[area_name].event_listener(event_type, **kwargs)
                 self.root_dispatcher.market_notify_event_dispatcher.wait_for_futures()
 
@@ -1,6 +1,5 @@
 import json
 import logging
-from random import random
 from threading import Event
 from concurrent.futures import TimeoutError, ThreadPoolExecutor
 from d3a.events import MarketEvent
@@ -64,7 +63,8 @@ class AreaRedisMarketEventDispatcher(RedisEventDispatcherBase):
         self.redis.publish(dispatch_channel, json.dumps(send_data))
 
     def broadcast_event_redis(self, event_type: MarketEvent, **kwargs):
-        for child in sorted(self.area.children, key=lambda _: random()):
+        current_tick = self.area.current_tick
+        for child in self.dispatch_order.shuffled("children", self.area.children, current_tick):
             self.publish_event(child.uuid, event_type, **kwargs)
             self.child_response_events[event_type.value].wait()
             self.child_response_events[event_type.value].clear()
@@ -76,7 +76,8 @@ class AreaRedisMarketEventDispatcher(RedisEventDispatcherBase):
 
             if not self.area.events.is_connected:
                 break
-            for area_name in sorted(agents, key=lambda _: random()):
+            for area_name in self.dispatch_order.shuffled(("iaa", time_slot), agents,
+                                                          current_tick):
                 agents[area_name].event_listener(event_type, **kwargs)
 
     def publish_response(self, event_type):
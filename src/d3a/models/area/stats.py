@@ -20,7 +20,7 @@ from statistics import mean, median
 
 from d3a import limit_float_precision
 from d3a.d3a_core.util import area_name_from_area_or_iaa_name, add_or_create_key, \
-    area_sells_to_child, child_buys_from_area
+    area_sells_to_child, child_buys_from_area, make_iaa_name
 from d3a_interface.utils import convert_pendulum_to_str_in_dict, convert_str_to_pendulum_in_dict
 
 default_trade_stats_dict = {
@@ -85,7 +85,9 @@ class AreaStats:
     def cheapest_offers(self):
         cheapest_offers = []
         for market in self._markets.markets.values():
-            cheapest_offers.extend(market.sorted_offers[0:1])
+            cheapest_offer = market.cheapest_offer
+            if cheapest_offer is not None:
+                cheapest_offers.append(cheapest_offer)
         return cheapest_offers
 
     def _get_current_market_bills(self):
@@ -144,8 +146,14 @@ class AreaStats:
         self.exported_traded_energy_kwh = {}
 
         child_names = [area_name_from_area_or_iaa_name(c.name) for c in self._area.children]
-        if getattr(self.current_market, 'trades', None) is not None:
-            for trade in self.current_market.trades:
+        trades_of = getattr(self.current_market, 'trades_of', None)
+        if trades_of is not None:
+            # Only trades of the area (or its inter area agent) can be imports or exports
+            trades = trades_of(make_iaa_name(self._area)) + trades_of(self._area.name)
+        else:
+            trades = getattr(self.current_market, 'trades', None)
+        if trades is not None:
+            for trade in trades:
                 if child_buys_from_area(trade, self._area.name, child_names):
                     add_or_create_key(self.exported_traded_energy_kwh,
                                       self.current_market.time_slot,
@@ -20,15 +20,18 @@ import uuid
 import sys
 from logging import getLogger
 from typing import Dict, List  # noqa
-from numpy.random import random
 from collections import namedtuple
 from pendulum import DateTime
 from functools import wraps
+from itertools import takewhile
 from threading import RLock
 
 from d3a.d3a_core.device_registry import DeviceRegistry
+from d3a.d3a_core.simulation_clock import SimulationClock
+from d3a.d3a_core.dispatch_order import DispatchOrder
 from d3a.constants import FLOATING_POINT_TOLERANCE, DATE_TIME_FORMAT
 from d3a.models.market.market_structures import Offer, Trade, Bid  # noqa
+from d3a.models.market.order_book import OrderBook
 from d3a.d3a_core.util import add_or_create_key, subtract_or_create_key
 from d3a_interface.constants_limits import ConstSettings, GlobalConfig
 from d3a.models.market.market_redis_connection import MarketRedisEventSubscriber, \
@@ -76,10 +79,11 @@ class Market:
             else None
         self.readonly = readonly
         # offer-id -> Offer
-        self.offers = {}  # type: Dict[str, Offer]
+        self.offers = OrderBook()  # type: Dict[str, Offer]
         self.offer_history = []  # type: List[Offer]
         self.notification_listeners = []
-        self.bids = {}  # type: Dict[str, Bid]
+        self._dispatch_order = DispatchOrder()
+        self.bids = OrderBook()  # type: Dict[str, Bid]
         self.bid_history = []  # type: List[Bid]
         self.trades = []  # type: List[Trade]
         self.const_fee_rate = None
@@ -100,7 +104,10 @@ class Market:
             self.redis_publisher = MarketRedisEventPublisher(self.id)
         elif notification_listener:
             self.notification_listeners.append(notification_listener)
-        self.current_tick_in_slot = 0
+        # Replaced by the clock of the area when the market is created by an area
+        self.clock = SimulationClock()
+        # Whether self.clock is the clock of an area, that is advanced on every tick
+        self.follows_area_clock = False
         self.device_registry = DeviceRegistry.REGISTRY
         if ConstSettings.GeneralSettings.EVENT_DISPATCHING_VIA_REDIS:
             self.redis_api = MarketRedisEventSubscriber(self) \
@@ -127,6 +134,68 @@ class Market:
                     transfer_fees.grid_fee_percentage / 100
                 )
 
+    @property
+    def offers(self):
+        return self._offer_book
+
+    @offers.setter
+    def offers(self, offers):
+        # offer-id -> Offer, ordered by energy rate
+        self._offer_book = offers if isinstance(offers, OrderBook) else OrderBook(offers)
+
+    @offers.deleter
+    def offers(self):
+        del self._offer_book
+
+    @property
+    def bids(self):
+        return self._bid_book
+
+    @bids.setter
+    def bids(self, bids):
+        # bid-id -> Bid, ordered by energy rate
+        self._bid_book = bids if isinstance(bids, OrderBook) else OrderBook(bids)
+
+    @bids.deleter
+    def bids(self):
+        del self._bid_book
+
+    @property
+    def trades(self):
+        return self._trades
+
+    @trades.setter
+    def trades(self, trades):
+        # Per-owner trades and running totals, updated whenever a trade is recorded
+        self._trades = trades
+        self._trades_by_owner = {}  # type: Dict[str, List[Trade]]
+        self._bought_energy = {}  # type: Dict[str, float]
+        self._sold_energy = {}  # type: Dict[str, float]
+        self._spent = {}  # type: Dict[str, float]
+        self._earned = {}  # type: Dict[str, float]
+        for trade in trades:
+            self._index_trade(trade)
+
+    @trades.deleter
+    def trades(self):
+        del self._trades
+        del self._trades_by_owner
+        del self._bought_energy
+        del self._sold_energy
+        del self._spent
+        del self._earned
+
+    def _index_trade(self, trade):
+        buyer, seller = trade.buyer, trade.seller
+        self._trades_by_owner.setdefault(buyer, []).append(trade)
+        if seller != buyer:
+            self._trades_by_owner.setdefault(seller, []).append(trade)
+        energy, price = trade.offer.energy, trade.offer.price
+        self._bought_energy[buyer] = self._bought_energy.get(buyer, 0) + energy
+        self._spent[buyer] = self._spent.get(buyer, 0) + price
+        self._sold_energy[seller] = self._sold_energy.get(seller, 0) + energy
+        self._earned[seller] = self._earned.get(seller, 0) + price
+
     @property
     def _is_constant_fees(self):
         return isinstance(self.fee_class, ConstantGridFees)
@@ -138,8 +207,11 @@ class Market:
         if ConstSettings.GeneralSettings.EVENT_DISPATCHING_VIA_REDIS:
             self.redis_publisher.publish_event(event, **kwargs)
         else:
-            # Deliver notifications in random order to ensure fairness
-            for listener in sorted(self.notification_listeners, key=lambda l: random()):
+            # Deliver notifications in random order to ensure fairness. The order is drawn
+            # once per tick only if the tick of the market advances
+            current_tick = self.clock.current_tick if self.follows_area_clock else None
+            for listener in self._dispatch_order.shuffled(
+                    "listeners", self.notification_listeners, current_tick):
                 listener(event, market_id=self.id, **kwargs)
 
     def _update_stats_after_trade(self, trade, offer_or_bid, already_tracked=False):
@@ -148,6 +220,7 @@ class Market:
         #  sequential approach, but once event handling is enabled this needs to be handled
         if not already_tracked:
             self.trades.append(trade)
+            self._index_trade(trade)
             self.market_fee += trade.fee_price
         self._update_accumulated_trade_price_energy(trade)
         self.traded_energy = \
@@ -164,10 +237,9 @@ class Market:
 
     def _update_min_max_avg_offer_prices(self):
         self._avg_offer_price = None
-        offer_prices = [o.energy_rate for o in self.offers.values()]
-        if offer_prices:
-            self.min_offer_price = round(min(offer_prices), 4)
-            self.max_offer_price = round(max(offer_prices), 4)
+        if self.offers:
+            self.min_offer_price = round(self.offers.best_rate(), 4)
+            self.max_offer_price = round(self.offers.best_rate(reverse=True), 4)
 
     def _update_min_max_avg_trade_prices(self, price):
         self.max_trade_price = round(max(self.max_trade_price, price), 4)
@@ -186,25 +258,11 @@ class Market:
             self.accumulated_trade_price
         )
 
-    @staticmethod
-    def sorting(obj, reverse_order=False):
-        if reverse_order:
-            # Sorted bids in descending order
-            return list(reversed(sorted(
-                obj.values(),
-                key=lambda b: b.energy_rate)))
-
-        else:
-            # Sorted bids in ascending order
-            return list(sorted(
-                obj.values(),
-                key=lambda b: b.energy_rate))
-
     @property
     def avg_offer_price(self):
         if self._avg_offer_price is None:
-            price = sum(o.price for o in self.offers.values())
-            energy = sum(o.energy for o in self.offers.values())
+            price = self.offers.total_price
+            energy = self.offers.total_energy
             self._avg_offer_price = round(price / energy, 4) if energy else 0
         return self._avg_offer_price
 
@@ -218,34 +276,47 @@ class Market:
 
     @property
     def sorted_offers(self):
-        return self.sorting(self.offers)
+        return self.offers.sorted_values()
+
+    @property
+    def cheapest_offer(self):
+        return self.offers.best()
 
     @property
     def most_affordable_offers(self):
-        cheapest_offer = self.sorted_offers[0]
-        rate = cheapest_offer.energy_rate
-        return [o for o in self.sorted_offers if
-                abs(o.energy_rate - rate) < FLOATING_POINT_TOLERANCE]
+        rate = self.offers.best_rate()
+        if rate is None:
+            return []
+        return list(takewhile(lambda o: abs(o.energy_rate - rate) < FLOATING_POINT_TOLERANCE,
+                              self.offers.iter_sorted()))
 
     def update_clock(self, current_tick_in_slot):
-        self.current_tick_in_slot = current_tick_in_slot
+        """Only used for markets that do not share the clock of an area"""
+        self.clock.current_tick = current_tick_in_slot
+
+    @property
+    def current_tick_in_slot(self):
+        return self.clock.current_tick_in_slot
 
     @property
     def now(self) -> DateTime:
-        return self.time_slot.add(
-            seconds=GlobalConfig.tick_length.seconds * self.current_tick_in_slot)
+        return self.clock.market_now(self.time_slot)
+
+    def trades_of(self, owner):
+        """Trades in which owner is the buyer or the seller, in the order they happened"""
+        return self._trades_by_owner.get(owner, [])
 
     def bought_energy(self, buyer):
-        return sum(trade.offer.energy for trade in self.trades if trade.buyer == buyer)
+        return self._bought_energy.get(buyer, 0)
 
     def sold_energy(self, seller):
-        return sum(trade.offer.energy for trade in self.trades if trade.seller == seller)
+        return self._sold_energy.get(seller, 0)
 
     def total_spent(self, buyer):
-        return sum(trade.offer.price for trade in self.trades if trade.buyer == buyer)
+        return self._spent.get(buyer, 0)
 
     def total_earned(self, seller):
-        return sum(trade.offer.price for trade in self.trades if trade.seller == seller)
+        return self._earned.get(seller, 0)
 
     @property
     def info(self):
@@ -15,7 +15,6 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
-import uuid
 from typing import Union  # noqa
 from pendulum import DateTime
 from logging import getLogger
@@ -72,7 +71,7 @@ class BalancingMarket(OneSidedMarket):
                 price = price * (1 + self.fee_class.grid_fee_rate)
 
         if offer_id is None:
-            offer_id = str(uuid.uuid4())
+            offer_id = self.bc_interface.create_new_id()
 
         offer = BalancingOffer(offer_id, self.now, price, energy,
                                seller, seller_origin=seller_origin)
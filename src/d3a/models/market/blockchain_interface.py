@@ -16,6 +16,7 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import uuid
+from d3a.d3a_core.id_generator import id_generator
 from d3a.events.event_structures import MarketEvent
 from d3a.d3a_core.exceptions import InvalidTrade
 from d3a.blockchain import ENABLE_SUBSTRATE, BlockChainInterface
@@ -47,8 +48,11 @@ class NonBlockchainInterface:
     def __init__(self):
         pass
 
+    def create_new_id(self):
+        return id_generator.next_id()
+
     def create_new_offer(self, energy, price, seller):
-        return str(uuid.uuid4())
+        return id_generator.next_id()
 
     def cancel_offer(self, offer):
         pass
@@ -57,7 +61,7 @@ class NonBlockchainInterface:
         pass
 
     def handle_blockchain_trade_event(self, offer, buyer, original_offer, residual_offer):
-        return str(uuid.uuid4()), residual_offer
+        return id_generator.next_id(), residual_offer
 
     def track_trade_event(self, trade):
         pass
@@ -81,6 +85,9 @@ class SubstrateBlockchainInterface(BlockChainInterface):
         )
         return call
 
+    def create_new_id(self):
+        return str(uuid.uuid4())
+
     def create_new_offer(self, energy, price, seller):
         return str(uuid.uuid4())
 
@@ -16,22 +16,23 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 from collections import namedtuple
+from operator import attrgetter
 from typing import Dict  # noqa
-from copy import deepcopy
-import json
-from pendulum import DateTime, parse
+from pendulum import DateTime, parse  # noqa
 from d3a.events import MarketEvent
-from d3a_interface.utils import datetime_to_string_incl_seconds, key_in_dict_and_not_none
+from d3a.models.market.market_structures_serializer import dumps, loads, isoformat, \
+    time_string_incl_seconds
+from d3a_interface.utils import key_in_dict_and_not_none
 
 Clearing = namedtuple('Clearing', ('rate', 'energy'))
 
 
-def my_converter(o):
-    if isinstance(o, DateTime):
-        return o.isoformat()
-
-
 class Offer:
+    # Slotted, since offers are the most numerous objects of a simulation. The order of the
+    # slots is the order of the keys of the JSON representation.
+    __slots__ = ("id", "real_id", "price", "original_offer_price", "energy", "seller",
+                 "seller_origin", "energy_rate", "time")
+
     def __init__(self, id, time, price, energy, seller,
                  original_offer_price=None, seller_origin=None):
         self.id = str(id)
@@ -58,10 +59,9 @@ class Offer:
             .format(s=self, rate=self.energy_rate)
 
     def to_JSON_string(self):
-        offer_dict = deepcopy(self.__dict__)
+        offer_dict = dict(zip(_OFFER_JSON_FIELDS, _offer_json_values(self)))
         offer_dict["type"] = "Offer"
-        offer_dict.pop('energy_rate', None)
-        return json.dumps(offer_dict, default=my_converter)
+        return dumps(offer_dict, convert_datetimes=True)
 
     def serializable_dict(self):
         return {
@@ -71,7 +71,7 @@ class Offer:
             "energy_rate": self.energy_rate,
             "seller": self.seller,
             "seller_origin": self.seller_origin,
-            "time": datetime_to_string_incl_seconds(self.time)
+            "time": time_string_incl_seconds(self.time)
         }
 
     def __hash__(self):
@@ -93,13 +93,29 @@ class Offer:
         return rate, self.energy, self.price, self.seller
 
 
+_OFFER_JSON_FIELDS = tuple(slot for slot in Offer.__slots__ if slot != "energy_rate")
+_offer_json_values = attrgetter(*_OFFER_JSON_FIELDS)
+
+
 def copy_offer(offer):
-    return Offer(offer.id, offer.time, offer.price, offer.energy, offer.seller,
-                 offer.original_offer_price, offer.seller_origin)
+    """
+    Snapshot of offer as an Offer, that shares the attribute values of offer instead of
+    validating and recomputing them
+    """
+    offer_copy = Offer.__new__(Offer)
+    offer_copy.id = offer_copy.real_id = offer.id
+    offer_copy.price = offer.price
+    offer_copy.original_offer_price = offer.original_offer_price
+    offer_copy.energy = offer.energy
+    offer_copy.seller = offer.seller
+    offer_copy.seller_origin = offer.seller_origin
+    offer_copy.energy_rate = offer.energy_rate
+    offer_copy.time = offer.time
+    return offer_copy
 
 
 def offer_from_JSON_string(offer_string, current_time):
-    offer_dict = json.loads(offer_string)
+    offer_dict = loads(offer_string)
     object_type = offer_dict.pop("type")
     assert object_type == "Offer"
     real_id = offer_dict.pop('real_id')
@@ -112,6 +128,9 @@ def offer_from_JSON_string(offer_string, current_time):
 
 class Bid(namedtuple('Bid', ('id', 'time', 'price', 'energy', 'buyer',
                              'original_bid_price', 'buyer_origin', 'energy_rate'))):
+    # No per-instance __dict__, like the namedtuple base class
+    __slots__ = ()
+
     def __new__(cls, id, time, price, energy, buyer, original_bid_price=None,
                 buyer_origin=None, energy_rate=None):
         if energy_rate is None:
@@ -141,9 +160,9 @@ class Bid(namedtuple('Bid', ('id', 'time', 'price', 'energy', 'buyer',
         return rate, self.energy, self.price, self.buyer
 
     def to_JSON_string(self):
-        bid_dict = self._asdict()
+        bid_dict = dict(zip(self._fields, self))
         bid_dict["type"] = "Bid"
-        return json.dumps(bid_dict, default=my_converter)
+        return dumps(bid_dict, convert_datetimes=True)
 
     def serializable_dict(self):
         return {
@@ -153,19 +172,19 @@ class Bid(namedtuple('Bid', ('id', 'time', 'price', 'energy', 'buyer',
             "energy_rate": self.energy_rate,
             "buyer_origin": self.buyer_origin,
             "buyer": self.buyer,
-            "time": datetime_to_string_incl_seconds(self.time)
+            "time": time_string_incl_seconds(self.time)
         }
 
 
 def bid_from_JSON_string(bid_string):
-    bid_dict = json.loads(bid_string)
+    bid_dict = loads(bid_string)
     object_type = bid_dict.pop("type")
     assert object_type == "Bid"
     return Bid(**bid_dict)
 
 
 def offer_or_bid_from_JSON_string(offer_or_bid, current_time):
-    offer_bid_dict = json.loads(offer_or_bid)
+    offer_bid_dict = loads(offer_or_bid)
     object_type = offer_bid_dict.pop("type")
     offer_bid_dict['time'] = current_time
     if object_type == "Offer":
@@ -182,8 +201,10 @@ class TradeBidOfferInfo(namedtuple('TradeBidOfferInfo', ('original_bid_rate',
                                                          'original_offer_rate',
                                                          'propagated_offer_rate',
                                                          'trade_rate'))):
+    __slots__ = ()
+
     def to_JSON_string(self):
-        return json.dumps(self._asdict(), default=my_converter)
+        return dumps(dict(zip(self._fields, self)), convert_datetimes=True)
 
     @classmethod
     def len(cls):
@@ -191,13 +212,15 @@ class TradeBidOfferInfo(namedtuple('TradeBidOfferInfo', ('original_bid_rate',
 
 
 def trade_bid_info_from_JSON_string(info_string):
-    info_dict = json.loads(info_string)
+    info_dict = loads(info_string)
     return TradeBidOfferInfo(**info_dict)
 
 
 class Trade(namedtuple('Trade', ('id', 'time', 'offer', 'seller', 'buyer', 'residual',
                                  'already_tracked', 'offer_bid_trade_info', 'seller_origin',
                                  'buyer_origin', 'fee_price'))):
+    __slots__ = ()
+
     def __new__(cls, id, time, offer, seller, buyer, residual=None,
                 already_tracked=False, offer_bid_trade_info=None,
                 seller_origin=None, buyer_origin=None, fee_price=None):
@@ -224,12 +247,12 @@ class Trade(namedtuple('Trade', ('id', 'time', 'offer', 'seller', 'buyer', 'resi
         return self[1:2] + (rate, self.offer.energy) + self[3:5]
 
     def to_JSON_string(self):
-        trade_dict = self._asdict()
-        trade_dict['offer'] = trade_dict['offer'].to_JSON_string()
-        trade_dict['residual'] = trade_dict['residual'].to_JSON_string() \
-            if trade_dict['residual'] is not None else None
-        trade_dict['time'] = trade_dict['time'].isoformat()
-        return json.dumps(trade_dict)
+        trade_dict = dict(zip(self._fields, self))
+        trade_dict['offer'] = self.offer.to_JSON_string()
+        trade_dict['residual'] = self.residual.to_JSON_string() \
+            if self.residual is not None else None
+        trade_dict['time'] = isoformat(self.time)
+        return dumps(trade_dict)
 
     def serializable_dict(self):
         return {
@@ -246,12 +269,12 @@ class Trade(namedtuple('Trade', ('id', 'time', 'offer', 'seller', 'buyer', 'resi
             "seller_origin": self.seller_origin,
             "seller": self.seller,
             "fee_price": self.fee_price,
-            "time": datetime_to_string_incl_seconds(self.time)
+            "time": time_string_incl_seconds(self.time)
         }
 
 
 def trade_from_JSON_string(trade_string, current_time):
-    trade_dict = json.loads(trade_string)
+    trade_dict = loads(trade_string)
     trade_dict['offer'] = offer_or_bid_from_JSON_string(trade_dict['offer'], current_time)
     if 'residual' in trade_dict and trade_dict['residual'] is not None:
         trade_dict['residual'] = offer_or_bid_from_JSON_string(trade_dict['residual'],
@@ -271,6 +294,7 @@ def trade_from_JSON_string(trade_string, current_time):
 
 
 class BalancingOffer(Offer):
+    __slots__ = ()
 
     def __repr__(self):
         return "<BalancingOffer('{s.id!s:.6s}', '{s.energy} kWh@{s.price}', '{s.seller} {rate}'>"\
@@ -285,6 +309,8 @@ class BalancingOffer(Offer):
 class BalancingTrade(namedtuple('BalancingTrade', ('id', 'time', 'offer', 'seller',
                                                    'buyer', 'residual', 'offer_bid_trade_info',
                                                    'seller_origin', 'buyer_origin', 'fee_price'))):
+    __slots__ = ()
+
     def __new__(cls, id, time, offer, seller, buyer, residual=None, offer_bid_trade_info=None,
                 seller_origin=None, buyer_origin=None, fee_price=None):
         # overridden to give the residual field a default value
@@ -324,7 +350,7 @@ BidOfferMatch = namedtuple('BidOfferMatch', ['bid', 'bid_energy', 'offer', 'offe
 
 
 def parse_event_and_parameters_from_json_string(payload):
-    data = json.loads(payload["data"])
+    data = loads(payload["data"])
     kwargs = data["kwargs"]
     for key in ["offer", "existing_offer", "new_offer"]:
         if key in kwargs:
@@ -0,0 +1,91 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of D3A.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import json
+from operator import methodcaller
+
+from pendulum import DateTime
+from d3a_interface.utils import datetime_to_string_incl_seconds
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Upper bound of cached time strings, the cache is cleared once it is reached
+TIME_STRING_CACHE_SIZE = 4096
+
+
+def my_converter(o):
+    if isinstance(o, DateTime):
+        return isoformat(o)
+
+
+# Same settings as json.dumps(obj, default=my_converter), without creating an encoder per call
+_encoder_with_datetimes = json.JSONEncoder(default=my_converter)
+_encoder = json.JSONEncoder()
+
+
+def dumps(obj, convert_datetimes=False):
+    """
+    Same output as json.dumps(obj) (respectively json.dumps(obj, default=my_converter)).
+    The standard library encoder is used even if orjson is installed, because orjson does not
+    produce the same separators, which external clients might rely on.
+    """
+    if convert_datetimes:
+        return _encoder_with_datetimes.encode(obj)
+    return _encoder.encode(obj)
+
+
+def loads(json_string):
+    """
+    json.loads, using orjson if it is installed. orjson rejects the NaN and Infinity
+    constants that json.dumps writes, these strings are parsed by json.loads instead.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(json_string)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(json_string)
+
+
+def _cached_time_string(time, formatter, cache):
+    # The UTC offset is part of the key, because equal instants in different timezones compare
+    # equal but are formatted differently
+    key = (time, time.utcoffset())
+    time_string = cache.get(key)
+    if time_string is None:
+        if len(cache) >= TIME_STRING_CACHE_SIZE:
+            cache.clear()
+        time_string = cache[key] = formatter(time)
+    return time_string
+
+
+_isoformat = methodcaller("isoformat")
+_isoformat_strings = {}
+_strings_incl_seconds = {}
+
+
+def isoformat(time):
+    """Cached time.isoformat(), most orders of a market share the same time"""
+    return _cached_time_string(time, _isoformat, _isoformat_strings)
+
+
+def time_string_incl_seconds(time):
+    """Cached datetime_to_string_incl_seconds, most orders of a market share the same time"""
+    return _cached_time_string(time, datetime_to_string_incl_seconds, _strings_incl_seconds)
@@ -121,6 +121,52 @@ class OneSidedMarket(Market):
         # TODO: Once we add event-driven blockchain, this should be asynchronous
         self._notify_listeners(MarketEvent.OFFER_DELETED, offer=offer)
 
+    @lock_market_action
+    def update_offer(self, offer_or_id: Union[str, Offer], price: float,
+                     original_offer_price=None, adapt_price_with_fees=True,
+                     dispatch_event=True) -> Offer:
+        """
+        Reprice an open offer in place. The offer keeps its id, energy and seller, but is
+        ordered like a newly posted offer (i.e. it loses its time priority).
+        :param offer_or_id: Offer or id of the offer that should be repriced
+        :param price: New price of the offer, in cents
+        :param original_offer_price: New price of the original offer from the device
+        :return: The updated offer
+        """
+        if self.readonly:
+            raise MarketReadOnlyException()
+        if isinstance(offer_or_id, Offer):
+            offer_or_id = offer_or_id.id
+        existing_offer = self.offers.get(offer_or_id)
+        if existing_offer is None:
+            raise OfferNotFoundException()
+        if original_offer_price is None:
+            original_offer_price = price
+
+        if adapt_price_with_fees:
+            price = self._update_new_offer_price_with_fee(price, original_offer_price,
+                                                          existing_offer.energy)
+
+        if price < 0.0:
+            raise MarketException("Negative price after taxes, offer cannot be updated.")
+
+        offer = Offer(existing_offer.id, self.now, price, existing_offer.energy,
+                      existing_offer.seller, original_offer_price,
+                      seller_origin=existing_offer.seller_origin)
+        del self.offers[offer.id]
+        self.offers[offer.id] = offer
+        self.offer_history.append(offer)
+        self._update_min_max_avg_offer_prices()
+
+        log.debug(f"[OFFER][UPDATE][{self.name}][{self.time_slot_str}] {offer}")
+        if dispatch_event is True:
+            self.dispatch_market_offer_updated_event(existing_offer, offer)
+        return offer
+
+    def dispatch_market_offer_updated_event(self, existing_offer, new_offer):
+        self._notify_listeners(MarketEvent.OFFER_UPDATED,
+                               existing_offer=existing_offer, new_offer=new_offer)
+
     def _update_offer_fee_and_calculate_final_price(self, energy, trade_rate,
                                                     energy_portion, original_price):
         if self._is_constant_fees:
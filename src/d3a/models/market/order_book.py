@@ -0,0 +1,191 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of D3A.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from itertools import count
+from math import fsum
+from sortedcontainers import SortedList
+
+_MISSING = object()
+
+
+class _ExactSum:
+    """
+    Running sum of floats that supports removal of previously added values without
+    accumulating rounding errors (Shewchuk's algorithm, as used by math.fsum).
+    """
+    __slots__ = ("_partials", )
+
+    def __init__(self):
+        self._partials = []
+
+    def add(self, x):
+        partials = self._partials
+        i = 0
+        for y in partials:
+            if abs(x) < abs(y):
+                x, y = y, x
+            hi = x + y
+            lo = y - (hi - x)
+            if lo:
+                partials[i] = lo
+                i += 1
+            x = hi
+        partials[i:] = [x]
+
+    def subtract(self, x):
+        self.add(-x)
+
+    def clear(self):
+        self._partials.clear()
+
+    @property
+    def value(self):
+        return fsum(self._partials)
+
+
+class OrderBook(dict):
+    """
+    Dict of offers or bids (id -> Offer / Bid) that additionally keeps its values ordered
+    by energy rate.
+
+    The sort key of every entry is captured when the entry is inserted, therefore changing
+    the price of an offer that is already part of the order book does not corrupt the index.
+    Entries with the same energy rate are ordered by insertion, which reproduces the ordering
+    of a stable sort over the dict values.
+    The total price and energy of all entries are kept up to date on every insertion and
+    removal, in order for the aggregated statistics to not require a scan of the values.
+    Every key that is added to the order book is appended to an insertion log, which allows
+    consumers to find the entries that were added since they last looked at the order book
+    without scanning it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._sequence = count()
+        # id -> ((energy_rate, sequence, id), price, energy)
+        self._entries = {}
+        self._sorted_keys = SortedList()
+        self._total_price = _ExactSum()
+        self._total_energy = _ExactSum()
+        self._insertion_log = []
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, key, value):
+        old_entry = self._entries.get(key)
+        if old_entry is not None:
+            self._remove_entry(old_entry)
+            sequence = old_entry[0][1]
+        else:
+            sequence = next(self._sequence)
+            self._insertion_log.append(key)
+        entry = ((value.energy_rate, sequence, key), value.price, value.energy)
+        self._entries[key] = entry
+        self._sorted_keys.add(entry[0])
+        self._total_price.add(entry[1])
+        self._total_energy.add(entry[2])
+        super().__setitem__(key, value)
+
+    def _remove_entry(self, entry):
+        sort_key, price, energy = entry
+        self._sorted_keys.remove(sort_key)
+        if self._sorted_keys:
+            self._total_price.subtract(price)
+            self._total_energy.subtract(energy)
+        else:
+            self._total_price.clear()
+            self._total_energy.clear()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._remove_entry(self._entries.pop(key))
+
+    def pop(self, key, default=_MISSING):
+        if key not in self:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        value = super().pop(key)
+        self._remove_entry(self._entries.pop(key))
+        return value
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._remove_entry(self._entries.pop(key))
+        return key, value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        super().clear()
+        self._entries.clear()
+        self._sorted_keys.clear()
+        self._total_price.clear()
+        self._total_energy.clear()
+
+    def copy(self):
+        return OrderBook(self)
+
+    def __reduce__(self):
+        return self.__class__, (dict(self), )
+
+    def iter_sorted(self, reverse=False):
+        """Iterate over the values in ascending (or descending) energy rate order"""
+        for _, _, key in (reversed(self._sorted_keys) if reverse else self._sorted_keys):
+            yield dict.__getitem__(self, key)
+
+    def sorted_values(self, reverse=False):
+        """List of the values in ascending (or descending) energy rate order"""
+        return list(self.iter_sorted(reverse))
+
+    def best(self, reverse=False):
+        """
+        Value with the lowest (or highest if reverse is set) energy rate, None if the order
+        book is empty
+        """
+        if not self._sorted_keys:
+            return None
+        return dict.__getitem__(self, self._sorted_keys[-1 if reverse else 0][2])
+
+    def best_rate(self, reverse=False):
+        """Lowest (or highest if reverse is set) energy rate, None if the order book is empty"""
+        if not self._sorted_keys:
+            return None
+        return self._sorted_keys[-1 if reverse else 0][0]
+
+    def keys_added_since(self, position):
+        """
+        Keys that were added after the insertion log reached position, in insertion order.
+        Keys that were removed again in the meantime are part of the result as well.
+        :return: Tuple of the current position of the insertion log and the list of keys
+        """
+        log = self._insertion_log
+        return len(log), log[position:]
+
+    @property
+    def total_price(self):
+        return self._total_price.value
+
+    @property
+    def total_energy(self):
+        return self._total_energy.value
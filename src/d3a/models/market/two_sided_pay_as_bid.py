@@ -15,13 +15,13 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
-import uuid
 from typing import Union  # noqa
 from logging import getLogger
 
 from d3a.models.market import lock_market_action
 from d3a.models.market.one_sided import OneSidedMarket
-from d3a.d3a_core.exceptions import BidNotFound, InvalidBid, InvalidTrade, MarketException
+from d3a.d3a_core.exceptions import BidNotFound, InvalidBid, InvalidTrade, MarketException, \
+    MarketReadOnlyException
 from d3a.models.market.market_structures import Bid, Trade, TradeBidOfferInfo
 from d3a.events.event_structures import MarketEvent
 from d3a.constants import FLOATING_POINT_TOLERANCE
@@ -77,7 +77,7 @@ class TwoSidedPayAsBid(OneSidedMarket):
         if price < 0.0:
             raise MarketException("Negative price after taxes, bid cannot be posted.")
 
-        bid = Bid(str(uuid.uuid4()) if bid_id is None else bid_id,
+        bid = Bid(self.bc_interface.create_new_id() if bid_id is None else bid_id,
                   self.now, price, energy, buyer, original_bid_price, buyer_origin)
         self.bids[bid.id] = bid
         if add_to_history is True:
@@ -95,6 +95,47 @@ class TwoSidedPayAsBid(OneSidedMarket):
         log.debug(f"[BID][DEL][{self.time_slot_str}] {bid}")
         self._notify_listeners(MarketEvent.BID_DELETED, bid=bid)
 
+    @lock_market_action
+    def update_bid(self, bid_or_id: Union[str, Bid], price: float, original_bid_price=None,
+                   adapt_price_with_fees=True, dispatch_event=True) -> Bid:
+        """
+        Reprice an open bid in place. The bid keeps its id, energy and buyer, but is
+        ordered like a newly posted bid (i.e. it loses its time priority).
+        :param bid_or_id: Bid or id of the bid that should be repriced
+        :param price: New price of the bid, in cents
+        :param original_bid_price: New price of the original bid from the device
+        :return: The updated bid
+        """
+        if self.readonly:
+            raise MarketReadOnlyException()
+        if isinstance(bid_or_id, Bid):
+            bid_or_id = bid_or_id.id
+        existing_bid = self.bids.get(bid_or_id)
+        if existing_bid is None:
+            raise BidNotFound(bid_or_id)
+        if original_bid_price is None:
+            original_bid_price = price
+
+        if adapt_price_with_fees:
+            price = self._update_new_bid_price_with_fee(price, original_bid_price)
+
+        if price < 0.0:
+            raise MarketException("Negative price after taxes, bid cannot be updated.")
+
+        bid = Bid(existing_bid.id, self.now, price, existing_bid.energy, existing_bid.buyer,
+                  original_bid_price, existing_bid.buyer_origin)
+        del self.bids[bid.id]
+        self.bids[bid.id] = bid
+        self.bid_history.append(bid)
+        log.debug(f"[BID][UPDATE][{self.time_slot_str}] {bid}")
+        if dispatch_event is True:
+            self.dispatch_market_bid_updated_event(existing_bid, bid)
+        return bid
+
+    def dispatch_market_bid_updated_event(self, existing_bid, new_bid):
+        self._notify_listeners(MarketEvent.BID_UPDATED,
+                               existing_bid=existing_bid, new_bid=new_bid)
+
     def split_bid(self, original_bid, energy, orig_bid_price):
 
         self.bids.pop(original_bid.id, None)
@@ -181,7 +222,7 @@ class TwoSidedPayAsBid(OneSidedMarket):
             trade_offer_info, ignore_fees=True
         )
 
-        trade = Trade(str(uuid.uuid4()), self.now, bid, seller,
+        trade = Trade(self.bc_interface.create_new_id(), self.now, bid, seller,
                       buyer, residual_bid, already_tracked=already_tracked,
                       offer_bid_trade_info=updated_bid_trade_info,
                       buyer_origin=bid.buyer_origin, seller_origin=seller_origin,
@@ -203,21 +244,37 @@ class TwoSidedPayAsBid(OneSidedMarket):
         #    since the most affordable offers will be allocated for the most aggressive buyers.
 
         # Sorted bids in descending order
-        sorted_bids = self.sorting(self.bids, True)
+        sorted_bids = self.bids.sorted_values(reverse=True)
 
         # Sorted offers in descending order
-        sorted_offers = self.sorting(self.offers, True)
-
-        already_selected_bids = set()
+        sorted_offers = self.offers.sorted_values(reverse=True)
+
+        # Every offer is matched with the most expensive bid that has not been selected yet,
+        # that it can afford and that was not placed by the offer's seller. Since the offer
+        # rates are descending, the affordable bids are a growing prefix of sorted_bids,
+        # therefore a single pointer is enough to walk through the bids. Bids that were
+        # skipped because of the seller / buyer exclusion are kept aside in rate order, in
+        # order to be considered again for the following offers.
+        bid_index = 0
+        skipped_bids = []
         offer_bid_pairs = []
         for offer in sorted_offers:
-            for bid in sorted_bids:
-                if bid.id not in already_selected_bids and \
-                        (offer.energy_rate - bid.energy_rate) <= \
-                        FLOATING_POINT_TOLERANCE and offer.seller != bid.buyer:
-                    already_selected_bids.add(bid.id)
-                    offer_bid_pairs.append(tuple((bid, offer)))
+            selected_bid = None
+            for index, bid in enumerate(skipped_bids):
+                if offer.seller != bid.buyer:
+                    selected_bid = skipped_bids.pop(index)
+                    break
+            while selected_bid is None and bid_index < len(sorted_bids):
+                bid = sorted_bids[bid_index]
+                if (offer.energy_rate - bid.energy_rate) > FLOATING_POINT_TOLERANCE:
                     break
+                bid_index += 1
+                if offer.seller != bid.buyer:
+                    selected_bid = bid
+                else:
+                    skipped_bids.append(bid)
+            if selected_bid is not None:
+                offer_bid_pairs.append(tuple((selected_bid, offer)))
         return offer_bid_pairs
 
     def accept_bid_offer_pair(self, bid, offer, clearing_rate, trade_bid_info, selected_energy):
@@ -241,8 +298,11 @@ class TwoSidedPayAsBid(OneSidedMarket):
         return bid_trade, trade
 
     def match_offers_bids(self):
-        while len(self._perform_pay_as_bid_matching()) > 0:
-            for bid, offer in self._perform_pay_as_bid_matching():
+        # Residual offers and bids keep the rate of the original ones and are matched on the
+        # next iteration, once all pairs of the current iteration have been traded.
+        offer_bid_pairs = self._perform_pay_as_bid_matching()
+        while len(offer_bid_pairs) > 0:
+            for bid, offer in offer_bid_pairs:
                 selected_energy = bid.energy if bid.energy < offer.energy else offer.energy
                 original_bid_rate = bid.original_bid_price / bid.energy
                 matched_rate = bid.energy_rate
@@ -256,3 +316,4 @@ class TwoSidedPayAsBid(OneSidedMarket):
 
                 self.accept_bid_offer_pair(bid, offer, matched_rate,
                                            trade_bid_info, selected_energy)
+            offer_bid_pairs = self._perform_pay_as_bid_matching()
@@ -17,7 +17,8 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import math
 from logging import getLogger
-from collections import OrderedDict
+from collections import OrderedDict, deque
+import numpy as np
 
 from d3a.models.market.two_sided_pay_as_bid import TwoSidedPayAsBid
 from d3a.models.market.market_structures import MarketClearingState, BidOfferMatch, \
@@ -110,8 +111,47 @@ class TwoSidedPayAsClear(TwoSidedPayAsBid):
             if len(clearing) > 0:
                 return clearing[-1].rate, clearing[-1].energy
 
+    @staticmethod
+    def _cumulative_curve_arrays(offer_bid):
+        """
+        Vectorized equivalent of _accumulated_energy_per_rate. Returns the distinct rates
+        of the (rate-sorted) offers or bids and the cumulative energy up to and including
+        the last offer / bid of each rate, both in the order of the input list.
+        """
+        prices = np.fromiter((o.price for o in offer_bid), dtype=float, count=len(offer_bid))
+        energies = np.fromiter((o.energy for o in offer_bid), dtype=float, count=len(offer_bid))
+        rates = prices / energies
+        cumulative_energy = np.cumsum(energies)
+        last_of_rate = np.append(rates[1:] != rates[:-1], True)
+        return rates[last_of_rate], cumulative_energy[last_of_rate]
+
+    @staticmethod
+    def _clearing_point_from_cumulative_arrays(bid_rates, bid_energies,
+                                               offer_rates, offer_energies):
+        """
+        Vectorized equivalent of _clearing_point_from_supply_demand_curve.
+        Bid arrays are expected in ascending rate order (descending cumulative energy),
+        offer arrays in ascending rate order (ascending cumulative energy).
+        """
+        # Index of the most expensive offer that is affordable for each bid rate. Since the
+        # cumulative offer energy is ascending, this offer carries the maximum supply
+        # available at the bid rate.
+        supply_index = np.searchsorted(
+            offer_rates, bid_rates + FLOATING_POINT_TOLERANCE, side="right") - 1
+        has_supply = supply_index >= 0
+        if not has_supply.any():
+            return None
+        supply = offer_energies[np.maximum(supply_index, 0)]
+        # if cumulative_supply is greater than cumulative_demand
+        demand_covered = has_supply & (supply >= bid_energies)
+        if demand_covered.any():
+            index = int(np.argmax(demand_covered))
+            return float(bid_rates[index]), float(bid_energies[index])
+        index = int(len(has_supply) - 1 - np.argmax(has_supply[::-1]))
+        return float(bid_rates[index]), float(supply[index])
+
     def _perform_pay_as_clear_matching(self):
-        self.sorted_bids = self.sorting(self.bids, True)
+        self.sorted_bids = self.bids.sorted_values(reverse=True)
 
         if len(self.sorted_bids) == 0 or len(self.sorted_offers) == 0:
             return
@@ -130,6 +170,15 @@ class TwoSidedPayAsClear(TwoSidedPayAsBid):
             max_rate = self._populate_market_cumulative_offer_and_bid(cumulative_bids,
                                                                       cumulative_offers)
             return self._get_clearing_point(max_rate)
+        elif ConstSettings.IAASettings.PAY_AS_CLEAR_AGGREGATION_ALGORITHM == 3:
+            bid_rates, bid_energies = self._cumulative_curve_arrays(self.sorted_bids)
+            offer_rates, offer_energies = self._cumulative_curve_arrays(self.sorted_offers)
+            self.state.cumulative_bids[self.now] = \
+                OrderedDict(zip(bid_rates.tolist(), bid_energies.tolist()))
+            self.state.cumulative_offers[self.now] = \
+                OrderedDict(zip(offer_rates.tolist(), offer_energies.tolist()))
+            return self._clearing_point_from_cumulative_arrays(
+                bid_rates[::-1], bid_energies[::-1], offer_rates, offer_energies)
 
     def _populate_market_cumulative_offer_and_bid(self, cumulative_bids, cumulative_offers):
         max_rate = max(
@@ -162,9 +211,13 @@ class TwoSidedPayAsClear(TwoSidedPayAsBid):
             clearing_energy, self.sorted_offers, self.sorted_bids
         )
 
-        for index, match in enumerate(matchings):
-            offer = match.offer
-            bid = match.bid
+        # Offers and bids that were partially traded are substituted by their residuals
+        # when the following matches that refer to them are consumed
+        residual_offers = {}
+        residual_bids = {}
+        for match in matchings:
+            offer = self._resolve_residual(match.offer, residual_offers)
+            bid = self._resolve_residual(match.bid, residual_bids)
 
             assert math.isclose(match.offer_energy, match.bid_energy)
 
@@ -189,23 +242,25 @@ class TwoSidedPayAsClear(TwoSidedPayAsBid):
                 bid, offer, clearing_rate, trade_bid_info, selected_energy
             )
 
-            if trade.residual is not None or bid_trade.residual is not None:
-                matchings = self._replace_offers_bids_with_residual_in_matching_list(
-                    matchings, index+1, trade, bid_trade
-                )
+            if trade.residual is not None:
+                residual_offers[trade.offer.id] = trade.residual
+            if bid_trade.residual is not None:
+                residual_bids[bid_trade.offer.id] = bid_trade.residual
 
     @classmethod
     def _create_bid_offer_matchings(cls, clearing_energy, offer_list, bid_list):
         # Return value, holds the bid-offer matches
         bid_offer_matchings = []
+        # Offers are consumed from the front of the queue, in the order of offer_list
+        offer_queue = deque(offer_list)
         # Keeps track of the residual energy from offers that have been matched once,
         # in order for their energy to be correctly tracked on following bids
         residual_offer_energy = {}
         for bid in bid_list:
             bid_energy = bid.energy
             while bid_energy > FLOATING_POINT_TOLERANCE:
-                # Get the first offer from the list
-                offer = offer_list.pop(0)
+                # Get the first offer from the queue
+                offer = offer_queue.popleft()
                 # See if this offer has been matched with another bid beforehand.
                 # If it has, fetch the offer energy from the residual dict
                 # Otherwise, use offer energy as is.
@@ -214,9 +269,9 @@ class TwoSidedPayAsClear(TwoSidedPayAsBid):
                     # Bid energy completely covered by offer energy
                     # Update the residual offer energy to take into account the matched offer
                     residual_offer_energy[offer.id] = offer_energy - bid_energy
-                    # Place the offer at the front of the offer list to cover following bids
+                    # Place the offer back at the front of the queue to cover following bids
                     # since the offer still has some energy left
-                    offer_list.insert(0, offer)
+                    offer_queue.appendleft(offer)
                     # Save the matching
                     bid_offer_matchings.append(
                         BidOfferMatch(bid=bid, bid_energy=bid_energy,
@@ -246,19 +301,14 @@ class TwoSidedPayAsClear(TwoSidedPayAsBid):
 
         return bid_offer_matchings
 
-    @classmethod
-    def _replace_offers_bids_with_residual_in_matching_list(
-            cls, matchings, start_index, offer_trade, bid_trade
-    ):
-        def _convert_match_to_residual(match):
-            if match.offer.id == offer_trade.offer.id:
-                assert offer_trade.residual is not None
-                match = match._replace(offer=offer_trade.residual)
-            if match.bid.id == bid_trade.offer.id:
-                assert bid_trade.residual is not None
-                match = match._replace(bid=bid_trade.residual)
-            return match
-
-        matchings[start_index:] = [_convert_match_to_residual(match)
-                                   for match in matchings[start_index:]]
-        return matchings
+    @staticmethod
+    def _resolve_residual(offer_or_bid, residuals):
+        """
+        Return the residual that replaced offer_or_bid after (possibly multiple) partial
+        trades, or offer_or_bid itself if it has not been partially traded.
+        :param offer_or_bid: Offer or Bid as it was selected by the matching algorithm
+        :param residuals: id of the partially traded offer / bid -> residual offer / bid
+        """
+        while offer_or_bid.id in residuals:
+            offer_or_bid = residuals[offer_or_bid.id]
+        return offer_or_bid
@@ -16,17 +16,26 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import csv
+import hashlib
 import os
 import ast
+import re
+import sys
+from datetime import datetime, timedelta
 from enum import Enum
+from logging import getLogger
 from pendulum import duration, from_format, from_timestamp, today, DateTime
-from typing import Dict
+from typing import Dict, List, Iterable
+
+import numpy as np
 
 import d3a.constants
 from d3a.constants import TIME_FORMAT, DATE_TIME_FORMAT, TIME_ZONE, CN_PROFILE_EXPANSION_DAYS
 from d3a_interface.constants_limits import GlobalConfig, DATE_TIME_FORMAT_SECONDS
 from d3a.d3a_core.util import generate_market_slot_list, convert_kW_to_kWh, \
-    find_object_of_same_weekday_and_time, return_ordered_dict
+    find_object_of_same_weekday_and_time, return_ordered_dict, ProfileDict
+
+log = getLogger(__name__)
 
 """
 Exposes mixins that can be used from strategy classes.
@@ -92,26 +101,79 @@ def _remove_header(profile_dict: Dict) -> Dict:
     return out_dict
 
 
+_TIME_FORMATS = (TIME_FORMAT, DATE_TIME_FORMAT, DATE_TIME_FORMAT_SECONDS)
+_TIME_FORMAT_TOKENS = re.compile("YYYY|MM|DD|HH|mm|ss")
+
+
+def _time_format_pattern(time_format: str):
+    """
+    Regular expression that matches the time stamps of time_format, with the same separators
+    and zero padded digits
+    """
+    return re.compile("".join(
+        r"\d{%d}" % len(part) if _TIME_FORMAT_TOKENS.fullmatch(part) else re.escape(part)
+        for part in re.split(f"({_TIME_FORMAT_TOKENS.pattern})", time_format) if part))
+
+
+_TIME_FORMAT_PATTERNS = {time_format: _time_format_pattern(time_format)
+                         for time_format in _TIME_FORMATS}
+# datetime addition, that returns a pendulum DateTime without the overhead of DateTime.add
+_add_to_datetime = datetime.__add__
+
+
+def _time_format_exception():
+    return Exception(f"Format of time-stamp is not one of ('{TIME_FORMAT}', "
+                     f"'{DATE_TIME_FORMAT}', '{DATE_TIME_FORMAT_SECONDS}')")
+
+
 def _eval_time_format(time_dict: Dict) -> str:
     """
-    Evaluates which time format the provided dictionary has, also checks if the time-format is
-    consistent for each time_slot
+    Evaluates which time format the provided dictionary has, from its first time stamp. The
+    consistency of the other time stamps is checked when they are parsed.
     :return: TIME_FORMAT or DATE_TIME_FORMAT or DATE_TIME_FORMAT_SECONDS
     """
-    try:
-        [from_format(str(ti), TIME_FORMAT) for ti in time_dict.keys()]
+    if not time_dict:
         return TIME_FORMAT
-    except ValueError:
+    sample = str(next(iter(time_dict)))
+    for time_format in _TIME_FORMATS:
         try:
-            [from_format(str(ti), DATE_TIME_FORMAT) for ti in time_dict.keys()]
-            return DATE_TIME_FORMAT
+            from_format(sample, time_format)
+            return time_format
         except ValueError:
-            try:
-                [from_format(str(ti), DATE_TIME_FORMAT_SECONDS) for ti in time_dict.keys()]
-                return DATE_TIME_FORMAT_SECONDS
-            except ValueError:
-                raise Exception(f"Format of time-stamp is not one of ('{TIME_FORMAT}', "
-                                f"'{DATE_TIME_FORMAT}', '{DATE_TIME_FORMAT_SECONDS}')")
+            pass
+    raise _time_format_exception()
+
+
+def _parse_time_strings(time_strings: Iterable, time_format: str) -> List[DateTime]:
+    """
+    Same as [_str_to_datetime(str(ti), time_format) for ti in time_strings], parsing all time
+    stamps in one vectorized pass. Every time stamp is checked against the layout of
+    time_format first, because NumPy also accepts other separators and ISO 8601 variants.
+    """
+    time_strings = [str(ti) for ti in time_strings]
+    if len(time_strings) == 0:
+        return []
+    if time_format not in _TIME_FORMAT_PATTERNS:
+        raise ValueError("Provided time_format invalid.")
+    if not all(map(_TIME_FORMAT_PATTERNS[time_format].fullmatch, time_strings)):
+        raise _time_format_exception()
+    time_strings = np.array(time_strings, dtype=str)
+    if time_format == TIME_FORMAT:
+        time_strings = np.char.add("1970-01-01T", time_strings)
+        start = GlobalConfig.start_date
+    else:
+        start = from_timestamp(0, tz=TIME_ZONE)
+    try:
+        seconds = time_strings.astype("datetime64[s]").astype(np.int64).tolist()
+    except ValueError:
+        raise _time_format_exception()
+    return [_add_to_datetime(start, timedelta(seconds=second)) for second in seconds]
+
+
+def _str_keys_to_datetime(profile: Dict) -> Dict[DateTime, float]:
+    """Converts the time stamp strings of the profile keys into DateTime objects"""
+    time_format = _eval_time_format(profile)
+    return dict(zip(_parse_time_strings(profile.keys(), time_format), profile.values()))
 
 
 def _readCSV(path: str) -> Dict:
@@ -133,53 +195,36 @@ def _readCSV(path: str) -> Dict:
                 profile_data[row[0]] = float(row[1])
             except ValueError:
                 pass
-    time_format = _eval_time_format(profile_data)
-    return dict((_str_to_datetime(time_str, time_format), value)
-                for time_str, value in profile_data.items())
+    return _str_keys_to_datetime(profile_data)
 
 
 def _calculate_energy_from_power_profile(profile_data_W: Dict[DateTime, float],
                                          slot_length: duration) -> Dict[DateTime, float]:
     """
-    Calculates energy from power profile. Does not use numpy, calculates avg power for each
-    market slot and based on that calculates energy.
-    :param profile_data_W: Power profile in W
+    Calculates energy from power profile. The power of a time stamp is valid until the next
+    time stamp (the power of the last time stamp for one more market slot). The energy of each
+    market slot is calculated from the power at the start of the slot, which is looked up
+    directly from the time stamps of the profile.
+    :param profile_data_W: Power profile in W, ordered by time
     :param slot_length: slot length duration
     :return: a mapping from time to energy values in kWh
     """
-    input_time_list = list(profile_data_W.keys())
-
-    # add one market slot in order to have another data point for integration
-    additional_time_stamp = input_time_list[-1] + slot_length
-    profile_data_W[additional_time_stamp] = profile_data_W[input_time_list[-1]]
-    input_time_list.append(additional_time_stamp)
-
+    input_time_seconds_list = [int(ti.timestamp()) for ti in profile_data_W.keys()]
     input_power_list_W = [float(dp) for dp in profile_data_W.values()]
-
-    time0 = from_timestamp(0)
-    input_time_seconds_list = [(ti - time0).in_seconds()
-                               for ti in input_time_list]
-
-    slot_time_list = [i for i in range(input_time_seconds_list[0], input_time_seconds_list[-1],
-                                       slot_length.in_seconds())]
-
-    second_power_list_W = [
-        input_power_list_W[index - 1]
-        for index, seconds in enumerate(input_time_seconds_list)
-        for _ in range(seconds - input_time_seconds_list[index - 1])
-    ]
-
-    avg_power_kW = []
-    for index, slot in enumerate(slot_time_list):
-        first_index = index * slot_length.in_seconds()
-        if first_index <= len(second_power_list_W):
-            avg_power_kW.append(second_power_list_W[first_index] / 1000.)
-
-    slot_energy_kWh = list(map(lambda x: convert_kW_to_kWh(x, slot_length), avg_power_kW))
-
-    return {from_timestamp(slot_time_list[ii]): energy
-            for ii, energy in enumerate(slot_energy_kWh)
-            }
+    slot_length_seconds = slot_length.in_seconds()
+
+    slot_energy_kWh = {}
+    power_index = 0
+    last_power_index = len(input_time_seconds_list) - 1
+    for slot_seconds in range(input_time_seconds_list[0],
+                              input_time_seconds_list[-1] + slot_length_seconds,
+                              slot_length_seconds):
+        while power_index < last_power_index and \
+                input_time_seconds_list[power_index + 1] <= slot_seconds:
+            power_index += 1
+        slot_energy_kWh[from_timestamp(slot_seconds)] = \
+            convert_kW_to_kWh(input_power_list_W[power_index] / 1000., slot_length)
+    return slot_energy_kWh
 
 
 def _fill_gaps_in_profile(input_profile: Dict = None) -> Dict:
@@ -197,6 +242,10 @@ def _fill_gaps_in_profile(input_profile: Dict = None) -> Dict:
     else:
         current_val = 0
 
+    if d3a.constants.IS_CANARY_NETWORK:
+        # compiles the weekday and time lookup once for all time slots
+        input_profile = ProfileDict(input_profile)
+
     for time in out_profile.keys():
         if d3a.constants.IS_CANARY_NETWORK:
             temp_val = find_object_of_same_weekday_and_time(input_profile, time,
@@ -235,9 +284,7 @@ def _read_from_different_sources_todict(input_profile) -> Dict[DateTime, float]:
             # Remove filename entry to support d3a-web profiles
             profile.pop("filename", None)
             profile = _remove_header(profile)
-            time_format = _eval_time_format(profile)
-            profile = {_str_to_datetime(key, time_format): val
-                       for key, val in profile.items()}
+            profile = _str_keys_to_datetime(profile)
         elif isinstance(list(input_profile.keys())[0], DateTime):
             return input_profile
 
@@ -246,9 +293,7 @@ def _read_from_different_sources_todict(input_profile) -> Dict[DateTime, float]:
             input_profile = _remove_header(input_profile)
             # Remove filename from profile
             input_profile.pop("filename", None)
-            time_format = _eval_time_format(input_profile)
-            profile = {_str_to_datetime(key, time_format): val
-                       for key, val in input_profile.items()}
+            profile = _str_keys_to_datetime(input_profile)
 
         elif isinstance(list(input_profile.keys())[0], int) or \
                 isinstance(list(input_profile.keys())[0], float):
@@ -309,19 +354,9 @@ def copy_profile_to_multiple_days(profile):
 
 
 @return_ordered_dict
-def read_arbitrary_profile(profile_type: InputProfileTypes,
-                           input_profile) -> Dict[DateTime, float]:
-    """
-    Reads arbitrary profile.
-    Handles csv, dict and string input.
-    Fills gaps in the profile.
-    :param profile_type: Can be either rate or power
-    :param input_profile: Can be either a csv file path,
-    or a dict with hourly data (Dict[int, float])
-    or a dict with arbitrary time data (Dict[str, float])
-    or a string containing a serialized dict of the aforementioned structure
-    :return: a mapping from time to profile values
-    """
+def _read_arbitrary_profile(profile_type: InputProfileTypes,
+                            input_profile) -> Dict[DateTime, float]:
+    """Reads the profile without caching, see read_arbitrary_profile"""
 
     profile = _read_from_different_sources_todict(input_profile)
     profile_time_list = list(profile.keys())
@@ -340,6 +375,106 @@ def read_arbitrary_profile(profile_type: InputProfileTypes,
             return filled_profile
 
 
+class ProfileCache:
+    """
+    Process-wide cache of the profiles returned by read_arbitrary_profile.
+
+    Profiles are addressed by the content of their source (the file content for csv files,
+    otherwise the representation of the input profile) and by the parameters that they are
+    expanded with (profile type, start date, slot length, simulation duration, market count,
+    canary network mode). Identical profiles of different devices are therefore only read
+    once and the same profile object is shared between the strategies, which must treat
+    it as read-only.
+    """
+
+    def __init__(self):
+        self._profiles = {}
+        self.hits = 0
+        self.misses = 0
+        self.memory_saved_bytes = 0
+
+    def clear(self):
+        self._profiles.clear()
+        self.hits = 0
+        self.misses = 0
+        self.memory_saved_bytes = 0
+
+    def __len__(self):
+        return len(self._profiles)
+
+    @property
+    def hit_rate(self):
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def stats(self):
+        return {
+            "profiles": len(self._profiles),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "memory_saved_bytes": self.memory_saved_bytes
+        }
+
+    def log_stats(self):
+        if self.hits + self.misses == 0:
+            return
+        log.info(f"Profile cache: {len(self._profiles)} profiles, {self.hits} hits, "
+                 f"{self.misses} misses (hit rate {self.hit_rate:.1%}), "
+                 f"{self.memory_saved_bytes / 1024 / 1024:.2f} MB saved.")
+
+    @staticmethod
+    def key(profile_type: InputProfileTypes, input_profile):
+        if os.path.isfile(str(input_profile)):
+            with open(str(input_profile), "rb") as profile_file:
+                content = profile_file.read()
+        else:
+            content = repr(input_profile).encode("utf-8")
+        return (profile_type, hashlib.sha1(content).hexdigest(),
+                GlobalConfig.start_date, GlobalConfig.slot_length, GlobalConfig.sim_duration,
+                GlobalConfig.market_count, d3a.constants.IS_CANARY_NETWORK,
+                today(tz=TIME_ZONE))
+
+    def get_or_read(self, profile_type: InputProfileTypes, input_profile):
+        key = self.key(profile_type, input_profile)
+        if key in self._profiles:
+            profile, size_bytes = self._profiles[key]
+            self.hits += 1
+            self.memory_saved_bytes += size_bytes
+            return profile
+        profile = _read_arbitrary_profile(profile_type, input_profile)
+        self.misses += 1
+        self._profiles[key] = (profile, _profile_size_bytes(profile))
+        return profile
+
+
+def _profile_size_bytes(profile: Dict) -> int:
+    """Approximate memory footprint of the profile dict, including its keys and values"""
+    return sys.getsizeof(profile) + sum(
+        sys.getsizeof(time_slot) + sys.getsizeof(value) for time_slot, value in profile.items())
+
+
+profile_cache = ProfileCache()
+
+
+def read_arbitrary_profile(profile_type: InputProfileTypes,
+                           input_profile) -> Dict[DateTime, float]:
+    """
+    Reads arbitrary profile.
+    Handles csv, dict and string input.
+    Fills gaps in the profile.
+    The returned profile is shared between all callers that read an identical profile, and
+    must not be modified.
+    :param profile_type: Can be either rate or power
+    :param input_profile: Can be either a csv file path,
+    or a dict with hourly data (Dict[int, float])
+    or a dict with arbitrary time data (Dict[str, float])
+    or a string containing a serialized dict of the aforementioned structure
+    :return: a mapping from time to profile values
+    """
+    return profile_cache.get_or_read(profile_type, input_profile)
+
+
 def read_and_convert_identity_profile_to_float(profile):
     parsed_profile = ast.literal_eval(str(profile))
     generated_profile = read_arbitrary_profile(InputProfileTypes.IDENTITY, parsed_profile)
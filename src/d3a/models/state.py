@@ -16,15 +16,15 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 from pendulum import DateTime  # NOQA
-from typing import Dict  # NOQA
+from typing import Dict, Tuple  # NOQA
 from collections import namedtuple
 from enum import Enum
 from math import isclose
 from d3a_interface.constants_limits import ConstSettings
-from d3a_interface.utils import convert_pendulum_to_str_in_dict, convert_str_to_pendulum_in_dict
 from d3a import limit_float_precision
 from d3a.d3a_core.util import write_default_to_dict, convert_kW_to_kWh
 from d3a.constants import FLOATING_POINT_TOLERANCE
+from d3a.models.state_store import TimeSlotStore
 
 StorageSettings = ConstSettings.StorageSettings
 
@@ -42,7 +42,25 @@ StorageSettings = ConstSettings.StorageSettings
 # - If a device has no state, maybe it doesn't need its own appliance class either
 
 
-class PVState:
+class TimeSlotStates:
+    """
+    Base class of the states. The attributes listed in time_slot_attributes hold a
+    TimeSlotStore, mappings that are assigned to them are converted.
+    """
+    time_slot_attributes = ()  # type: Tuple[str, ...]
+
+    def __setattr__(self, name, value):
+        if name in self.time_slot_attributes and not isinstance(value, TimeSlotStore):
+            value = TimeSlotStore(value)
+        super().__setattr__(name, value)
+
+
+class PVState(TimeSlotStates):
+    time_slot_attributes = (
+        "_available_energy_kWh",
+        "_energy_production_forecast_kWh"
+    )
+
     def __init__(self):
         self._available_energy_kWh = {}
         self._energy_production_forecast_kWh = {}
@@ -76,29 +94,29 @@ class PVState:
         assert self._energy_production_forecast_kWh[time_slot] >= 0.0
 
     def delete_past_state(self, current_market_time_slot):
-        to_delete = []
-        for market_slot in self._available_energy_kWh.keys():
-            if market_slot < current_market_time_slot:
-                to_delete.append(market_slot)
-        for market_slot in to_delete:
-            self._available_energy_kWh.pop(market_slot, None)
-            self._energy_production_forecast_kWh.pop(market_slot, None)
+        self._available_energy_kWh.delete_before(current_market_time_slot)
+        self._energy_production_forecast_kWh.delete_before(current_market_time_slot)
 
     def get_state(self):
         return {
-            "available_energy_kWh": convert_pendulum_to_str_in_dict(self._available_energy_kWh),
+            "available_energy_kWh": self._available_energy_kWh.to_time_string_dict(),
             "energy_production_forecast_kWh":
-                convert_pendulum_to_str_in_dict(self._energy_production_forecast_kWh)
+                self._energy_production_forecast_kWh.to_time_string_dict()
         }
 
     def restore_state(self, state_dict):
-        self._available_energy_kWh.update(
-            convert_str_to_pendulum_in_dict(state_dict["available_energy_kWh"]))
-        self._energy_production_forecast_kWh.update(
-            convert_str_to_pendulum_in_dict(state_dict["energy_production_forecast_kWh"]))
+        self._available_energy_kWh.update_from_time_string_dict(
+            state_dict["available_energy_kWh"])
+        self._energy_production_forecast_kWh.update_from_time_string_dict(
+            state_dict["energy_production_forecast_kWh"])
+
 
+class LoadState(TimeSlotStates):
+    time_slot_attributes = (
+        "_desired_energy_Wh",
+        "_energy_requirement_Wh"
+    )
 
-class LoadState:
     def __init__(self):
         self._desired_energy_Wh = {}
         self._total_energy_demanded_Wh = 0
@@ -151,23 +169,17 @@ class LoadState:
         self._total_energy_demanded_Wh += self._desired_energy_Wh.get(time_slot, 0.)
 
     def delete_past_state_values(self, current_time_slot):
-        to_delete = []
-        for market_slot in self._energy_requirement_Wh.keys():
-            if market_slot < current_time_slot:
-                to_delete.append(market_slot)
-        for market_slot in to_delete:
-            self._energy_requirement_Wh.pop(market_slot, None)
-            self._desired_energy_Wh.pop(market_slot, None)
+        self._energy_requirement_Wh.delete_before(current_time_slot)
+        self._desired_energy_Wh.delete_before(current_time_slot)
 
     def get_state(self):
         return {
-            "desired_energy_Wh": convert_pendulum_to_str_in_dict(self._desired_energy_Wh),
+            "desired_energy_Wh": self._desired_energy_Wh.to_time_string_dict(),
             "total_energy_demanded_Wh": self._total_energy_demanded_Wh
         }
 
     def restore_state(self, state_dict):
-        self._desired_energy_Wh.update(convert_str_to_pendulum_in_dict(
-            state_dict["desired_energy_Wh"]))
+        self._desired_energy_Wh.update_from_time_string_dict(state_dict["desired_energy_Wh"])
         self._total_energy_demanded_Wh = state_dict["total_energy_demanded_Wh"]
 
 
@@ -180,7 +192,20 @@ class ESSEnergyOrigin(Enum):
 EnergyOrigin = namedtuple('EnergyOrigin', ('origin', 'value'))
 
 
-class StorageState:
+class StorageState(TimeSlotStates):
+    time_slot_attributes = (
+        "pledged_sell_kWh",
+        "offered_sell_kWh",
+        "pledged_buy_kWh",
+        "offered_buy_kWh",
+        "charge_history",
+        "charge_history_kWh",
+        "offered_history",
+        "used_history",
+        "energy_to_buy_dict",
+        "energy_to_sell_dict"
+    )
+
     def __init__(self,
                  initial_soc=StorageSettings.MIN_ALLOWED_SOC,
                  initial_energy_origin=ESSEnergyOrigin.EXTERNAL,
@@ -223,39 +248,15 @@ class StorageState:
 
     def get_state(self):
         return {
-            "pledged_sell_kWh": convert_pendulum_to_str_in_dict(self.pledged_sell_kWh),
-            "offered_sell_kWh": convert_pendulum_to_str_in_dict(self.offered_sell_kWh),
-            "pledged_buy_kWh": convert_pendulum_to_str_in_dict(self.pledged_buy_kWh),
-            "offered_buy_kWh": convert_pendulum_to_str_in_dict(self.offered_buy_kWh),
-            "charge_history": convert_pendulum_to_str_in_dict(self.charge_history),
-            "charge_history_kWh": convert_pendulum_to_str_in_dict(self.charge_history_kWh),
-            "offered_history": convert_pendulum_to_str_in_dict(self.offered_history),
-            "used_history": convert_pendulum_to_str_in_dict(self.used_history),
-            "energy_to_buy_dict": convert_pendulum_to_str_in_dict(self.energy_to_buy_dict),
-            "energy_to_sell_dict": convert_pendulum_to_str_in_dict(self.energy_to_sell_dict),
+            **{name: getattr(self, name).to_time_string_dict()
+               for name in self.time_slot_attributes},
             "used_storage": self._used_storage,
             "battery_energy_per_slot": self._battery_energy_per_slot,
         }
 
     def restore_state(self, state_dict):
-        self.pledged_sell_kWh.update(
-            convert_str_to_pendulum_in_dict(state_dict["pledged_sell_kWh"]))
-        self.offered_sell_kWh.update(
-            convert_str_to_pendulum_in_dict(state_dict["offered_sell_kWh"]))
-        self.pledged_buy_kWh.update(
-            convert_str_to_pendulum_in_dict(state_dict["pledged_buy_kWh"]))
-        self.offered_buy_kWh.update(
-            convert_str_to_pendulum_in_dict(state_dict["offered_buy_kWh"]))
-        self.charge_history.update(convert_str_to_pendulum_in_dict(state_dict["charge_history"]))
-        self.charge_history_kWh.update(
-            convert_str_to_pendulum_in_dict(state_dict["charge_history_kWh"]))
-        self.offered_history.update(
-            convert_str_to_pendulum_in_dict(state_dict["offered_history"]))
-        self.used_history.update(convert_str_to_pendulum_in_dict(state_dict["used_history"]))
-        self.energy_to_buy_dict.update(
-            convert_str_to_pendulum_in_dict(state_dict["energy_to_buy_dict"]))
-        self.energy_to_sell_dict.update(convert_str_to_pendulum_in_dict(
-            state_dict["energy_to_sell_dict"]))
+        for name in self.time_slot_attributes:
+            getattr(self, name).update_from_time_string_dict(state_dict[name])
         self._used_storage = state_dict["used_storage"]
         self._battery_energy_per_slot = state_dict["battery_energy_per_slot"]
 
@@ -422,18 +423,5 @@ class StorageState:
                 self.time_series_ess_share[past_time_slot][energy_type.origin] += energy_type.value
 
     def delete_past_state_values(self, current_time_slot):
-        to_delete = []
-        for market_slot in self.pledged_sell_kWh.keys():
-            if market_slot < current_time_slot:
-                to_delete.append(market_slot)
-        for market_slot in to_delete:
-            self.pledged_sell_kWh.pop(market_slot, None)
-            self.offered_sell_kWh.pop(market_slot, None)
-            self.pledged_buy_kWh.pop(market_slot, None)
-            self.offered_buy_kWh.pop(market_slot, None)
-            self.charge_history.pop(market_slot, None)
-            self.charge_history_kWh.pop(market_slot, None)
-            self.offered_history.pop(market_slot, None)
-            self.used_history.pop(market_slot, None)
-            self.energy_to_buy_dict.pop(market_slot, None)
-            self.energy_to_sell_dict.pop(market_slot, None)
+        for name in self.time_slot_attributes:
+            getattr(self, name).delete_before(current_time_slot)
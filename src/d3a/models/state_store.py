@@ -0,0 +1,306 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of D3A.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple  # NOQA
+
+import numpy as np
+import pendulum
+from pendulum import DateTime, Duration  # NOQA
+from d3a_interface.constants_limits import GlobalConfig
+from d3a_interface.utils import format_datetime
+
+INITIAL_STORE_CAPACITY = 8
+
+_MISSING = object()
+# datetime subtraction without creating a pendulum Period
+_subtract_datetimes = datetime.__sub__
+
+
+class TimeSlotIndex:
+    """
+    Maps the market time slots to consecutive integer indices, counted in slot lengths from the
+    start date of the simulation. Time slots that are not aligned to the slot length (or are
+    no datetimes at all) have no index. The time slots and their string representations are
+    cached, therefore they are computed once per simulation instead of once per state and slot.
+    """
+
+    def __init__(self, start_date: DateTime, slot_length: Duration):
+        self.start_date = start_date
+        self.slot_length = timedelta(seconds=slot_length.total_seconds())
+        # DateTime -> slot index (None for time slots without index)
+        self.indices = {}  # type: Dict[DateTime, Optional[int]]
+        self._time_slots = {}  # type: Dict[int, DateTime]
+        self._time_strings = {}  # type: Dict[int, str]
+        self._parsed_time_strings = {}  # type: Dict[str, DateTime]
+
+    def index(self, time_slot) -> Optional[int]:
+        index = self.indices.get(time_slot, _MISSING)
+        if index is _MISSING:
+            try:
+                index, remainder = divmod(_subtract_datetimes(time_slot, self.start_date),
+                                          self.slot_length)
+            except TypeError:
+                index, remainder = None, None
+            if remainder:
+                index = None
+            if index is not None:
+                self._time_slots.setdefault(index, time_slot)
+            self.indices[time_slot] = index
+        return index
+
+    def first_index_not_before(self, time_slot: DateTime) -> int:
+        index, remainder = divmod(_subtract_datetimes(time_slot, self.start_date),
+                                  self.slot_length)
+        return index + 1 if remainder else index
+
+    def time_slot(self, index: int) -> DateTime:
+        return self._time_slots[index]
+
+    def time_string(self, index: int) -> str:
+        time_string = self._time_strings.get(index)
+        if time_string is None:
+            time_string = self._time_strings[index] = format_datetime(self._time_slots[index])
+        return time_string
+
+    def parse(self, time_string: str) -> Tuple[DateTime, Optional[int]]:
+        """Time slot and slot index of a string that was created by time_string"""
+        time_slot = self._parsed_time_strings.get(time_string)
+        if time_slot is None:
+            time_slot = self._parsed_time_strings[time_string] = pendulum.parse(time_string)
+        return time_slot, self.index(time_slot)
+
+
+_time_slot_indices = {}  # type: Dict[Tuple[DateTime, Duration], TimeSlotIndex]
+
+
+def get_time_slot_index(start_date=None, slot_length=None) -> TimeSlotIndex:
+    """
+    Slot index of the simulation with the given start date and slot length, by default of the
+    simulation that is configured in GlobalConfig
+    """
+    if start_date is None:
+        start_date = GlobalConfig.start_date
+    if slot_length is None:
+        slot_length = GlobalConfig.slot_length
+    key = (start_date, slot_length)
+    time_slot_index = _time_slot_indices.get(key)
+    if time_slot_index is None:
+        time_slot_index = _time_slot_indices[key] = TimeSlotIndex(start_date, slot_length)
+    return time_slot_index
+
+
+class TimeSlotStore(MutableMapping):
+    """
+    Mapping of market time slots to the values of a state variable, backed by a NumPy ring
+    buffer that is indexed by the slot index of the time slot. The live time slots span a
+    range of slot indices that grows with new time slots and shrinks when past time slots are
+    evicted, which takes constant time per evicted slot. Time slots without slot index are kept
+    in a plain dict. Like a dict, the store keeps the values as they were set and iterates in
+    insertion order.
+    """
+
+    def __init__(self, values=None, time_slot_index: TimeSlotIndex = None):
+        self._time_slot_index = \
+            get_time_slot_index() if time_slot_index is None else time_slot_index
+        self._indices = self._time_slot_index.indices
+        self._capacity = INITIAL_STORE_CAPACITY
+        self._values = np.empty(self._capacity, dtype=object)
+        self._present = np.zeros(self._capacity, dtype=bool)
+        # Insertion sequence numbers of the values, in order to iterate like a dict
+        self._sequence_numbers = np.zeros(self._capacity, dtype=np.int64)
+        self._next_sequence_number = 0
+        # Slot indices of the live range [_start, _end)
+        self._start = 0
+        self._end = 0
+        self._count = 0
+        self._unindexed = {}
+        self._unindexed_sequence_numbers = {}
+        if values:
+            self.update(values)
+
+    def _index(self, time_slot):
+        index = self._indices.get(time_slot, _MISSING)
+        if index is _MISSING:
+            index = self._time_slot_index.index(time_slot)
+        return index
+
+    def __getitem__(self, time_slot):
+        index = self._index(time_slot)
+        if index is None:
+            return self._unindexed[time_slot]
+        if self._start <= index < self._end:
+            position = index % self._capacity
+            if self._present[position]:
+                return self._values.item(position)
+        raise KeyError(time_slot)
+
+    def get(self, time_slot, default=None):
+        try:
+            return self[time_slot]
+        except KeyError:
+            return default
+
+    def __contains__(self, time_slot):
+        index = self._index(time_slot)
+        if index is None:
+            return time_slot in self._unindexed
+        return self._start <= index < self._end and \
+            bool(self._present[index % self._capacity])
+
+    def __setitem__(self, time_slot, value):
+        index = self._index(time_slot)
+        if index is None:
+            if time_slot not in self._unindexed:
+                self._unindexed_sequence_numbers[time_slot] = self._next_sequence_number
+                self._next_sequence_number += 1
+            self._unindexed[time_slot] = value
+            return
+        if not self._start <= index < self._end:
+            self._extend(index, index + 1)
+        position = index % self._capacity
+        if not self._present[position]:
+            self._present[position] = True
+            self._count += 1
+            self._sequence_numbers[position] = self._next_sequence_number
+            self._next_sequence_number += 1
+        self._values[position] = value
+
+    def __delitem__(self, time_slot):
+        index = self._index(time_slot)
+        if index is None:
+            del self._unindexed[time_slot]
+            del self._unindexed_sequence_numbers[time_slot]
+            return
+        if not self._start <= index < self._end or \
+                not self._present[index % self._capacity]:
+            raise KeyError(time_slot)
+        self._clear(np.array([index % self._capacity]))
+
+    def __iter__(self):
+        time_slot = self._time_slot_index.time_slot
+        for index, unindexed_time_slot in self._ordered_keys():
+            yield unindexed_time_slot if index is None else time_slot(index)
+
+    def __len__(self):
+        return self._count + len(self._unindexed)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({dict(self.items())})"
+
+    def _live_indices(self):
+        """Slot indices of the stored time slots, in insertion order"""
+        indices = np.arange(self._start, self._end)
+        indices = indices[self._present[indices % self._capacity]]
+        sequence_numbers = self._sequence_numbers[indices % self._capacity]
+        if len(indices) > 1 and not np.all(sequence_numbers[1:] > sequence_numbers[:-1]):
+            indices = indices[np.argsort(sequence_numbers, kind="stable")]
+        return indices
+
+    def _ordered_keys(self):
+        """
+        (slot index, None) for the indexed and (None, time slot) for the unindexed time slots,
+        in insertion order
+        """
+        indices = self._live_indices().tolist()
+        if not self._unindexed:
+            return [(index, None) for index in indices]
+        sequence_numbers = self._sequence_numbers[np.array(indices, dtype=np.int64) %
+                                                  self._capacity].tolist()
+        keys = [(sequence_number, index, None)
+                for sequence_number, index in zip(sequence_numbers, indices)]
+        keys.extend((sequence_number, None, time_slot)
+                    for time_slot, sequence_number in self._unindexed_sequence_numbers.items())
+        keys.sort(key=lambda key: key[0])
+        return [(index, time_slot) for _, index, time_slot in keys]
+
+    def _clear(self, positions):
+        self._count -= int(np.count_nonzero(self._present[positions]))
+        self._present[positions] = False
+        # Release the references to the stored objects
+        self._values[positions] = None
+
+    def _extend(self, start, end):
+        """Extend the live range to include the slot indices [start, end)"""
+        if self._count:
+            start, end = min(start, self._start), max(end, self._end)
+        if end - start > self._capacity:
+            capacity = max(2 * self._capacity, end - start)
+            indices = self._live_indices()
+            values = np.empty(capacity, dtype=object)
+            present = np.zeros(capacity, dtype=bool)
+            sequence_numbers = np.zeros(capacity, dtype=np.int64)
+            values[indices % capacity] = self._values[indices % self._capacity]
+            present[indices % capacity] = True
+            sequence_numbers[indices % capacity] = \
+                self._sequence_numbers[indices % self._capacity]
+            self._capacity, self._values, self._present, self._sequence_numbers = \
+                capacity, values, present, sequence_numbers
+        self._start, self._end = start, end
+
+    def delete_before(self, time_slot: DateTime):
+        """Evict all time slots that are before time_slot"""
+        boundary = self._time_slot_index.first_index_not_before(time_slot)
+        if boundary > self._start:
+            stop = min(boundary, self._end)
+            self._clear(np.arange(self._start, stop) % self._capacity)
+            self._start = stop
+        for unindexed_time_slot in [t for t in self._unindexed if t < time_slot]:
+            del self._unindexed[unindexed_time_slot]
+            del self._unindexed_sequence_numbers[unindexed_time_slot]
+
+    def to_time_string_dict(self) -> Dict[str, object]:
+        """
+        Same as convert_pendulum_to_str_in_dict(dict(self)), using the cached time strings of
+        the slot index
+        """
+        time_string = self._time_slot_index.time_string
+        if not self._unindexed:
+            indices = self._live_indices()
+            values = self._values[indices % self._capacity].tolist()
+            return dict(zip(map(time_string, indices.tolist()), values))
+        return {format_datetime(time_slot) if index is None else time_string(index):
+                self._unindexed[time_slot] if index is None else
+                self._values[index % self._capacity]
+                for index, time_slot in self._ordered_keys()}
+
+    def update_from_time_string_dict(self, time_string_dict: Dict[str, object]):
+        """Same as self.update(convert_str_to_pendulum_in_dict(time_string_dict))"""
+        indices = []
+        values = []
+        sequence_numbers = []
+        for time_string, value in time_string_dict.items():
+            time_slot, index = self._time_slot_index.parse(time_string)
+            if index is None:
+                self[time_slot] = value
+            else:
+                indices.append(index)
+                values.append(value)
+                sequence_numbers.append(self._next_sequence_number)
+                self._next_sequence_number += 1
+        if not indices:
+            return
+        self._extend(min(indices), max(indices) + 1)
+        positions = np.array(indices) % self._capacity
+        new = ~self._present[positions]
+        self._count += int(np.count_nonzero(new))
+        self._present[positions] = True
+        self._sequence_numbers[positions[new]] = np.array(sequence_numbers)[new]
+        value_array = np.empty(len(values), dtype=object)
+        value_array[:] = values
+        self._values[positions] = value_array
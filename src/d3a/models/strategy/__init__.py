@@ -18,7 +18,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import json
 import sys
 from logging import getLogger
-from typing import List, Dict, Any, Union  # noqa
+from typing import List, Dict, Any, Set, Union  # noqa
 from uuid import uuid4
 
 from d3a.d3a_core.exceptions import SimulationException, D3AException
@@ -47,10 +47,12 @@ class _TradeLookerUpper:
         self.owner_name = owner_name
 
     def __getitem__(self, market):
-        for trade in market.trades:
-            owner_name = self.owner_name
-            if trade.seller == owner_name or trade.buyer == owner_name:
-                yield trade
+        trades_of = getattr(market, 'trades_of', None)
+        if trades_of is not None:
+            return iter(trades_of(self.owner_name))
+        owner_name = self.owner_name
+        return (trade for trade in market.trades
+                if trade.seller == owner_name or trade.buyer == owner_name)
 
 
 class Offers:
@@ -67,15 +69,48 @@ class Offers:
     def __init__(self, strategy):
         self.strategy = strategy
         self.bought = {}  # type: Dict[Offer, str]
-        self.posted = {}  # type: Dict[Offer, str]
         self.sold = {}  # type: Dict[str, List[Offer]]
         self.split = {}  # type: Dict[str, Offer]
+        self.posted = {}  # type: Dict[Offer, str]
 
     @property
     def area(self):
         # TODO: Remove the owner and area distinction from the AreaBehaviorBase class
         return self.strategy.area if self.strategy.area is not None else self.strategy.owner
 
+    @property
+    def posted(self):
+        return self._posted
+
+    @posted.setter
+    def posted(self, posted):
+        # Per-market indices of the posted and the open (posted, not sold) offers, kept up to
+        # date by post(), remove() and sold_offer()
+        self._posted = posted
+        self._posted_by_market = {}  # type: Dict[str, Dict[Offer, None]]
+        self._open = {}  # type: Dict[Offer, str]
+        self._open_by_market = {}  # type: Dict[str, Dict[Offer, None]]
+        self._sold_ids = {market_id: {offer.id for offer in offers}
+                          for market_id, offers in self.sold.items()}
+        for offer, market_id in posted.items():
+            self._index_posted(offer, market_id)
+
+    def _index_posted(self, offer, market_id):
+        self._posted_by_market.setdefault(market_id, {})[offer] = None
+        sold_ids = self._sold_ids.get(market_id)
+        if not sold_ids or offer.id not in sold_ids:
+            self._open[offer] = market_id
+            self._open_by_market.setdefault(market_id, {})[offer] = None
+
+    def _unindex_posted(self, offer, market_id):
+        for index in (self._posted_by_market, self._open_by_market):
+            market_offers = index.get(market_id)
+            if market_offers is not None:
+                market_offers.pop(offer, None)
+                if not market_offers:
+                    del index[market_id]
+        self._open.pop(offer, None)
+
     def _delete_past_offers(self, existing_offers):
         offers = {}
         for offer, market_id in existing_offers.items():
@@ -91,23 +126,23 @@ class Offers:
 
     @property
     def open(self):
-        open_offers = {}
-        for offer, market_id in self.posted.items():
-            if market_id not in self.sold:
-                self.sold[market_id] = []
-            if offer not in self.sold[market_id]:
-                open_offers[offer] = market_id
-        return open_offers
+        return dict(self._open)
 
     def bought_offer(self, offer, market_id):
         self.bought[offer] = market_id
 
     def sold_offer(self, offer, market_id):
         self.sold = append_or_create_key(self.sold, market_id, offer)
+        self._sold_ids.setdefault(market_id, set()).add(offer.id)
+        open_offers = self._open_by_market.get(market_id, {})
+        for open_offer in [o for o in open_offers if o.id == offer.id]:
+            del open_offers[open_offer]
+            del self._open[open_offer]
+        if not open_offers:
+            self._open_by_market.pop(market_id, None)
 
     def is_offer_posted(self, market_id, offer_id):
-        return offer_id in [offer.id for offer, _market in self.posted.items()
-                            if market_id == _market]
+        return any(offer.id == offer_id for offer in self._posted_by_market.get(market_id, ()))
 
     def get_sold_offer_ids_in_market(self, market_id):
         sold_offer_ids = []
@@ -116,21 +151,16 @@ class Offers:
         return sold_offer_ids
 
     def open_in_market(self, market_id):
-        open_offers = []
-        sold_offer_ids = self.get_sold_offer_ids_in_market(market_id)
-        for offer, _market in self.posted.items():
-            if offer.id not in sold_offer_ids and market_id == _market:
-                open_offers.append(offer)
-        return open_offers
+        return list(self._open_by_market.get(market_id, ()))
 
     def open_offer_energy(self, market_id):
-        return sum(o.energy for o in self.open_in_market(market_id))
+        return sum(o.energy for o in self._open_by_market.get(market_id, ()))
 
     def posted_in_market(self, market_id):
-        return [offer for offer, _market in self.posted.items() if market_id == _market]
+        return list(self._posted_by_market.get(market_id, ()))
 
     def posted_offer_energy(self, market_id):
-        return sum(o.energy for o in self.posted_in_market(market_id))
+        return sum(o.energy for o in self._posted_by_market.get(market_id, ()))
 
     def sold_offer_energy(self, market_id):
         return sum(o.energy for o in self.sold_in_market(market_id))
@@ -150,13 +180,17 @@ class Offers:
     def post(self, offer, market_id):
         # If offer was split already, don't post one with the same uuid again
         if offer.id not in self.split:
+            posted_market_id = self.posted.get(offer)
+            if posted_market_id is not None and posted_market_id != market_id:
+                self._unindex_posted(offer, posted_market_id)
             self.posted[offer] = market_id
+            self._index_posted(offer, market_id)
 
     def remove_offer_from_cache_and_market(self, market, offer_id=None):
         if offer_id is None:
             to_delete_offers = self.open_in_market(market.id)
         else:
-            to_delete_offers = [o for o, m in self.posted.items() if o.id == offer_id]
+            to_delete_offers = [o for o in self.posted_in_market(market.id) if o.id == offer_id]
         deleted_offer_ids = []
         for offer in to_delete_offers:
             market.delete_offer(offer.id)
@@ -166,7 +200,7 @@ class Offers:
 
     def remove_offer_by_id(self, market_id, offer_id=None):
         try:
-            offer = [o for o, m in self.posted.items() if o.id == offer_id][0]
+            offer = [o for o in self.posted_in_market(market_id) if o.id == offer_id][0]
             self.remove(offer)
         except (IndexError, KeyError):
             self.strategy.warning(f"Could not find offer to remove: {offer_id}")
@@ -175,9 +209,11 @@ class Offers:
         try:
             market_id = self.posted.pop(offer)
             assert type(market_id) == str
+            self._unindex_posted(offer, market_id)
             if market_id in self.sold and offer in self.sold[market_id]:
                 self.strategy.log.warning("Offer already sold, cannot remove it.")
                 self.posted[offer] = market_id
+                self._index_posted(offer, market_id)
             else:
                 return True
         except KeyError:
@@ -451,8 +487,10 @@ class BaseStrategy(TriggerMixin, EventMixin, AreaBehaviorBase):
 class BidEnabledStrategy(BaseStrategy):
     def __init__(self):
         super().__init__()
-        self._bids = {}
-        self._traded_bids = {}
+        self._bids = {}  # type: Dict[str, Dict[str, Bid]]
+        self._traded_bids = {}  # type: Dict[str, List[Bid]]
+        # Ids of the bids that were posted per market, not reset on market cycle like _bids
+        self._market_bid_ids = {}  # type: Dict[str, Set[str]]
 
     def post_bid(self, market, price, energy, buyer_origin=None):
         bid = market.bid(
@@ -470,32 +508,31 @@ class BidEnabledStrategy(BaseStrategy):
         return posted_energy <= required_energy_kWh and bid_price >= 0.0
 
     def is_bid_posted(self, market, bid_id):
-        return bid_id in [bid.id for bid in self.get_posted_bids(market)]
+        return bid_id in self._bids.get(market.id, {})
 
     def posted_bid_energy(self, market_id):
         if market_id not in self._bids:
             return 0.0
-        return sum(b.energy for b in self._bids[market_id])
+        return sum(b.energy for b in self._bids[market_id].values())
 
     def remove_bid_from_pending(self, market_id, bid_id=None):
         market = self.area.get_future_market_from_id(market_id)
         if market is None:
             return
+        posted_bids = self._bids.setdefault(market.id, {})
         if bid_id is None:
-            deleted_bid_ids = [bid.id for bid in self.get_posted_bids(market)]
+            deleted_bid_ids = list(posted_bids.keys())
         else:
             deleted_bid_ids = [bid_id]
         for b_id in deleted_bid_ids:
             if b_id in market.bids.keys():
                 market.delete_bid(b_id)
-        self._bids[market.id] = [bid for bid in self.get_posted_bids(market)
-                                 if bid.id not in deleted_bid_ids]
+            posted_bids.pop(b_id, None)
         return deleted_bid_ids
 
     def add_bid_to_posted(self, market_id, bid):
-        if market_id not in self._bids.keys():
-            self._bids[market_id] = []
-        self._bids[market_id].append(bid)
+        self._bids.setdefault(market_id, {})[bid.id] = bid
+        self._market_bid_ids.setdefault(market_id, set()).add(bid.id)
 
     def add_bid_to_bought(self, bid, market_id, remove_bid=True):
         if market_id not in self._traded_bids:
@@ -521,7 +558,11 @@ class BidEnabledStrategy(BaseStrategy):
         # should be only bid from a device to a market at all times, which will be replaced if
         # it needs to be updated. If this check is not there, the market cycle event will post
         # one bid twice, which actually happens on the very first market slot cycle.
-        if not all(bid.buyer != self.owner.name for bid in market.get_bids().values()):
+        market_bids = market.get_bids()
+        market_bid_ids = {bid_id for bid_id in self._market_bid_ids.get(market.id, ())
+                          if bid_id in market_bids}
+        self._market_bid_ids[market.id] = market_bid_ids
+        if market_bid_ids:
             self.owner.log.warning("There is already another bid posted on the market, therefore"
                                    " do not repost another first bid.")
             return None
@@ -535,7 +576,7 @@ class BidEnabledStrategy(BaseStrategy):
     def get_posted_bids(self, market):
         if market.id not in self._bids:
             return []
-        return self._bids[market.id]
+        return list(self._bids[market.id].values())
 
     def event_bid_deleted(self, *, market_id, bid):
         assert ConstSettings.IAASettings.MARKET_TYPE != 1, \
@@ -564,9 +605,12 @@ class BidEnabledStrategy(BaseStrategy):
         if not constants.D3A_TEST_RUN:
             self._bids = {}
             self._traded_bids = {}
+            self._market_bid_ids = {
+                market_id: bid_ids for market_id, bid_ids in self._market_bid_ids.items()
+                if self.area.get_future_market_from_id(market_id) is not None}
             super().event_market_cycle()
 
     def assert_if_trade_bid_price_is_too_high(self, market, trade):
         if isinstance(trade.offer, Bid) and trade.offer.buyer == self.owner.name:
-            bid = [b for b in self.get_posted_bids(market) if b.id == trade.offer.id][0]
+            bid = self._bids[market.id][trade.offer.id]
             assert trade.offer.energy_rate <= bid.energy_rate + FLOATING_POINT_TOLERANCE
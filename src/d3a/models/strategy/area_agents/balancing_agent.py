@@ -15,7 +15,6 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
-from numpy.random import random
 from d3a.constants import FLOATING_POINT_TOLERANCE
 from d3a.d3a_core.util import make_ba_name, make_iaa_name
 from d3a.models.strategy.area_agents.one_sided_agent import OneSidedAgent
@@ -109,12 +108,12 @@ class BalancingAgent(OneSidedAgent):
         return trade
 
     def event_balancing_trade(self, *, market_id, trade, offer=None):
-        for engine in sorted(self.engines, key=lambda _: random()):
+        for engine in self.engines_in_dispatch_order:
             engine.event_trade(trade=trade)
 
     def event_balancing_offer_split(self, *, market_id, original_offer, accepted_offer,
                                     residual_offer):
-        for engine in sorted(self.engines, key=lambda _: random()):
+        for engine in self.engines_in_dispatch_order:
             engine.event_offer_split(market_id=market_id,
                                      original_offer=original_offer,
                                      accepted_offer=accepted_offer,
@@ -15,9 +15,9 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
-from numpy.random import random
 from d3a.models.strategy import BaseStrategy, _TradeLookerUpper
 from d3a.constants import TIME_FORMAT
+from d3a.d3a_core.dispatch_order import DispatchOrder
 from d3a_interface.constants_limits import ConstSettings
 
 
@@ -32,6 +32,7 @@ class InterAreaAgent(BaseStrategy):
         super().__init__()
         self.owner = owner
         self._validate_constructor_arguments(min_offer_age)
+        self._dispatch_order = DispatchOrder()
 
         self.time_slot = higher_market.time_slot.format(TIME_FORMAT)
 
@@ -47,9 +48,14 @@ class InterAreaAgent(BaseStrategy):
     def area_reconfigure_event(self, min_offer_age):
         self._validate_constructor_arguments(min_offer_age)
         self.min_offer_age = min_offer_age
-        for engine in sorted(self.engines, key=lambda _: random()):
+        for engine in self.engines_in_dispatch_order:
             engine.min_offer_age = min_offer_age
 
+    @property
+    def engines_in_dispatch_order(self):
+        """Engines in random order, in order to not favour any trading direction"""
+        return self._dispatch_order.shuffled("engines", self.engines, self.owner.current_tick)
+
     @property
     def trades(self):
         return _TradeLookerUpper(self.name)
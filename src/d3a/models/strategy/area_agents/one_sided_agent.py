@@ -19,7 +19,6 @@ from d3a.models.strategy.area_agents.inter_area_agent import InterAreaAgent
 from d3a.models.strategy.area_agents.one_sided_engine import IAAEngine
 from d3a.d3a_core.util import make_iaa_name
 from d3a_interface.constants_limits import ConstSettings
-from numpy.random import random
 
 
 class OneSidedAgent(InterAreaAgent):
@@ -55,19 +54,23 @@ class OneSidedAgent(InterAreaAgent):
 
     def event_tick(self):
         area = self.owner
-        for engine in sorted(self.engines, key=lambda _: random()):
+        for engine in self.engines_in_dispatch_order:
             engine.tick(area=area)
 
     def event_trade(self, *, market_id, trade):
-        for engine in sorted(self.engines, key=lambda _: random()):
+        for engine in self.engines_in_dispatch_order:
             engine.event_trade(trade=trade)
 
     def event_offer_deleted(self, *, market_id, offer):
-        for engine in sorted(self.engines, key=lambda _: random()):
+        for engine in self.engines_in_dispatch_order:
             engine.event_offer_deleted(offer=offer)
 
+    def event_offer_updated(self, *, market_id, existing_offer, new_offer):
+        for engine in self.engines_in_dispatch_order:
+            engine.event_offer_updated(existing_offer=existing_offer, new_offer=new_offer)
+
     def event_offer_split(self, *, market_id,  original_offer, accepted_offer, residual_offer):
-        for engine in sorted(self.engines, key=lambda _: random()):
+        for engine in self.engines_in_dispatch_order:
             engine.event_offer_split(market_id=market_id,
                                      original_offer=original_offer,
                                      accepted_offer=accepted_offer,
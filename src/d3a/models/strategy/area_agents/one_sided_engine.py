@@ -29,6 +29,49 @@ Markets = namedtuple('Markets', ('source', 'target'))
 ResidualInfo = namedtuple('ResidualInfo', ('forwarded', 'age'))
 
 
+class PendingOrders:
+    """
+    Ages of the offers or bids of a source market that were not forwarded yet, ordered by age.
+    Orders that were added to the source market are discovered from the insertion log of its
+    order book, in order to not scan all orders of the source market on every tick.
+    """
+
+    def __init__(self):
+        self._ages = {}  # type: Dict[str, int]
+        self._order_book = None
+        self._position = 0
+
+    def __iter__(self):
+        return iter(self._ages)
+
+    def __len__(self):
+        return len(self._ages)
+
+    def added_ids(self, orders):
+        """Ids that were added to orders since the last call, ordered by their last insertion"""
+        if not hasattr(orders, "keys_added_since"):
+            return list(orders.keys())
+        if orders is not self._order_book:
+            self._order_book = orders
+            self._position = 0
+        self._position, added_ids = orders.keys_added_since(self._position)
+        return list(reversed(dict.fromkeys(reversed(added_ids))))
+
+    def add(self, order_id, age):
+        ages = self._ages
+        restore_order = bool(ages) and age < next(reversed(ages.values()))
+        ages[order_id] = age
+        if restore_order:
+            self._ages = dict(sorted(ages.items(), key=lambda item: item[1]))
+
+    def discard(self, order_id):
+        self._ages.pop(order_id, None)
+
+    def items(self):
+        """Snapshot of (id, age) pairs, oldest first"""
+        return list(self._ages.items())
+
+
 class IAAEngine:
     def __init__(self, name: str, market_1, market_2, min_offer_age: int,
                  owner):
@@ -42,18 +85,20 @@ class IAAEngine:
         self.forwarded_offers = {}  # type: Dict[str, OfferInfo]
         self.trade_residual = {}  # type Dict[str, Offer]
         self.ignored_offers = set()  # type: Set[str]
+        self._pending_offers = PendingOrders()
 
     def __repr__(self):
         return "<IAAEngine [{s.owner.name}] {s.name} {s.markets.source.time_slot:%H:%M}>".format(
             s=self
         )
 
-    def _offer_in_market(self, offer):
-        updated_price = self.markets.target.fee_class.update_forwarded_offer_with_fee(
+    def _forwarded_offer_price(self, offer):
+        return self.markets.target.fee_class.update_forwarded_offer_with_fee(
             offer.energy_rate, offer.original_offer_price / offer.energy) * offer.energy
 
+    def _offer_in_market(self, offer):
         kwargs = {
-            "price": updated_price,
+            "price": self._forwarded_offer_price(offer),
             "energy": offer.energy,
             "seller": self.owner.name,
             "original_offer_price": offer.original_offer_price,
@@ -96,18 +141,27 @@ class IAAEngine:
     def tick(self, *, area):
         self.propagate_offer(area.current_tick)
 
-    def propagate_offer(self, current_tick):
-        # Store age of offer
-        for offer in self.markets.source.offers.values():
-            if offer.id not in self.offer_age:
-                self.offer_age[offer.id] = current_tick
+    def _untrack_offer(self, offer_id):
+        self.offer_age.pop(offer_id, None)
+        self._pending_offers.discard(offer_id)
 
-        # Use `list()` to avoid in place modification errors
-        for offer_id, age in list(self.offer_age.items()):
+    def propagate_offer(self, current_tick):
+        # Store age of the offers that were posted since the last call
+        source_offers = self.markets.source.offers
+        for offer_id in self._pending_offers.added_ids(source_offers):
+            if offer_id in source_offers and offer_id not in self.offer_age and \
+                    offer_id not in self.ignored_offers:
+                self.offer_age[offer_id] = current_tick
+                self._pending_offers.add(offer_id, current_tick)
+
+        # Only the offers that were not forwarded yet are visited, oldest first, until the
+        # first offer that is too young to be forwarded.
+        for offer_id, age in self._pending_offers.items():
             if offer_id in self.forwarded_offers:
+                self._pending_offers.discard(offer_id)
                 continue
             if current_tick - age < self.min_offer_age:
-                continue
+                break
             offer = self.markets.source.offers.get(offer_id)
             if not offer:
                 # Offer has gone - remove from age dict
@@ -115,22 +169,25 @@ class IAAEngine:
                 # be modified, thus causing a removal from the offer_age dict. In such a case, even
                 # if the offer is no longer in the offer_age dict, the execution should continue
                 # normally.
-                self.offer_age.pop(offer_id, None)
+                self._untrack_offer(offer_id)
                 continue
             if not self.owner.usable_offer(offer):
                 # Forbidden offer (i.e. our counterpart's)
-                self.offer_age.pop(offer_id, None)
+                self._untrack_offer(offer_id)
+                self.ignored_offers.add(offer_id)
                 continue
 
             # Should never reach this point.
             # This means that the IAA is forwarding offers with the same seller and buyer name.
             # If we ever again reach a situation like this, we should never forward the offer.
             if self.owner.name == offer.seller:
-                self.offer_age.pop(offer_id, None)
+                self._untrack_offer(offer_id)
+                self.ignored_offers.add(offer_id)
                 continue
 
             forwarded_offer = self._forward_offer(offer)
             if forwarded_offer:
+                self._pending_offers.discard(offer_id)
                 self.owner.log.debug(f"Forwarded offer to {self.markets.source.name} "
                                      f"{self.owner.name}, {self.name} {forwarded_offer}")
 
@@ -175,7 +232,7 @@ class IAAEngine:
                 f"[{self.markets.source.time_slot_str}] Offer accepted {trade_source}")
 
             self._delete_forwarded_offer_entries(offer_info.source_offer)
-            self.offer_age.pop(offer_info.source_offer.id, None)
+            self._untrack_offer(offer_info.source_offer.id)
 
         elif trade.offer.id == offer_info.source_offer.id:
             # Offer was bought in source market by another party
@@ -187,7 +244,7 @@ class IAAEngine:
                 self.owner.log.error("Error deleting InterAreaAgent offer: {}".format(ex))
 
             self._delete_forwarded_offer_entries(offer_info.source_offer)
-            self.offer_age.pop(offer_info.source_offer.id, None)
+            self._untrack_offer(offer_info.source_offer.id)
         else:
             raise RuntimeError("Unknown state. Can't happen")
 
@@ -197,7 +254,7 @@ class IAAEngine:
     def event_offer_deleted(self, *, offer):
         if offer.id in self.offer_age:
             # Offer we're watching in source market was deleted - remove
-            del self.offer_age[offer.id]
+            self._untrack_offer(offer.id)
 
         offer_info = self.forwarded_offers.get(offer.id)
         if not offer_info:
@@ -215,6 +272,40 @@ class IAAEngine:
         # TODO: Should potentially handle the flip side, by not deleting the source market offer
         # but by deleting the offered_offers entries
 
+    def event_offer_updated(self, *, existing_offer, new_offer):
+        offer_info = self.forwarded_offers.get(new_offer.id)
+        if not offer_info or offer_info.source_offer.id != new_offer.id:
+            # Only updates of offers in the source market are propagated
+            return
+
+        target_offer = offer_info.target_offer
+        if not ConstSettings.GeneralSettings.EVENT_DISPATCHING_VIA_REDIS:
+            try:
+                forwarded_offer = self.markets.target.update_offer(
+                    target_offer.id, price=self._forwarded_offer_price(new_offer),
+                    original_offer_price=new_offer.original_offer_price,
+                    dispatch_event=False)
+            except MarketException:
+                self.owner.log.debug("Forwarded offer could not be updated, it will be "
+                                     "forwarded again.")
+            else:
+                self._add_to_forward_offers(new_offer, forwarded_offer)
+                self.owner.log.trace(f"Updating forwarded offer {target_offer} to "
+                                     f"{forwarded_offer}")
+                self.markets.target.dispatch_market_offer_updated_event(target_offer,
+                                                                        forwarded_offer)
+                return
+
+        # Fall back to deleting the forwarded offer, the updated offer is forwarded again
+        # on the next tick
+        try:
+            self.owner.delete_offer(self.markets.target, target_offer)
+        except MarketException:
+            self.owner.log.exception("Error deleting InterAreaAgent offer")
+        self._delete_forwarded_offer_entries(offer_info.source_offer)
+        if new_offer.id in self.offer_age:
+            self._pending_offers.add(new_offer.id, self.offer_age[new_offer.id])
+
     def event_offer_split(self, *, market_id, original_offer, accepted_offer, residual_offer):
         market = self.owner._get_market_from_market_id(market_id)
         if market is None:
@@ -258,6 +349,7 @@ class IAAEngine:
             return
 
         if original_offer.id in self.offer_age:
+            self._pending_offers.discard(original_offer.id)
             self.offer_age[residual_offer.id] = self.offer_age.pop(original_offer.id)
 
         self.owner.log.debug(f"Offer {short_offer_bid_log_str(local_offer)} was split into "
@@ -18,11 +18,12 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 from collections import namedtuple
 from typing import Dict  # NOQA
 from d3a.models.strategy.area_agents.inter_area_agent import InterAreaAgent  # NOQA
-from d3a.models.strategy.area_agents.one_sided_engine import IAAEngine
+from d3a.models.strategy.area_agents.one_sided_engine import IAAEngine, PendingOrders
 from d3a.d3a_core.exceptions import BidNotFound, MarketException
 from d3a.models.market.market_structures import Bid
 from d3a.d3a_core.util import short_offer_bid_log_str
 from d3a.constants import FLOATING_POINT_TOLERANCE
+from d3a_interface.constants_limits import ConstSettings
 
 
 BidInfo = namedtuple('BidInfo', ('source_bid', 'target_bid'))
@@ -36,11 +37,18 @@ class TwoSidedPayAsBidEngine(IAAEngine):
         self.bid_trade_residual = {}  # type: Dict[str, Bid]
         self.min_bid_age = min_bid_age
         self.bid_age = {}
+        self._pending_bids = PendingOrders()
+        # Ids of bids that stopped being tracked while they might still be in the source market
+        self._released_bids = []
 
     def __repr__(self):
         return "<TwoSidedPayAsBidEngine [{s.owner.name}] {s.name} " \
                "{s.markets.source.time_slot:%H:%M}>".format(s=self)
 
+    def _forwarded_bid_price(self, bid):
+        return self.markets.source.fee_class.update_forwarded_bid_with_fee(
+            bid.price / bid.energy, bid.original_bid_price / bid.energy) * bid.energy
+
     def _forward_bid(self, bid):
         if bid.buyer == self.markets.target.name:
             return
@@ -52,8 +60,7 @@ class TwoSidedPayAsBidEngine(IAAEngine):
             return
         try:
             forwarded_bid = self.markets.target.bid(
-                price=(self.markets.source.fee_class.update_forwarded_bid_with_fee(
-                    bid.price / bid.energy, bid.original_bid_price / bid.energy)) * bid.energy,
+                price=self._forwarded_bid_price(bid),
                 energy=bid.energy,
                 buyer=self.owner.name,
                 original_bid_price=bid.original_bid_price,
@@ -91,15 +98,37 @@ class TwoSidedPayAsBidEngine(IAAEngine):
 
         return True
 
+    def _untrack_bid(self, bid_id):
+        self.bid_age.pop(bid_id, None)
+        self._pending_bids.discard(bid_id)
+        self._released_bids.append(bid_id)
+
     def tick(self, *, area):
         super().tick(area=area)
 
-        for bid_id, bid in self.markets.source.get_bids().items():
-            if bid.id not in self.bid_age:
-                self.bid_age[bid.id] = area.current_tick
-
-            if self.should_forward_bid(bid, area.current_tick):
-                self._forward_bid(bid)
+        source_bids = self.markets.source.get_bids()
+        new_bid_ids = self._released_bids + self._pending_bids.added_ids(source_bids)
+        self._released_bids = []
+        for bid_id in new_bid_ids:
+            if bid_id in source_bids and bid_id not in self.bid_age:
+                self.bid_age[bid_id] = area.current_tick
+                self._pending_bids.add(bid_id, area.current_tick)
+
+        # Same as for the offers, only the bids that were not forwarded yet are visited, until
+        # the first bid that is too young to be forwarded
+        for bid_id, age in self._pending_bids.items():
+            if area.current_tick - age < self.min_bid_age:
+                break
+            bid = source_bids.get(bid_id)
+            if bid is None or bid.id in self.forwarded_bids:
+                self._pending_bids.discard(bid_id)
+                continue
+            if not self.should_forward_bid(bid, area.current_tick):
+                # Bid of our counterpart or of the owner, never forwarded
+                self._pending_bids.discard(bid_id)
+                continue
+            if self._forward_bid(bid):
+                self._pending_bids.discard(bid_id)
 
     def delete_forwarded_bids(self, bid_info):
         try:
@@ -151,12 +180,12 @@ class TwoSidedPayAsBidEngine(IAAEngine):
                 seller_origin=bid_trade.seller_origin
             )
             self.delete_forwarded_bids(bid_info)
-            self.bid_age.pop(bid_info.source_bid.id, None)
+            self._untrack_bid(bid_info.source_bid.id)
 
         elif bid_trade.offer.id == bid_info.source_bid.id:
             # Bid was traded in the source market by someone else
             self.delete_forwarded_bids(bid_info)
-            self.bid_age.pop(bid_info.source_bid.id, None)
+            self._untrack_bid(bid_info.source_bid.id)
         else:
             raise Exception(f"Invalid bid state for IAA {self.owner.name}: "
                             f"traded bid {bid_trade} was not in offered bids tuple {bid_info}")
@@ -177,7 +206,35 @@ class TwoSidedPayAsBidEngine(IAAEngine):
             except MarketException:
                 self.owner.log.exception("Error deleting InterAreaAgent bid")
         self._delete_forwarded_bid_entries(bid_info.source_bid)
-        self.bid_age.pop(bid_info.source_bid.id, None)
+        self._untrack_bid(bid_info.source_bid.id)
+
+    def event_bid_updated(self, *, existing_bid, new_bid):
+        bid_info = self.forwarded_bids.get(new_bid.id)
+        if not bid_info or bid_info.source_bid.id != new_bid.id:
+            # Only updates of bids in the source market are propagated
+            return
+
+        target_bid = bid_info.target_bid
+        if not ConstSettings.GeneralSettings.EVENT_DISPATCHING_VIA_REDIS:
+            try:
+                forwarded_bid = self.markets.target.update_bid(
+                    target_bid.id, price=self._forwarded_bid_price(new_bid),
+                    original_bid_price=new_bid.original_bid_price, dispatch_event=False)
+            except MarketException:
+                self.owner.log.debug("Forwarded bid could not be updated, it will be "
+                                     "forwarded again.")
+            else:
+                self._add_to_forward_bids(new_bid, forwarded_bid)
+                self.owner.log.trace(f"Updating forwarded bid {target_bid} to {forwarded_bid}")
+                self.markets.target.dispatch_market_bid_updated_event(target_bid,
+                                                                      forwarded_bid)
+                return
+
+        # Fall back to deleting the forwarded bid, the updated bid is forwarded again
+        # on the next tick
+        self.delete_forwarded_bids(bid_info)
+        if new_bid.id in self.bid_age:
+            self._pending_bids.add(new_bid.id, self.bid_age[new_bid.id])
 
     def event_bid_split(self, *, market_id, original_bid, accepted_bid, residual_bid):
         market = self.owner._get_market_from_market_id(market_id)
@@ -21,7 +21,8 @@ from pendulum import duration
 from d3a.d3a_core.exceptions import MarketException
 from d3a_interface.constants_limits import ConstSettings, GlobalConfig
 from d3a.models.read_user_profile import read_arbitrary_profile, InputProfileTypes
-from d3a.d3a_core.util import write_default_to_dict, find_object_of_same_weekday_and_time
+from d3a.d3a_core.util import write_default_to_dict, find_object_of_same_weekday_and_time, \
+    ProfileDict
 
 
 class UpdateFrequencyMixin:
@@ -47,6 +48,8 @@ class UpdateFrequencyMixin:
         self.update_counter = {}
         self.number_of_available_updates = 0
         self.rate_limit_object = rate_limit_object
+        # Profile buffers that were copied by this mixin and can be modified in place
+        self._own_profile_buffers = {}
 
     def delete_past_state_values(self, current_market_time_slot):
         to_delete = []
@@ -79,14 +82,14 @@ class UpdateFrequencyMixin:
                                  fit_to_limit=None, energy_rate_change_per_update=None,
                                  update_interval=None):
         if initial_rate is not None:
-            self.initial_rate_profile_buffer[time_slot] = initial_rate
+            self._own_profile_buffer("initial_rate_profile_buffer")[time_slot] = initial_rate
         if final_rate is not None:
-            self.final_rate_profile_buffer[time_slot] = final_rate
+            self._own_profile_buffer("final_rate_profile_buffer")[time_slot] = final_rate
         if fit_to_limit is not None:
             self.fit_to_limit = fit_to_limit
         if energy_rate_change_per_update is not None:
-            self.energy_rate_change_per_update_profile_buffer[time_slot] = \
-                energy_rate_change_per_update
+            self._own_profile_buffer("energy_rate_change_per_update_profile_buffer")[
+                time_slot] = energy_rate_change_per_update
         if update_interval is not None:
             self.update_interval = update_interval
 
@@ -94,6 +97,19 @@ class UpdateFrequencyMixin:
             self._calculate_number_of_available_updates_per_slot
         self._set_or_update_energy_rate_change_per_update(time_slot)
 
+    def _own_profile_buffer(self, name):
+        """
+        Profile buffer that can be modified by this mixin. The profile buffers are shared with
+        other strategies (see read_arbitrary_profile), therefore a buffer is copied once, when
+        this mixin modifies it for the first time.
+        """
+        profile = getattr(self, name)
+        if profile is not self._own_profile_buffers.get(name):
+            profile = profile.copy() if isinstance(profile, ProfileDict) else ProfileDict(profile)
+            setattr(self, name, profile)
+            self._own_profile_buffers[name] = profile
+        return profile
+
     def _set_or_update_energy_rate_change_per_update(self, time_slot):
         energy_rate_change_per_update = {}
         if self.fit_to_limit:
@@ -157,22 +173,22 @@ class UpdateFrequencyMixin:
                self.update_interval.seconds * self.update_counter[time_slot]
 
     def update_energy_price(self, market, strategy):
-        if market.id not in strategy.offers.open.values():
+        if market is None:
+            return
+        open_offers = strategy.offers.open_in_market(market.id)
+        if not open_offers:
+            return
+        iterated_market = strategy.area.get_future_market_from_id(market.id)
+        if iterated_market is None:
             return
 
-        for offer, iterated_market_id in strategy.offers.open.items():
-            iterated_market = strategy.area.get_future_market_from_id(iterated_market_id)
-            if market is None or iterated_market is None or iterated_market.id != market.id:
-                continue
+        for offer in open_offers:
             try:
-                iterated_market.delete_offer(offer.id)
                 updated_price = round(offer.energy * self.get_updated_rate(market.time_slot), 10)
-                new_offer = iterated_market.offer(
+                new_offer = iterated_market.update_offer(
+                    offer.id,
                     updated_price,
-                    offer.energy,
-                    strategy.owner.name,
-                    original_offer_price=updated_price,
-                    seller_origin=offer.seller_origin
+                    original_offer_price=updated_price
                 )
                 strategy.offers.replace(offer, new_offer, iterated_market.id)
             except MarketException:
@@ -200,11 +216,10 @@ class UpdateFrequencyMixin:
             assert bid.buyer == strategy.owner.name
             if bid.id in market.bids.keys():
                 bid = market.bids[bid.id]
-            market.delete_bid(bid.id)
-
-            strategy.remove_bid_from_pending(market.id, bid.id)
-            strategy.post_bid(market, bid.energy * self.get_updated_rate(market.time_slot),
-                              bid.energy, buyer_origin=bid.buyer_origin)
+            updated_price = bid.energy * self.get_updated_rate(market.time_slot)
+            updated_bid = market.update_bid(bid.id, updated_price,
+                                            original_bid_price=updated_price)
+            strategy.add_bid_to_posted(market.id, updated_bid)
 
     def update_posted_bids_over_ticks(self, market, strategy):
         if self.time_for_price_update(strategy, market.time_slot):
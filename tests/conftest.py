@@ -17,6 +17,8 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import pytest
 
+from d3a.models.read_user_profile import profile_cache
+
 
 class Called:
     def __init__(self):
@@ -34,3 +36,11 @@ class Called:
 @pytest.yield_fixture
 def called():
     yield Called()
+
+
+@pytest.fixture(autouse=True)
+def clear_profile_cache():
+    """Profiles that were modified by a test must not be shared with other tests"""
+    profile_cache.clear()
+    yield
+    profile_cache.clear()
@@ -163,9 +163,9 @@ class TestAreaClass(unittest.TestCase):
         markets[m3.time_slot] = m3
         self.area._markets = MagicMock(spec=AreaMarkets)
         self.area._markets.markets = markets
-        m1.sorted_offers = [o1, o1]
-        m2.sorted_offers = [o2, o2]
-        m3.sorted_offers = [o3, o3]
+        m1.cheapest_offer = o1
+        m2.cheapest_offer = o2
+        m3.cheapest_offer = o3
         assert self.area.market_with_most_expensive_offer is m1
         o1.energy_rate = 19
         o2.energy_rate = 20
@@ -220,6 +220,42 @@ class TestAreaClass(unittest.TestCase):
         bat.get_state()
         strategy.get_state.assert_called_once()
 
+    def test_update_area_current_tick_advances_the_clock_of_areas_and_spot_markets(self):
+        house = Area(name="House", children=[Area(name="H1 General Load")])
+        grid = Area(name="Grid", children=[house], config=self.config)
+        self.config.market_count = 2
+        grid.activate()
+        for _ in range(3):
+            grid.update_area_current_tick()
+
+        assert house.clock is grid.clock
+        assert house.children[0].current_tick == grid.current_tick == 3
+        assert house.children[0].now == self.config.start_date.add(seconds=45)
+        assert len(house.all_markets) == 2
+        for market in house.all_markets:
+            assert market.current_tick_in_slot == 3
+            assert market.now == market.time_slot.add(seconds=45)
+            assert market.follows_area_clock
+        # balancing markets keep the time of their slot
+        for market in house.balancing_markets:
+            assert market.now == market.time_slot
+            assert not market.follows_area_clock
+
+        # past markets keep the tick at which they were moved to the past markets
+        house._markets.rotate_markets(self.config.start_date.add(days=1), house.dispatcher)
+        assert house.past_markets
+        grid.update_area_current_tick()
+        for market in house.past_markets:
+            assert market.current_tick_in_slot == 3
+            assert market.now == market.time_slot.add(seconds=45)
+            assert not market.follows_area_clock
+
+        grid.current_tick = self.config.ticks_per_slot + 2
+        assert house.current_slot == 1
+        assert house.current_tick_in_slot == 2
+        assert house.now == self.config.start_date.add(
+            seconds=self.config.tick_length.seconds * (self.config.ticks_per_slot + 2))
+
 
 class TestEventDispatcher(unittest.TestCase):
 
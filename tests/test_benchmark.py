@@ -0,0 +1,96 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of D3A.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import pytest
+
+from d3a.benchmark.grid_generator import GridParameters, generate_grid, count_areas, \
+    create_simulation_config
+from d3a.benchmark.memory import MARKET_STRUCTURES, measure_market_structures, \
+    format_memory_results
+from d3a.benchmark.micro import MICRO_BENCHMARKS
+from d3a.benchmark.results import compare_results, has_regressions, run_benchmarks
+from d3a.benchmark.suite import build_micro_benchmarks
+from d3a_interface.exceptions import D3AException
+from numpy.random import RandomState
+
+
+def _houses(area):
+    if area.name.startswith("House"):
+        return [area]
+    return [house for child in area.children for house in _houses(child)]
+
+
+def _depth(area):
+    return 1 + max((_depth(child) for child in area.children), default=0)
+
+
+@pytest.mark.parametrize("houses, depth, devices_per_house", [
+    (1, 1, 1), (5, 1, 3), (8, 3, 2), (7, 4, 4)
+])
+def test_generate_grid_creates_the_requested_topology(houses, depth, devices_per_house):
+    parameters = GridParameters(houses=houses, depth=depth, devices_per_house=devices_per_house)
+    grid = generate_grid(parameters, create_simulation_config(parameters))
+    house_areas = _houses(grid)
+    assert len(house_areas) == houses
+    assert all(len(house.children) == devices_per_house for house in house_areas)
+    # grid, intermediate levels, houses and devices
+    assert _depth(grid) == depth + 2
+    assert count_areas(grid) >= 2 + houses * (devices_per_house + 1)
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"houses": 0}, {"market_type": 4}, {"ticks_per_slot": 7}
+])
+def test_grid_parameters_are_validated(kwargs):
+    with pytest.raises(D3AException):
+        GridParameters(**kwargs)
+
+
+@pytest.mark.parametrize("name", MICRO_BENCHMARKS.keys())
+def test_micro_benchmarks_run(name):
+    MICRO_BENCHMARKS[name](10, RandomState(0))()
+
+
+def test_run_benchmarks_reports_statistics_for_every_benchmark():
+    results = run_benchmarks(build_micro_benchmarks([10]), repeat=2)
+    assert len(results["benchmarks"]) == len(MICRO_BENCHMARKS)
+    for result in results["benchmarks"].values():
+        assert result["kind"] == "micro"
+        assert len(result["samples_s"]) == 2
+        assert result["min_s"] <= result["median_s"] <= result["max_s"]
+
+
+def test_compare_results_flags_regressions():
+    def _results(**medians):
+        return {"benchmarks": {name: {"median_s": median} for name, median in medians.items()}}
+
+    comparison = compare_results(_results(a=1.0, b=1.0, c=1.0, d=1.0),
+                                 _results(a=1.05, b=1.5, c=0.5, e=1.0), threshold=0.1)
+    assert {row["name"]: row["status"] for row in comparison} == {
+        "a": "unchanged", "b": "regression", "c": "improvement", "d": "removed", "e": "added"}
+    assert has_regressions(comparison)
+    assert not has_regressions(compare_results(_results(a=1.0), _results(a=0.95)))
+
+
+def test_memory_benchmark_reports_footprint_of_every_market_structure():
+    results = measure_market_structures(count=100)
+    assert results["structures"].keys() == MARKET_STRUCTURES.keys()
+    assert all(0 < result["bytes_per_object"] < 1000
+               for result in results["structures"].values())
+    table = format_memory_results(results, baseline=results)
+    assert len(table.splitlines()) == len(MARKET_STRUCTURES) + 1
+    assert "1.000" in table
@@ -0,0 +1,79 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of D3A.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from collections import Counter
+
+from numpy import random
+
+from d3a.d3a_core.dispatch_order import DispatchOrder
+
+
+def test_dispatch_order_is_reused_within_a_tick():
+    dispatch_order = DispatchOrder()
+    receivers = list(range(10))
+    order = dispatch_order.shuffled("children", receivers, 1)
+    assert sorted(order) == receivers
+    assert dispatch_order.shuffled("children", receivers, 1) == order
+    assert dispatch_order.shuffled("children", iter(receivers), 1) == order
+
+
+def test_dispatch_order_is_redrawn_for_every_tick_and_group():
+    random.seed(0)
+    dispatch_order = DispatchOrder()
+    receivers = list(range(10))
+    orders = {tuple(dispatch_order.shuffled("children", receivers, tick))
+              for tick in range(20)}
+    assert len(orders) > 1
+    group_orders = {tuple(dispatch_order.shuffled(("iaa", group), receivers, 20))
+                    for group in range(20)}
+    assert len(group_orders) > 1
+
+
+def test_dispatch_order_is_redrawn_for_every_call_without_tick():
+    random.seed(0)
+    dispatch_order = DispatchOrder()
+    receivers = list(range(10))
+    order = dispatch_order.shuffled("listeners", receivers, 1)
+    orders = {tuple(dispatch_order.shuffled("listeners", receivers, None))
+              for _ in range(20)}
+    assert len(orders) > 1
+    assert all(sorted(order) == receivers for order in orders)
+    assert dispatch_order.shuffled("listeners", receivers, 1) == order
+
+
+def test_dispatch_order_is_reproducible_for_the_same_seed():
+    def _orders():
+        random.seed(42)
+        dispatch_order = DispatchOrder()
+        return [dispatch_order.shuffled("children", "abcdef", tick) for tick in range(10)]
+    assert _orders() == _orders()
+
+
+def test_dispatch_order_does_not_draw_for_single_receivers():
+    random.seed(1)
+    state = random.get_state()[1].copy()
+    assert DispatchOrder().shuffled("listeners", ["listener"], 0) == ["listener"]
+    assert DispatchOrder().shuffled("listeners", [], 0) == []
+    assert (random.get_state()[1] == state).all()
+
+
+def test_dispatch_order_is_fair():
+    random.seed(3)
+    dispatch_order = DispatchOrder()
+    first_receivers = Counter(dispatch_order.shuffled("children", "abc", tick)[0]
+                              for tick in range(3000))
+    assert all(800 < count < 1200 for count in first_receivers.values())
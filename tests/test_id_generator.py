@@ -0,0 +1,62 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of D3A.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import uuid
+
+from pendulum import now
+
+from d3a.d3a_core.id_generator import MonotonicIdGenerator
+from d3a.models.market.market_structures import Offer, copy_offer
+from d3a.models.market.one_sided import OneSidedMarket
+
+
+def test_monotonic_id_generator_creates_unique_uuid_formatted_ids():
+    generator = MonotonicIdGenerator()
+    ids = [generator.next_id() for _ in range(1000)]
+    assert len(set(ids)) == 1000
+    assert all(str(uuid.UUID(generated_id)) == generated_id for generated_id in ids)
+    # The start of the id differs, in order to keep truncated ids in the logs distinguishable
+    assert len({generated_id[:6] for generated_id in ids}) == 1000
+
+
+def test_monotonic_id_generator_renews_suffix_on_counter_overflow():
+    generator = MonotonicIdGenerator()
+    first_id = generator.next_id()
+    generator._counter = iter([0xffffffff + 1])
+    second_id = generator.next_id()
+    assert second_id[:8] == "00000000"
+    assert second_id[8:] != first_id[8:]
+    assert second_id != first_id
+
+
+def test_market_uses_id_generator_for_offer_ids():
+    market = OneSidedMarket(time_slot=now())
+    first_offer = market.offer(1, 1, 'A', 'A')
+    second_offer = market.offer(1, 1, 'A', 'A')
+    assert first_offer.id[8:] == second_offer.id[8:]
+    assert int(second_offer.id[7::-1], 16) == int(first_offer.id[7::-1], 16) + 1
+
+
+def test_copy_offer_shares_attribute_values():
+    offer = Offer('id', None, 2, 1, 'seller', 3, seller_origin='origin')
+    offer_copy = copy_offer(offer)
+    assert offer_copy == offer
+    assert offer_copy is not offer
+    assert offer_copy.seller_origin is offer.seller_origin
+    assert offer_copy.energy_rate == 2
+    offer.update_price(4)
+    assert offer_copy.price == 2
@@ -19,9 +19,11 @@ import pytest
 from copy import deepcopy
 import pendulum
 from math import isclose
+from unittest.mock import MagicMock
 
 from d3a.constants import TIME_FORMAT
 from d3a.constants import TIME_ZONE
+from d3a.events.event_structures import MarketEvent
 from d3a.models.area import DEFAULT_CONFIG
 from d3a.models.market.market_structures import Offer, Trade, Bid
 from d3a.models.strategy.area_agents.one_sided_agent import OneSidedAgent
@@ -29,6 +31,9 @@ from d3a.models.strategy.area_agents.two_sided_pay_as_bid_agent import TwoSidedP
 from d3a.models.strategy.area_agents.two_sided_pay_as_bid_engine import BidInfo
 from d3a_interface.constants_limits import ConstSettings
 from d3a.models.market.market_structures import MarketClearingState
+from d3a.models.market.order_book import OrderBook
+from d3a.models.market.one_sided import OneSidedMarket
+from d3a.models.market.two_sided_pay_as_bid import TwoSidedPayAsBid
 from d3a.models.market import TransferFees
 from d3a.models.market.grid_fees.base_model import GridFees
 
@@ -273,6 +278,34 @@ def test_iaa_forwards_offers(iaa):
     assert iaa.higher_market.offer_call_count == 1
 
 
+@pytest.mark.parametrize("order_book", [False, True])
+def test_iaa_forwards_new_offers_after_min_offer_age(order_book):
+    lower_market = FakeMarket([Offer('id', pendulum.now(), 1, 1, 'other', 1)])
+    if order_book:
+        lower_market.offers = OrderBook(lower_market.offers)
+    iaa = OneSidedAgent(owner=FakeArea('owner'), higher_market=FakeMarket([]),
+                        lower_market=lower_market, min_offer_age=2)
+    engine = iaa.engines[1]
+    iaa.event_tick()
+    lower_market.offers['id4'] = Offer('id4', pendulum.now(), 2, 1, 'other', 2)
+    iaa.owner.current_tick = 11
+    iaa.event_tick()
+    assert engine.offer_age == {'id': 10, 'id4': 11}
+    assert iaa.higher_market.offer_call_count == 0
+
+    iaa.owner.current_tick = 12
+    iaa.event_tick()
+    assert iaa.higher_market.offer_call_count == 1
+    assert 'id' in engine.forwarded_offers
+    assert list(engine._pending_offers) == ['id4']
+
+    iaa.owner.current_tick = 13
+    iaa.event_tick()
+    assert iaa.higher_market.offer_call_count == 2
+    assert 'id4' in engine.forwarded_offers
+    assert list(engine._pending_offers) == []
+
+
 def test_iaa_forwarded_offers_complied_to_transfer_fee(iaa_grid_fee):
     source_offer = [o for o in iaa_grid_fee.lower_market.sorted_offers if o.id == "id"][0]
     target_offer = [o for o in iaa_grid_fee.higher_market.sorted_offers if o.id == "uuid"][0]
@@ -382,6 +415,27 @@ def test_iaa_forwards_offers_according_to_constantfee(iaa_fee_const):
     assert iaa.higher_market.forwarded_bid.price == bid.price - iaa_fee_const * bid.energy
 
 
+def test_iaa_forwards_bid_again_if_forwarded_bid_was_deleted(iaa_bid):
+    engine = iaa_bid.engines[1]
+    assert engine.markets.source == iaa_bid.lower_market
+    target_bid = engine.forwarded_bids['id'].target_bid
+    iaa_bid.event_bid_deleted(market_id=iaa_bid.higher_market.id, bid=target_bid)
+    assert 'id' not in engine.forwarded_bids
+    assert 'id' not in engine.bid_age
+
+    iaa_bid.owner.current_tick = 15
+    iaa_bid.event_tick()
+    assert engine.bid_age['id'] == 15
+    assert list(engine._pending_bids) == ['id']
+    assert iaa_bid.higher_market.bid_call_count == 1
+
+    iaa_bid.owner.current_tick = 15 + engine.min_bid_age
+    iaa_bid.event_tick()
+    assert iaa_bid.higher_market.bid_call_count == 2
+    assert 'id' in engine.forwarded_bids
+    assert list(engine._pending_bids) == []
+
+
 def test_iaa_event_trade_bid_deletes_forwarded_bid_when_sold(iaa_bid, called):
     iaa_bid.lower_market.delete_bid = called
     iaa_bid.event_bid_traded(
@@ -631,3 +685,102 @@ def test_iaa_event_offer_split_and_trade_correctly_populate_forwarded_offer_entr
     offer_info = engine.forwarded_offers[residual_offer_id]
     assert offer_info.source_offer.id == "uuid"
     assert offer_info.target_offer.id == residual_offer_id
+
+
+def test_iaa_event_offer_updated_reprices_forwarded_offer_in_place(called):
+    lower_market = OneSidedMarket(time_slot=pendulum.now())
+    higher_market = OneSidedMarket(time_slot=pendulum.now())
+    iaa = OneSidedAgent(owner=FakeArea('owner'), higher_market=higher_market,
+                        lower_market=lower_market, min_offer_age=0)
+    offer = lower_market.offer(1, 1, 'other', 'other')
+    iaa.event_tick()
+    forwarded_offer = list(higher_market.offers.values())[0]
+
+    higher_market.add_listener(called)
+    updated_offer = lower_market.update_offer(offer.id, 2, dispatch_event=False)
+    iaa.event_offer_updated(market_id=lower_market.id, existing_offer=offer,
+                            new_offer=updated_offer)
+
+    assert list(higher_market.offers.keys()) == [forwarded_offer.id]
+    assert higher_market.offers[forwarded_offer.id].price == 2
+    offer_info = iaa.engines[1].forwarded_offers[offer.id]
+    assert offer_info.source_offer.price == 2
+    assert offer_info.target_offer.id == forwarded_offer.id
+    assert [c[0] for c in called.calls] == [(repr(MarketEvent.OFFER_UPDATED),)]
+
+
+def test_iaa_event_bid_updated_reprices_forwarded_bid_in_place(called):
+    ConstSettings.IAASettings.MARKET_TYPE = 2
+    lower_market = TwoSidedPayAsBid(time_slot=pendulum.now())
+    higher_market = TwoSidedPayAsBid(time_slot=pendulum.now())
+    iaa = TwoSidedPayAsBidAgent(owner=FakeArea('owner'), higher_market=higher_market,
+                                lower_market=lower_market, min_offer_age=0, min_bid_age=0)
+    bid = lower_market.bid(1, 1, 'other', 'other')
+    iaa.event_tick()
+    forwarded_bid = list(higher_market.bids.values())[0]
+
+    higher_market.add_listener(called)
+    updated_bid = lower_market.update_bid(bid.id, 2, dispatch_event=False)
+    iaa.event_bid_updated(market_id=lower_market.id, existing_bid=bid, new_bid=updated_bid)
+
+    assert list(higher_market.bids.keys()) == [forwarded_bid.id]
+    assert higher_market.bids[forwarded_bid.id].price == 2
+    bid_info = iaa.engines[1].forwarded_bids[bid.id]
+    assert bid_info.source_bid.price == 2
+    assert bid_info.target_bid.id == forwarded_bid.id
+    assert [c[0] for c in called.calls] == [(repr(MarketEvent.BID_UPDATED),)]
+
+
+def test_iaa_event_bid_updated_forwards_again_when_dispatching_via_redis():
+    ConstSettings.IAASettings.MARKET_TYPE = 2
+    lower_market = TwoSidedPayAsBid(time_slot=pendulum.now())
+    higher_market = TwoSidedPayAsBid(time_slot=pendulum.now())
+    iaa = TwoSidedPayAsBidAgent(owner=FakeArea('owner'), higher_market=higher_market,
+                                lower_market=lower_market, min_offer_age=0, min_bid_age=0)
+    bid = lower_market.bid(1, 1, 'other', 'other')
+    iaa.event_tick()
+
+    updated_bid = lower_market.update_bid(bid.id, 2, dispatch_event=False)
+    higher_market.redis_publisher = MagicMock()
+    ConstSettings.GeneralSettings.EVENT_DISPATCHING_VIA_REDIS = True
+    try:
+        iaa.event_bid_updated(market_id=lower_market.id, existing_bid=bid,
+                              new_bid=updated_bid)
+    finally:
+        ConstSettings.GeneralSettings.EVENT_DISPATCHING_VIA_REDIS = False
+    assert len(higher_market.bids) == 0
+    assert bid.id not in iaa.engines[1].forwarded_bids
+    higher_market.redis_publisher.publish_event.assert_called_once()
+
+    iaa.event_tick()
+    forwarded_bid = list(higher_market.bids.values())[0]
+    assert forwarded_bid.price == 2
+    assert iaa.engines[1].forwarded_bids[bid.id].source_bid.price == 2
+
+
+def test_iaa_event_offer_updated_forwards_again_when_dispatching_via_redis():
+    lower_market = OneSidedMarket(time_slot=pendulum.now())
+    higher_market = OneSidedMarket(time_slot=pendulum.now())
+    iaa = OneSidedAgent(owner=FakeArea('owner'), higher_market=higher_market,
+                        lower_market=lower_market, min_offer_age=0)
+    offer = lower_market.offer(1, 1, 'other', 'other')
+    iaa.event_tick()
+
+    updated_offer = lower_market.update_offer(offer.id, 2, dispatch_event=False)
+    higher_market.redis_publisher = MagicMock()
+    # The market deletes the forwarded offer when it receives the request of the IAA
+    iaa.delete_offer = lambda market, offer: market.delete_offer(offer)
+    ConstSettings.GeneralSettings.EVENT_DISPATCHING_VIA_REDIS = True
+    try:
+        iaa.event_offer_updated(market_id=lower_market.id, existing_offer=offer,
+                                new_offer=updated_offer)
+    finally:
+        ConstSettings.GeneralSettings.EVENT_DISPATCHING_VIA_REDIS = False
+    assert len(higher_market.offers) == 0
+    assert offer.id not in iaa.engines[1].forwarded_offers
+    higher_market.redis_publisher.publish_event.assert_called_once()
+
+    iaa.event_tick()
+    forwarded_offer = list(higher_market.offers.values())[0]
+    assert forwarded_offer.price == 2
+    assert iaa.engines[1].forwarded_offers[offer.id].source_offer.price == 2
@@ -15,8 +15,9 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
+import random
 import string
-from math import isclose
+from math import isclose, fsum
 from copy import deepcopy
 import pytest
 from pendulum import DateTime, now
@@ -39,6 +40,7 @@ from d3a.models.market.balancing import BalancingMarket
 from d3a_interface.constants_limits import ConstSettings
 from d3a.d3a_core.util import add_or_create_key, subtract_or_create_key
 from d3a.models.market import TransferFees
+from d3a.models.strategy import _TradeLookerUpper
 
 from d3a.d3a_core.device_registry import DeviceRegistry
 device_registry_dict = {
@@ -147,6 +149,18 @@ def test_double_sided_performs_pay_as_bid_matching(market):
     assert offer == list(market.offers.values())[0]
 
 
+def test_double_sided_pay_as_bid_matching_skips_bids_of_the_offer_seller(market):
+    market.offers = {"offer1": Offer('offer1', now(), 5, 1, 'A', 5),
+                     "offer2": Offer('offer2', now(), 4, 1, 'B', 4),
+                     "offer3": Offer('offer3', now(), 1, 1, 'A', 1)}
+    market.bids = {"bid1": Bid('bid1', now(), 10, 1, 'A', 10),
+                   "bid2": Bid('bid2', now(), 8, 1, 'A', 8),
+                   "bid3": Bid('bid3', now(), 6, 1, 'C', 6),
+                   "bid4": Bid('bid4', now(), 2, 1, 'C', 2)}
+    matched = [(bid.id, offer.id) for bid, offer in market._perform_pay_as_bid_matching()]
+    assert matched == [('bid3', 'offer1'), ('bid1', 'offer2'), ('bid4', 'offer3')]
+
+
 def test_device_registry(market=BalancingMarket()):
     with pytest.raises(DeviceNotInRegistryError):
         market.balancing_offer(10, 10, 'noone')
@@ -262,6 +276,57 @@ def test_market_bid_delete_missing(market: TwoSidedPayAsBid):
         market.delete_bid("no such offer")
 
 
+def test_market_update_offer_reprices_in_place(called, market=OneSidedMarket(time_slot=now())):
+    cheap_offer = market.offer(10, 1, 'A', 'A')
+    offer = market.offer(5, 1, 'B', 'B')
+    market.add_listener(called)
+    updated_offer = market.update_offer(offer, 20)
+
+    assert updated_offer.id == offer.id
+    assert updated_offer.price == 20
+    assert updated_offer.energy == offer.energy
+    assert market.offers[offer.id] == updated_offer
+    assert market.sorted_offers == [cheap_offer, updated_offer]
+    assert market.min_offer_price == 10
+    assert len(called.calls) == 1
+    assert called.calls[0][0] == (repr(MarketEvent.OFFER_UPDATED),)
+    assert called.calls[0][1]['existing_offer'] == repr(offer)
+    assert called.calls[0][1]['new_offer'] == repr(updated_offer)
+
+
+def test_market_update_offer_missing(market=OneSidedMarket(time_slot=now())):
+    with pytest.raises(OfferNotFoundException):
+        market.update_offer("no such offer", 10)
+
+
+def test_market_update_bid_reprices_in_place(called, market=TwoSidedPayAsBid(time_slot=now())):
+    bid = market.bid(5, 1, 'A', 'A')
+    market.add_listener(called)
+    updated_bid = market.update_bid(bid.id, 15)
+
+    assert updated_bid.id == bid.id
+    assert updated_bid.price == 15
+    assert market.bids[bid.id] == updated_bid
+    assert len(market.bids) == 1
+    assert len(called.calls) == 1
+    assert called.calls[0][0] == (repr(MarketEvent.BID_UPDATED),)
+    assert called.calls[0][1]['new_bid'] == repr(updated_bid)
+
+    with pytest.raises(BidNotFound):
+        market.update_bid("no such bid", 10)
+
+
+@pytest.mark.parametrize("market, order, update_order", [
+    (OneSidedMarket(time_slot=now()), "offer", "update_offer"),
+    (TwoSidedPayAsBid(time_slot=now()), "bid", "update_bid")
+])
+def test_market_update_readonly(market, order, update_order):
+    order = getattr(market, order)(10, 1, 'A', 'A')
+    market.readonly = True
+    with pytest.raises(MarketReadOnlyException):
+        getattr(market, update_order)(order.id, 20)
+
+
 @pytest.mark.parametrize("market, offer, accept_offer", [
     (OneSidedMarket(time_slot=now()),
      "offer", "accept_offer"),
@@ -489,6 +554,37 @@ def test_market_acct_multiple(market=OneSidedMarket(time_slot=now())):
     assert market.bought_energy('C') == offer2.energy == 10
 
 
+@pytest.mark.parametrize("market", [
+    OneSidedMarket(time_slot=now()),
+    TwoSidedPayAsBid(time_slot=now()),
+])
+def test_market_owner_accounting_agrees_with_full_scan(market):
+    random.seed(3)
+    owners = ['A', 'B', 'C', 'IAA D']
+    for _ in range(50):
+        seller, buyer = random.sample(owners, 2)
+        offer = market.offer(random.uniform(1, 30), random.uniform(1, 10), seller, seller)
+        market.accept_offer(offer, buyer, energy=random.choice([None, offer.energy / 3]))
+
+    for owner in owners + ['E']:
+        assert market.bought_energy(owner) == \
+            sum(t.offer.energy for t in market.trades if t.buyer == owner)
+        assert market.sold_energy(owner) == \
+            sum(t.offer.energy for t in market.trades if t.seller == owner)
+        assert market.total_spent(owner) == \
+            sum(t.offer.price for t in market.trades if t.buyer == owner)
+        assert market.total_earned(owner) == \
+            sum(t.offer.price for t in market.trades if t.seller == owner)
+        assert market.trades_of(owner) == list(_TradeLookerUpper(owner)[market]) == \
+            [t for t in market.trades if owner in (t.buyer, t.seller)]
+
+    trades = market.trades[:10]
+    market.trades = trades
+    assert market.sold_energy('A') == \
+        sum(t.offer.energy for t in trades if t.seller == 'A')
+    assert market.trades_of('A') == [t for t in trades if 'A' in (t.buyer, t.seller)]
+
+
 @pytest.mark.parametrize("market, offer", [
     (OneSidedMarket(time_slot=now()), "offer"),
     (BalancingMarket(time_slot=now()), "balancing_offer")
@@ -538,6 +634,54 @@ def test_market_most_affordable_offers(market, offer):
     assert {o.price for o in market.most_affordable_offers} == {1, 10, 20, 20000}
 
 
+@pytest.mark.parametrize("market", [
+    OneSidedMarket(time_slot=now()),
+    TwoSidedPayAsBid(time_slot=now()),
+])
+def test_market_order_book_stays_sorted_after_delete_and_split(market):
+    offers = [market.offer(price, 1, 'A', 'A') for price in [5, 3, 1, 2, 4]]
+    market.delete_offer(offers[2])
+    assert [o.price for o in market.sorted_offers] == [2, 3, 4, 5]
+    assert market.cheapest_offer.price == 2
+
+    market.accept_offer(offers[3], 'B', energy=0.5)
+    assert [o.price for o in market.sorted_offers] == [1, 3, 4, 5]
+    assert market.cheapest_offer.energy == 0.5
+
+    market.delete_offer(market.cheapest_offer)
+    market.delete_offer(offers[1])
+    market.delete_offer(offers[4])
+    market.delete_offer(offers[0])
+    assert market.sorted_offers == []
+    assert market.cheapest_offer is None
+
+
+def test_market_order_book_sorts_bids_descending():
+    market = TwoSidedPayAsBid(time_slot=now())
+    for price in [5, 3, 1, 2, 4]:
+        market.bid(price, 1, 'A', 'A')
+    assert [b.price for b in market.bids.sorted_values(reverse=True)] == [5, 4, 3, 2, 1]
+    assert market.bids.best(reverse=True).price == 5
+    assert market.bids.best_rate() == 1
+
+
+def test_market_order_book_logs_added_keys():
+    market = OneSidedMarket(time_slot=now())
+    offers = [market.offer(price, 1, 'A', 'A') for price in [3, 1, 2]]
+    position, added_ids = market.offers.keys_added_since(0)
+    assert position == 3
+    assert added_ids == [offer.id for offer in offers]
+
+    market.delete_offer(offers[0])
+    market.accept_offer(offers[1], 'B', energy=0.5)
+    position, added_ids = market.offers.keys_added_since(position)
+    assert position == 5
+    # The accepted part of the split offer keeps the id of the original offer
+    assert added_ids[0] == offers[1].id
+    assert added_ids[1] in market.offers
+    assert market.offers.keys_added_since(position) == (5, [])
+
+
 @pytest.mark.parametrize("market, offer", [
     (OneSidedMarket, "offer"),
     (BalancingMarket, "balancing_offer")
@@ -673,7 +817,7 @@ def pac_market():
     # ([2, 3, 6, 7, 7, 7, 7], [7, 5, 5, 2, 2, 2, 2], 5, 2),
     # ([2, 2, 4, 4, 4, 4, 6], [6, 6, 6, 6, 2, 2, 2], 4, 4),
 ])
-@pytest.mark.parametrize("algorithm", [1])
+@pytest.mark.parametrize("algorithm", [1, 3])
 def test_double_sided_market_performs_pay_as_clear_matching(pac_market, offer, bid, mcp_rate,
                                                             mcp_energy, algorithm):
     ConstSettings.IAASettings.PAY_AS_CLEAR_AGGREGATION_ALGORITHM = algorithm
@@ -713,6 +857,51 @@ def test_double_sided_pay_as_clear_market_works_with_floats(pac_market):
     assert matched == 2.2
 
 
+@pytest.mark.parametrize("seed", range(20))
+def test_pay_as_clear_vectorized_algorithm_matches_algorithm_1(seed):
+    rng = random.Random(seed)
+
+    def _rate():
+        return rng.choice([rng.randint(1, 10), round(rng.uniform(0, 10), 2)])
+
+    def _energy():
+        return rng.choice([0.5, 1, 2, round(rng.uniform(0.01, 3), 3)])
+
+    pac_market = TwoSidedPayAsClear(time_slot=now())
+    for i in range(rng.randint(1, 30)):
+        energy = _energy()
+        pac_market.offers[f"offer{i}"] = Offer(f"offer{i}", now(), _rate() * energy, energy, 'S')
+    for i in range(rng.randint(1, 30)):
+        energy = _energy()
+        pac_market.bids[f"bid{i}"] = Bid(f"bid{i}", now(), _rate() * energy, energy, 'B', 'S')
+
+    try:
+        ConstSettings.IAASettings.PAY_AS_CLEAR_AGGREGATION_ALGORITHM = 1
+        expected = pac_market._perform_pay_as_clear_matching()
+        ConstSettings.IAASettings.PAY_AS_CLEAR_AGGREGATION_ALGORITHM = 3
+        assert pac_market._perform_pay_as_clear_matching() == expected
+    finally:
+        ConstSettings.IAASettings.PAY_AS_CLEAR_AGGREGATION_ALGORITHM = 1
+
+
+def test_double_sided_pay_as_clear_trades_residuals_of_partial_matches(pac_market):
+    ConstSettings.IAASettings.PAY_AS_CLEAR_AGGREGATION_ALGORITHM = 1
+    pac_market.mcp_update_point = 1
+    pac_market.offers = {"offer1": Offer('offer1', now(), 3, 3, 'S', 3),
+                         "offer2": Offer('offer2', now(), 2, 1, 'S', 2)}
+    pac_market.bids = {"bid1": Bid('bid1', now(), 10, 2, 'B', 10),
+                       "bid2": Bid('bid2', now(), 8, 2, 'B', 8)}
+
+    pac_market.match_offers_bids()
+
+    assert [trade.offer.energy for trade in pac_market.trades] == [2, 1, 1]
+    assert pac_market.trades[0].offer.id == 'offer1'
+    assert pac_market.trades[1].offer.id == pac_market.trades[0].residual.id
+    assert pac_market.trades[2].offer.id == 'offer2'
+    assert len(pac_market.offers) == 0
+    assert len(pac_market.bids) == 0
+
+
 @pytest.yield_fixture
 def pab_market():
     return FakeTwoSidedPayAsBid()
@@ -767,10 +956,28 @@ class MarketStateMachine(RuleBasedStateMachine):
         assume(offer.id in self.market.offers)
         self.market.accept_offer(offer, buyer)
 
+    @rule(offer=offers, buyer=actors)
+    def partial_trade(self, offer, buyer):
+        assume(offer.id in self.market.offers)
+        self.market.accept_offer(offer.id, buyer, energy=self.market.offers[offer.id].energy / 2)
+
+    @rule(offer=offers)
+    def delete(self, offer):
+        assume(offer.id in self.market.offers)
+        self.market.delete_offer(offer.id)
+
+    @precondition(lambda self: self.market.offers)
+    @rule()
+    def check_min_max_offer_price(self):
+        rates = [o.energy_rate for o in self.market.offers.values()]
+        assert self.market.min_offer_price == round(min(rates), 4)
+        assert self.market.max_offer_price == round(max(rates), 4)
+
     @precondition(lambda self: self.market.offers)
     @rule()
     def check_avg_offer_price(self):
-        price = sum(o.price for o in self.market.offers.values())
+        # The order book keeps an exact (correctly rounded) sum of the prices
+        price = fsum(o.price for o in self.market.offers.values())
         energy = sum(o.energy for o in self.market.offers.values())
         assert self.market.avg_offer_price == round(price / energy, 4)
 
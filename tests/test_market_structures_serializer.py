@@ -0,0 +1,78 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of D3A.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import json
+
+import pendulum
+import pytest
+
+from d3a.models.market import market_structures_serializer
+from d3a.models.market.market_structures import Offer, Bid, Trade, TradeBidOfferInfo, \
+    trade_from_JSON_string
+from d3a.models.market.market_structures_serializer import dumps, loads, my_converter, \
+    isoformat
+
+
+TIME = pendulum.datetime(2021, 3, 4, 5, 6, 7, tz="Europe/Berlin")
+
+
+def _trade():
+    offer = Offer("offer", TIME, 1.5, 0.3, "seller", 1.2, "seller origin")
+    return Trade("trade", TIME, offer, "seller", "buyer", residual=offer,
+                 offer_bid_trade_info=TradeBidOfferInfo(1.0, 2.0, None, 3.0, 4.0),
+                 fee_price=0.1)
+
+
+@pytest.mark.parametrize("structure", [
+    Offer("offer", TIME, 1.5, 0.3, "seller", None, "seller origin"),
+    Bid("bid", TIME, 2.25, 0.7, "buyer", 3.0, "buyer origin"),
+    TradeBidOfferInfo(1.0, 2.0, None, 3.0, 4.0),
+])
+def test_to_json_string_matches_json_dumps(structure):
+    expected = dict(zip(structure._fields, structure)) if isinstance(structure, tuple) else \
+        {key: getattr(structure, key) for key in Offer.__slots__ if key != "energy_rate"}
+    if isinstance(structure, (Offer, Bid)):
+        expected["type"] = type(structure).__name__
+    assert structure.to_JSON_string() == json.dumps(expected, default=my_converter)
+
+
+def test_trade_json_round_trip():
+    trade_string = _trade().to_JSON_string()
+    trade = trade_from_JSON_string(trade_string, TIME)
+    assert trade.to_JSON_string() == trade_string
+    assert trade.offer_bid_trade_info == TradeBidOfferInfo(1.0, 2.0, None, 3.0, 4.0)
+
+
+def test_cached_time_strings_distinguish_timezones():
+    utc_time = TIME.in_timezone("UTC")
+    assert utc_time == TIME
+    assert isoformat(TIME) == TIME.isoformat()
+    assert isoformat(utc_time) == utc_time.isoformat()
+    assert isoformat(TIME) != isoformat(utc_time)
+
+
+def test_dumps_and_loads_match_the_standard_library():
+    data = {"a": [1, 2.5, None, "ü"], "nan": float("nan"), "time": TIME}
+    assert dumps(data, convert_datetimes=True) == json.dumps(data, default=my_converter)
+    loaded = loads(dumps(data, convert_datetimes=True))
+    assert loaded["a"] == [1, 2.5, None, "ü"]
+    assert loaded["time"] == TIME.isoformat()
+
+
+def test_loads_falls_back_to_the_standard_library(monkeypatch):
+    monkeypatch.setattr(market_structures_serializer, "orjson", None)
+    assert loads('{"a": [1, 2.5]}') == {"a": [1, 2.5]}
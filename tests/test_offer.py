@@ -15,6 +15,7 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
+import json
 import pytest
 import pendulum
 from d3a.models.market.market_structures import Offer, BalancingOffer
@@ -26,3 +27,14 @@ def test_offer_id_stringified(offer):
 
     assert isinstance(offer.id, str)
     assert "<object object at" in offer.id
+
+
+@pytest.mark.parametrize("offer", [Offer, BalancingOffer])
+def test_offer_is_slotted_and_serializes_all_attributes(offer):
+    offer = offer('id', pendulum.datetime(2021, 1, 1), 10, 20, 'A', 12, 'B')
+
+    assert not hasattr(offer, "__dict__")
+    assert json.loads(offer.to_JSON_string()) == {
+        "id": "id", "real_id": "id", "price": 10, "original_offer_price": 12, "energy": 20,
+        "seller": "A", "seller_origin": "B", "time": "2021-01-01T00:00:00+00:00",
+        "type": "Offer"}
@@ -0,0 +1,199 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of D3A.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import random
+from unittest.mock import patch
+
+import pendulum
+import pytest
+from d3a_interface.constants_limits import GlobalConfig
+from pendulum import duration, from_timestamp
+
+from d3a.constants import FLOATING_POINT_TOLERANCE, TIME_ZONE
+from d3a.d3a_core.util import convert_kW_to_kWh, generate_market_slot_list
+from d3a.models.read_user_profile import _calculate_energy_from_power_profile, \
+    _str_keys_to_datetime, _str_to_datetime, _readCSV, _eval_time_format, \
+    TIME_FORMAT, DATE_TIME_FORMAT, DATE_TIME_FORMAT_SECONDS, read_arbitrary_profile, \
+    InputProfileTypes, profile_cache
+from d3a.models.strategy.update_frequency import UpdateFrequencyMixin
+
+START = pendulum.datetime(2021, 3, 1, tz=TIME_ZONE)
+
+
+def _energy_from_power_profile_per_second(profile_data_W, slot_length):
+    """Former implementation, that expands the power profile to one value per second"""
+    profile_data_W = dict(profile_data_W)
+    input_time_list = list(profile_data_W.keys())
+
+    additional_time_stamp = input_time_list[-1] + slot_length
+    profile_data_W[additional_time_stamp] = profile_data_W[input_time_list[-1]]
+    input_time_list.append(additional_time_stamp)
+
+    input_power_list_W = [float(dp) for dp in profile_data_W.values()]
+
+    time0 = from_timestamp(0)
+    input_time_seconds_list = [(ti - time0).in_seconds()
+                               for ti in input_time_list]
+
+    slot_time_list = [i for i in range(input_time_seconds_list[0], input_time_seconds_list[-1],
+                                       slot_length.in_seconds())]
+
+    second_power_list_W = [
+        input_power_list_W[index - 1]
+        for index, seconds in enumerate(input_time_seconds_list)
+        for _ in range(seconds - input_time_seconds_list[index - 1])
+    ]
+
+    avg_power_kW = []
+    for index, slot in enumerate(slot_time_list):
+        first_index = index * slot_length.in_seconds()
+        if first_index <= len(second_power_list_W):
+            avg_power_kW.append(second_power_list_W[first_index] / 1000.)
+
+    slot_energy_kWh = list(map(lambda x: convert_kW_to_kWh(x, slot_length), avg_power_kW))
+
+    return {from_timestamp(slot_time_list[ii]): energy
+            for ii, energy in enumerate(slot_energy_kWh)
+            }
+
+
+def _random_profile(step, count):
+    random.seed(count)
+    return {START + step * i: random.uniform(0, 5000) for i in range(count)}
+
+
+@pytest.mark.parametrize("profile, slot_length", [
+    (_random_profile(duration(minutes=15), 96 * 2), duration(minutes=15)),
+    (_random_profile(duration(hours=1), 48), duration(minutes=15)),
+    (_random_profile(duration(minutes=7), 100), duration(minutes=15)),
+    (_random_profile(duration(minutes=15), 96), duration(hours=1)),
+    ({START: 1000, START.add(minutes=1): 0, START.add(minutes=44): 3000}, duration(minutes=15)),
+    ({START: 250}, duration(minutes=15)),
+])
+def test_energy_from_power_profile_matches_per_second_expansion(profile, slot_length):
+    expected = _energy_from_power_profile_per_second(profile, slot_length)
+    energy = _calculate_energy_from_power_profile(profile, slot_length)
+    assert list(energy.keys()) == list(expected.keys())
+    assert all(abs(energy[time_slot] - expected[time_slot]) <= FLOATING_POINT_TOLERANCE
+               for time_slot in expected)
+
+
+@pytest.mark.parametrize("time_format, time_stamps", [
+    (TIME_FORMAT, ["00:00", "00:15", "12:30", "23:45"]),
+    (DATE_TIME_FORMAT, ["2021-03-01T00:00", "2021-03-01T00:15", "2021-03-28T02:30"]),
+    (DATE_TIME_FORMAT_SECONDS, ["2021-03-01T00:00:00", "2021-03-01T00:15:30",
+                                "2021-12-31T23:59:59"]),
+])
+def test_str_keys_to_datetime_matches_str_to_datetime(time_format, time_stamps):
+    profile = {time_stamp: index for index, time_stamp in enumerate(time_stamps)}
+    assert _eval_time_format(profile) == time_format
+    parsed = _str_keys_to_datetime(profile)
+    expected = {_str_to_datetime(time_stamp, time_format): index
+                for index, time_stamp in enumerate(time_stamps)}
+    assert parsed == expected
+    assert list(parsed.keys()) == list(expected.keys())
+
+
+def test_readCSV_matches_str_to_datetime(tmpdir):
+    csv_file = tmpdir.join("profile.csv")
+    csv_file.write("Interval;Power(W)\n"
+                   "2021-03-01T00:00;10\n"
+                   "2021-03-01T00:15;20.5\n"
+                   "2021-03-01T00:30;0\n")
+    assert _readCSV(str(csv_file)) == {
+        _str_to_datetime("2021-03-01T00:00", DATE_TIME_FORMAT): 10.0,
+        _str_to_datetime("2021-03-01T00:15", DATE_TIME_FORMAT): 20.5,
+        _str_to_datetime("2021-03-01T00:30", DATE_TIME_FORMAT): 0.0,
+    }
+
+
+@pytest.mark.parametrize("time_stamps", [
+    ["00:00", "2021-03-01T00:15"],
+    ["2021-03-01T00:00", "2021-03-01T00:15:00"],
+    ["2021-03-01T00:00", "2021-03-01T25:00"],
+    ["2021-03-01T00:00", "2021-03-01 00:15"],
+    ["2021-03-01T00:00", "2021-03-01T0:150"],
+    ["00:00", "0:150"],
+    ["not a time"],
+])
+def test_str_keys_to_datetime_raises_on_invalid_time_stamps(time_stamps):
+    with pytest.raises(Exception, match="Format of time-stamp"):
+        _str_keys_to_datetime({time_stamp: 0 for time_stamp in time_stamps})
+
+
+def test_generate_market_slot_list_returns_equal_copies():
+    first = generate_market_slot_list(START, duration(hours=2))
+    second = generate_market_slot_list(START, duration(hours=2))
+    assert first == second
+    assert first is not second
+    assert first[0] == START
+
+
+def test_read_arbitrary_profile_shares_identical_profiles():
+    first = read_arbitrary_profile(InputProfileTypes.POWER, {0: 100, 12: 200})
+    second = read_arbitrary_profile(InputProfileTypes.POWER, {0: 100, 12: 200})
+    other = read_arbitrary_profile(InputProfileTypes.POWER, {0: 150, 12: 200})
+    identity = read_arbitrary_profile(InputProfileTypes.IDENTITY, {0: 100, 12: 200})
+
+    assert second is first
+    assert other is not first and other != first
+    assert identity is not first and identity != first
+    assert profile_cache.hits == 1
+    assert profile_cache.misses == 3
+    assert profile_cache.hit_rate == 0.25
+    assert profile_cache.memory_saved_bytes > 0
+    assert profile_cache.stats()["profiles"] == 3
+
+
+def test_read_arbitrary_profile_cache_is_keyed_by_configuration():
+    profile = read_arbitrary_profile(InputProfileTypes.IDENTITY, 30)
+    with patch.object(GlobalConfig, "slot_length", duration(minutes=60)):
+        hourly_profile = read_arbitrary_profile(InputProfileTypes.IDENTITY, 30)
+    assert hourly_profile is not profile
+    assert len(hourly_profile) < len(profile)
+    assert read_arbitrary_profile(InputProfileTypes.IDENTITY, 30) is profile
+
+
+def test_read_arbitrary_profile_addresses_csv_files_by_content(tmpdir):
+    csv_content = "INTERVAL;POWER\n00:00;100\n12:00;200\n"
+    tmpdir.join("house1.csv").write(csv_content)
+    tmpdir.join("house2.csv").write(csv_content)
+    tmpdir.join("house3.csv").write(csv_content.replace("200", "250"))
+
+    profile = read_arbitrary_profile(InputProfileTypes.POWER, str(tmpdir.join("house1.csv")))
+    assert read_arbitrary_profile(
+        InputProfileTypes.POWER, str(tmpdir.join("house2.csv"))) is profile
+    assert read_arbitrary_profile(
+        InputProfileTypes.POWER, str(tmpdir.join("house3.csv"))) is not profile
+
+
+def test_reassigned_rates_do_not_modify_shared_profile():
+    first = UpdateFrequencyMixin(initial_rate=10, final_rate=30)
+    second = UpdateFrequencyMixin(initial_rate=10, final_rate=30)
+    assert first.initial_rate_profile_buffer is second.initial_rate_profile_buffer
+
+    time_slot = next(iter(first.initial_rate_profile_buffer))
+    first.number_of_available_updates = 1
+    first.reassign_mixin_arguments(time_slot, initial_rate=20)
+    assert first.initial_rate_profile_buffer[time_slot] == 20
+    assert second.initial_rate_profile_buffer[time_slot] == 10
+
+    own_profile = first.initial_rate_profile_buffer
+    first.reassign_mixin_arguments(time_slot, initial_rate=25)
+    assert first.initial_rate_profile_buffer is own_profile
+    assert first.initial_rate_profile_buffer[time_slot] == 25
+    assert second.initial_rate_profile_buffer[time_slot] == 10
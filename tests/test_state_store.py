@@ -0,0 +1,135 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of D3A.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import random
+
+import pendulum
+import pytest
+from d3a_interface.utils import convert_pendulum_to_str_in_dict, convert_str_to_pendulum_in_dict
+
+from d3a.constants import TIME_ZONE
+from d3a.models.state import StorageState
+from d3a.models.state_store import TimeSlotIndex, TimeSlotStore
+
+START = pendulum.datetime(2021, 1, 1, tz=TIME_ZONE)
+SLOT_LENGTH = pendulum.duration(minutes=15)
+
+
+@pytest.fixture
+def time_slot_index():
+    return TimeSlotIndex(START, SLOT_LENGTH)
+
+
+def _time_slot(slot_number):
+    return START + SLOT_LENGTH * slot_number
+
+
+def test_time_slot_index_maps_aligned_time_slots_only(time_slot_index):
+    assert time_slot_index.index(START) == 0
+    assert time_slot_index.index(_time_slot(3)) == 3
+    assert time_slot_index.index(_time_slot(-2)) == -2
+    assert time_slot_index.index(START.add(minutes=1)) is None
+    assert time_slot_index.index(START.in_timezone("Europe/Berlin")) == 0
+    assert time_slot_index.index("not a time slot") is None
+    assert time_slot_index.time_slot(3) == _time_slot(3)
+
+
+def test_time_slot_store_behaves_like_a_dict(time_slot_index):
+    random.seed(0)
+    store = TimeSlotStore(time_slot_index=time_slot_index)
+    reference = {}
+    time_slots = [_time_slot(n) for n in range(-5, 60)] + [START.add(minutes=7)]
+    for _ in range(2000):
+        time_slot = random.choice(time_slots)
+        operation = random.random()
+        if operation < 0.6:
+            value = random.random()
+            store[time_slot] = value
+            reference[time_slot] = value
+        elif operation < 0.8:
+            assert store.pop(time_slot, None) == reference.pop(time_slot, None)
+        else:
+            evict_before = random.choice(time_slots)
+            store.delete_before(evict_before)
+            reference = {t: v for t, v in reference.items() if t >= evict_before}
+        assert store == reference
+        assert len(store) == len(reference)
+        assert (time_slot in store) == (time_slot in reference)
+        assert store.get(time_slot, -1) == reference.get(time_slot, -1)
+
+
+def test_time_slot_store_evicts_past_time_slots(time_slot_index):
+    store = TimeSlotStore({_time_slot(n): n for n in range(10)},
+                          time_slot_index=time_slot_index)
+    store.delete_before(_time_slot(7))
+    assert list(store.keys()) == [_time_slot(7), _time_slot(8), _time_slot(9)]
+    store.delete_before(_time_slot(20))
+    assert len(store) == 0
+    store[_time_slot(30)] = 1
+    assert dict(store) == {_time_slot(30): 1}
+
+
+def test_time_slot_store_time_string_dict_matches_the_dict_conversion(time_slot_index):
+    values = {_time_slot(n): n * 0.5 for n in range(5)}
+    values[START.add(minutes=7)] = 3.0
+    store = TimeSlotStore(values, time_slot_index=time_slot_index)
+    time_string_dict = store.to_time_string_dict()
+    assert time_string_dict == convert_pendulum_to_str_in_dict(values)
+
+    restored_store = TimeSlotStore(time_slot_index=time_slot_index)
+    restored_store.update_from_time_string_dict(time_string_dict)
+    assert restored_store == convert_str_to_pendulum_in_dict(time_string_dict)
+
+
+def test_time_slot_store_keeps_value_types_and_insertion_order(time_slot_index):
+    values = {_time_slot(3): 10, START.add(minutes=7): "-", _time_slot(1): 0.5,
+              _time_slot(-2): None}
+    store = TimeSlotStore(values, time_slot_index=time_slot_index)
+    assert list(store.items()) == list(values.items())
+    assert type(store[_time_slot(3)]) is int
+    assert list(store.to_time_string_dict().items()) == \
+        list(convert_pendulum_to_str_in_dict(values).items())
+
+    store[_time_slot(3)] = 11
+    del store[_time_slot(1)]
+    store[_time_slot(1)] = 1
+    assert list(store) == [_time_slot(3), START.add(minutes=7), _time_slot(-2), _time_slot(1)]
+
+    restored_store = TimeSlotStore(time_slot_index=time_slot_index)
+    restored_store.update_from_time_string_dict(store.to_time_string_dict())
+    assert list(restored_store.items()) == list(store.items())
+
+
+def test_storage_state_get_and_restore_state_round_trip():
+    state = StorageState()
+    time_slots = [_time_slot(n) for n in range(3)]
+    state.add_default_values_to_state_profiles(time_slots)
+    state.pledged_sell_kWh[time_slots[1]] = 0.25
+    state.offered_history[time_slots[0]] = 0.5
+
+    restored_state = StorageState()
+    restored_state.restore_state(state.get_state())
+    assert restored_state.get_state() == state.get_state()
+    assert restored_state.pledged_sell_kWh[time_slots[1]] == 0.25
+    assert restored_state.offered_history[time_slots[2]] == "-"
+
+
+def test_states_convert_assigned_dicts_to_time_slot_stores():
+    state = StorageState()
+    state.pledged_sell_kWh = {START: 1.0}
+    assert isinstance(state.pledged_sell_kWh, TimeSlotStore)
+    assert state.pledged_sell_kWh[START] == 1.0
@@ -16,9 +16,10 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 import pytest
+from copy import deepcopy
 from unittest.mock import MagicMock, Mock
 from math import isclose
-from pendulum import today, now
+from pendulum import today, now, duration
 from uuid import uuid4
 
 from d3a.models.market.market_structures import Trade
@@ -299,3 +300,84 @@ def test_energy_bills_report_correctly_market_fees(grid_fees):
     assert result["street"]['Accumulated Trades']["market_fee"] == 0.05
     assert result["house1"]['External Trades']["market_fee"] == 0.0
     assert result["house2"]['External Trades']["market_fee"] == 0.0
+
+
+def _walk_areas(area):
+    yield area
+    for child in area.children:
+        yield from _walk_areas(child)
+
+
+def _add_state(area):
+    area.stats = Mock(imported_traded_energy_kwh={}, exported_traded_energy_kwh={})
+    area.state = {"current_tick": 0, "energy_rate": {"00:00": 30}}
+    area.get_state = lambda: deepcopy(area.state)
+
+
+def _apply_result_delta(results, delta):
+    results = deepcopy(results)
+    delta = deepcopy(delta)
+    empty_results = {"offers": [], "bids": [], "trades": []}
+    for key in ("current_market", "current_market_ui_time_slot_str", "status", "progress_info",
+                "simulation_raw_data", "results_area_uuids", "configuration_tree"):
+        if key in delta:
+            results[key] = delta[key]
+    results["bids_offers_trades"] = {
+        area_uuid: delta["bids_offers_trades"].get(area_uuid, empty_results)
+        for area_uuid in results["simulation_raw_data"]}
+    results["simulation_state"]["general"] = delta["simulation_state"]["general"]
+    for area_uuid, changes in delta["simulation_state"]["areas"].items():
+        results["simulation_state"]["areas"].setdefault(area_uuid, {}).update(changes)
+    for area_uuid, keys in delta["simulation_state"].get("removed_area_state_keys", {}).items():
+        for key in keys:
+            results["simulation_state"]["areas"][area_uuid].pop(key)
+    return results
+
+
+def test_incremental_result_deltas_add_up_to_full_results(grid):
+    for area in _walk_areas(grid):
+        _add_state(area)
+    full = SimulationEndpointBuffer("1", {"seed": 0}, grid, False, incremental_results=False)
+    incremental = SimulationEndpointBuffer("1", {"seed": 0}, grid, False,
+                                           incremental_results=True)
+    for buffer in (full, incremental):
+        buffer.market_bills = MagicMock()
+        buffer.kpi = MagicMock()
+    progress_info = Mock(eta=None, elapsed_time=duration(seconds=1), percentage_completed=10)
+
+    results = incremental.generate_intermediate_result_report()
+    assert "is_delta" not in results
+    for slot in range(4):
+        for area in _walk_areas(grid):
+            area.state["current_tick"] = slot
+        if slot == 1:
+            grid.children[0].state["energy_rate"] = {"00:00": 31}
+        if slot == 3:
+            del grid.children[0].state["energy_rate"]
+        if slot == 2:
+            new_area = FakeArea("new house")
+            new_area.parent = grid
+            _add_state(new_area)
+            new_area.state["current_tick"] = slot
+            grid.children.append(new_area)
+        for buffer in (full, incremental):
+            buffer.update_stats(grid, "running", progress_info, {"slot": slot})
+
+        delta = incremental.generate_intermediate_result_report()
+        assert delta["is_delta"] is True
+        assert ("configuration_tree" in delta) == (slot in (0, 2))
+        changed_entries = {key for changes in delta["simulation_state"]["areas"].values()
+                           for key in changes}
+        assert changed_entries == ({"current_tick", "energy_rate"} if slot in (0, 1, 2)
+                                   else {"current_tick"})
+        assert ("removed_area_state_keys" in delta["simulation_state"]) == (slot == 3)
+
+        results = _apply_result_delta(results, delta)
+        expected = full.generate_result_report()
+        assert sorted(results.pop("results_area_uuids")) == \
+            sorted(expected.pop("results_area_uuids"))
+        results["results_area_uuids"] = list(incremental.result_area_uuids)
+        assert {k: v for k, v in results.items() if k != "results_area_uuids"} == expected
+
+    incremental.request_full_snapshot()
+    assert "is_delta" not in incremental.generate_intermediate_result_report()
@@ -15,6 +15,8 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
+from uuid import uuid4
+
 import pytest
 from unittest.mock import MagicMock
 import pendulum
@@ -23,6 +25,7 @@ from d3a.constants import TIME_ZONE
 from d3a.d3a_core.exceptions import MarketException
 from d3a.models.strategy import BidEnabledStrategy, Offers, BaseStrategy
 from d3a.models.market.market_structures import Offer, Trade, Bid
+from d3a.models.market.two_sided_pay_as_bid import TwoSidedPayAsBid
 from d3a_interface.constants_limits import ConstSettings
 
 
@@ -96,7 +99,7 @@ class FakeMarket:
 
     def bid(self, price, energy, buyer, original_bid_price=None,
             buyer_origin=None):
-        return Bid(123, pendulum.now(), price, energy, buyer, original_bid_price,
+        return Bid(str(uuid4()), pendulum.now(), price, energy, buyer, original_bid_price,
                    buyer_origin=buyer_origin)
 
 
@@ -175,6 +178,44 @@ def test_offers_partial_offer(offer1, offers3):
     assert accepted_offer in offers3.sold_in_market('market')
 
 
+def _assert_offer_indices_agree_with_full_scan(offers):
+    sold_ids = {market_id: [o.id for o in sold] for market_id, sold in offers.sold.items()}
+    expected_open = {o: m for o, m in offers.posted.items() if o.id not in sold_ids.get(m, [])}
+    assert offers.open == expected_open
+    assert list(offers.open) == list(expected_open)
+    for market_id in ('market', 'market2', 'market3'):
+        posted = [o for o, m in offers.posted.items() if m == market_id]
+        assert offers.posted_in_market(market_id) == posted
+        assert offers.open_in_market(market_id) == [o for o in posted if o in expected_open]
+        for offer_id in ('id', 'id2', 'id3', 'new_id', 'missing'):
+            assert offers.is_offer_posted(market_id, offer_id) == \
+                any(o.id == offer_id for o in posted)
+
+
+def test_offers_indices_follow_post_sell_split_and_remove(offer1, offers3):
+    _assert_offer_indices_agree_with_full_scan(offers3)
+    accepted_offer = Offer('id', pendulum.now(), 1, 0.6, offer1.seller, 'market')
+    residual_offer = Offer('new_id', pendulum.now(), 1, 1.2, offer1.seller, 'market')
+    offers3.on_offer_split(offer1, accepted_offer, residual_offer, 'market')
+    _assert_offer_indices_agree_with_full_scan(offers3)
+    offers3.on_trade('market', Trade('trade_id', pendulum.now(tz=TIME_ZONE), accepted_offer,
+                                     offer1.seller, 'buyer'))
+    _assert_offer_indices_agree_with_full_scan(offers3)
+    assert not offers3.remove(accepted_offer)
+    _assert_offer_indices_agree_with_full_scan(offers3)
+
+    id2_offer = offers3.posted_in_market('market')[0]
+    new_offer = Offer('id3', pendulum.now(), 2, 1, 'FakeOwner', 'market3')
+    offers3.replace(id2_offer, new_offer, 'market3')
+    _assert_offer_indices_agree_with_full_scan(offers3)
+    assert offers3.posted_offer_energy('market3') == 1
+    assert offers3.open_offer_energy('market') == 1.2
+
+    offers3.posted = {residual_offer: 'market'}
+    _assert_offer_indices_agree_with_full_scan(offers3)
+    assert offers3.open == {residual_offer: 'market'}
+
+
 @pytest.fixture
 def offer_to_accept():
     return Offer('new', pendulum.now(), 1.0, 0.5, 'someone')
@@ -245,6 +286,26 @@ def test_add_bid_to_bought(base):
     assert base.get_traded_bids_from_market(market) == [bid]
 
 
+def test_post_first_bid_is_skipped_while_a_bid_of_the_strategy_is_in_the_market(base):
+    market = TwoSidedPayAsBid(time_slot=pendulum.now())
+    base.area._market = market
+    base.owner = MagicMock()
+    base.owner.name = 'FakeOwner'
+    base.bid_update = MagicMock(initial_rate={market.time_slot: 20})
+    market.bid(1, 1, 'other buyer', 'other buyer')
+
+    first_bid = base.post_first_bid(market, 500)
+    assert first_bid.price == 10 and first_bid.energy == 0.5
+    assert base.is_bid_posted(market, first_bid.id)
+    # Bids that are still in the market are found after the posted bids have been reset
+    base._bids = {}
+    assert base.post_first_bid(market, 500) is None
+
+    market.delete_bid(first_bid.id)
+    assert base.post_first_bid(market, 500) is not None
+    assert len(market.bids) == 2
+
+
 def test_bid_events_fail_for_one_sided_market(base):
     ConstSettings.IAASettings.MARKET_TYPE = 1
     test_bid = Bid("123", pendulum.now(), 12, 23, 'A', 'B')
@@ -262,7 +323,7 @@ def test_bid_deleted_removes_bid_from_posted(base):
     test_bid = Bid("123", pendulum.now(), 12, 23, base.owner.name, 'B')
     market = FakeMarket(raises=False, id=21)
     base.area._market = market
-    base._bids[market.id] = [test_bid]
+    base.add_bid_to_posted(market.id, test_bid)
     base.event_bid_deleted(market_id=21, bid=test_bid)
     assert base.get_posted_bids(market) == []
 
@@ -274,7 +335,6 @@ def test_bid_split_adds_bid_to_posted(base):
     residual_bid = Bid("456", pendulum.now(), 4, 4, base.owner.name, 'B')
     market = FakeMarket(raises=False, id=21)
     base.area._market = market
-    base._bids[market.id] = []
     base.event_bid_split(market_id=21, original_bid=test_bid, accepted_bid=accepted_bid,
                          residual_bid=residual_bid)
     assert base.get_posted_bids(market) == [accepted_bid, residual_bid]
@@ -288,7 +348,7 @@ def test_bid_traded_moves_bid_from_posted_to_traded(base):
     trade.offer = test_bid
     market = FakeMarket(raises=False, id=21)
     base.area._market = market
-    base._bids[market.id] = [test_bid]
+    base.add_bid_to_posted(market.id, test_bid)
     base.event_bid_traded(market_id=21, bid_trade=trade)
     assert base.get_posted_bids(market) == []
     assert base.get_traded_bids_from_market(market) == [test_bid]
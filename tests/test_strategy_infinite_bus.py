@@ -314,6 +314,6 @@ def testing_event_market_cycle_posting_bids(bus_test4, area_test4):
     bus_test4.event_activate()
     bus_test4.event_market_cycle()
     assert len(bus_test4._bids) == 1
-    assert bus_test4._bids[area_test4.test_market.id][-1].energy == sys.maxsize
-    assert bus_test4._bids[area_test4.test_market.id][-1].price == 25 * sys.maxsize
+    assert bus_test4.get_posted_bids(area_test4.test_market)[-1].energy == sys.maxsize
+    assert bus_test4.get_posted_bids(area_test4.test_market)[-1].price == 25 * sys.maxsize
     ConstSettings.IAASettings.MARKET_TYPE = 1
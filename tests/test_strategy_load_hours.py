@@ -342,7 +342,7 @@ def test_event_bid_traded_removes_bid_for_partial_and_non_trade(load_hours_strat
     load_hours_strategy_test5.area.markets = {TIME: trade_market}
     load_hours_strategy_test5.event_market_cycle()
     # Get the bid that was posted on event_market_cycle
-    bid = list(load_hours_strategy_test5._bids.values())[0][0]
+    bid = load_hours_strategy_test5.get_posted_bids(trade_market)[0]
 
     # Increase energy requirement to cover the energy from the bid
     load_hours_strategy_test5.state._energy_requirement_Wh[TIME] = 1000
@@ -365,7 +365,7 @@ def test_event_bid_traded_removes_bid_from_pending_if_energy_req_0(load_hours_st
     load_hours_strategy_test5.event_activate()
     load_hours_strategy_test5.area.markets = {TIME: trade_market}
     load_hours_strategy_test5.event_market_cycle()
-    bid = list(load_hours_strategy_test5._bids.values())[0][0]
+    bid = load_hours_strategy_test5.get_posted_bids(trade_market)[0]
     # Increase energy requirement to cover the energy from the bid + threshold
     load_hours_strategy_test5.state._energy_requirement_Wh[TIME] = bid.energy * 1000 + 0.000009
     trade = Trade('idt', None, bid, 'B', load_hours_strategy_test5.owner.name, residual=True)
@@ -518,8 +518,8 @@ def load_hours_strategy_test3(area_test1):
 
 def test_assert_if_trade_rate_is_higher_than_bid_rate(load_hours_strategy_test3):
     market_id = 0
-    load_hours_strategy_test3._bids[market_id] = \
-        [Bid("bid_id", now(), 30, 1, buyer="FakeArea")]
+    load_hours_strategy_test3.add_bid_to_posted(
+        market_id, Bid("bid_id", now(), 30, 1, buyer="FakeArea"))
     expensive_bid = Bid("bid_id", now(), 31, 1, buyer="FakeArea")
     trade = Trade("trade_id", "time", expensive_bid, load_hours_strategy_test3, "buyer")
 
@@ -119,6 +119,14 @@ class FakeMarket:
     def delete_offer(self, offer_id):
         return
 
+    def update_offer(self, offer_id, price, original_offer_price=None):
+        existing_offer = self.offers[offer_id]
+        offer = Offer(offer_id, pendulum.now(), price, existing_offer.energy,
+                      existing_offer.seller, original_offer_price,
+                      seller_origin=existing_offer.seller_origin)
+        self.offers[offer.id] = offer
+        return offer
+
 
 class FakeMarketTimeSlot(FakeMarket):
     def __init__(self, time_slot):
@@ -884,8 +884,7 @@ def test_assert_if_trade_rate_is_lower_than_offer_rate(storage_test11):
 
 def test_assert_if_trade_rate_is_higher_than_bid_rate(storage_test11):
     market_id = "2"
-    storage_test11._bids[market_id] = \
-        [Bid("bid_id", now(), 30, 1, buyer="FakeArea")]
+    storage_test11.add_bid_to_posted(market_id, Bid("bid_id", now(), 30, 1, buyer="FakeArea"))
     expensive_bid = Bid("bid_id", now(), 31, 1, buyer="FakeArea")
     trade = Trade("trade_id", "time", expensive_bid, storage_test11, "buyer")
 
@@ -0,0 +1,96 @@
+"""
+Copyright 2018 Grid Singularity
+This file is part of D3A.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+import csv
+import json
+import os
+from time import sleep
+
+from d3a.d3a_core.tick_profiler import TickProfiler
+from d3a.events.event_structures import AreaEvent
+
+
+class FakeStrategy:
+    pass
+
+
+class FakeMarket:
+    pass
+
+
+def _profile_one_slot(profiler):
+    profiler.start_slot(0, "2021-01-01T00:00")
+    profiler.start_tick(0)
+    with profiler.measure("tick_and_dispatch"):
+        with profiler.measure_event("strategy", AreaEvent.TICK, area="House 1",
+                                    strategy=FakeStrategy()):
+            sleep(0.01)
+        with profiler.measure("match_offers_bids", area="Grid", market_type=FakeMarket()):
+            sleep(0.01)
+    profiler.end_tick()
+    profiler.end_slot(memory_mb=100.0)
+
+
+def test_tick_profiler_does_not_record_if_disabled():
+    profiler = TickProfiler()
+    profiler.reset(enabled=False)
+    _profile_one_slot(profiler)
+    assert profiler.timeline == []
+
+
+def test_tick_profiler_records_exclusive_time_per_phase_and_attribution():
+    profiler = TickProfiler()
+    profiler.reset(enabled=True)
+    _profile_one_slot(profiler)
+
+    assert len(profiler.timeline) == 1
+    slot = profiler.timeline[0]
+    assert slot["slot_number"] == 0
+    assert slot["memory_mb"] == 100.0
+    assert set(slot["phases"].keys()) == \
+        {"tick_and_dispatch", "strategy_tick", "match_offers_bids"}
+    # nested phases are not accounted for in the enclosing phase
+    assert slot["phases"]["tick_and_dispatch"] < slot["phases"]["strategy_tick"]
+    assert slot["phases"]["strategy_tick"] >= 0.01
+    assert slot["areas"].keys() == {"House 1", "Grid"}
+    assert slot["strategies"].keys() == {"FakeStrategy"}
+    assert slot["market_types"].keys() == {"FakeMarket"}
+
+    assert len(slot["ticks"]) == 1
+    tick = slot["ticks"][0]
+    assert sum(tick["phases"].values()) <= tick["duration_s"]
+    assert sum(tick["phases"].values()) >= 0.02
+
+
+def test_tick_profiler_exports_json_and_csv(tmpdir):
+    profiler = TickProfiler()
+    profiler.reset(enabled=True)
+    _profile_one_slot(profiler)
+    _profile_one_slot(profiler)
+    profiler.export(str(tmpdir))
+
+    with open(os.path.join(str(tmpdir), "tick_profile.json")) as json_file:
+        profile = json.load(json_file)
+    assert len(profile["slots"]) == 2
+    assert profile["totals"]["strategies"]["FakeStrategy"] == \
+        sum(slot["strategies"]["FakeStrategy"] for slot in profile["slots"])
+
+    with open(os.path.join(str(tmpdir), "tick_profile.csv")) as csv_file:
+        rows = list(csv.DictReader(csv_file))
+    assert {row["category"] for row in rows} == \
+        {"slot", "phases", "areas", "strategies", "market_types"}
+    assert len([row for row in rows if row["category"] == "slot"]) == 2
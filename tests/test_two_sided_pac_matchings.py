@@ -18,7 +18,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import unittest
 import pendulum
 from parameterized import parameterized
-from d3a.models.market.market_structures import Bid, Offer, BidOfferMatch, Trade
+from d3a.models.market.market_structures import Bid, Offer
 from d3a.models.market.two_sided_pay_as_clear import TwoSidedPayAsClear
 
 
@@ -213,45 +213,20 @@ class TestCreateBidOfferMatchings(unittest.TestCase):
         self.validate_matching(matchings[3], 4, 'offer_id3', 'bid_id')
         self.validate_matching(matchings[4], 5, 'offer_id4', 'bid_id')
 
-    def test_matching_list_gets_updated_with_residual_offers(self):
-        matchings = [
-            BidOfferMatch(offer=Offer('offer_id', pendulum.now(), 1, 1, 'S'), offer_energy=1,
-                          bid=Bid('bid_id', pendulum.now(), 1, 1, 'B', 'S'), bid_energy=1),
-            BidOfferMatch(offer=Offer('offer_id2', pendulum.now(), 2, 2, 'S'), offer_energy=2,
-                          bid=Bid('bid_id2', pendulum.now(), 2, 2, 'B', 'S'), bid_energy=2)
-        ]
-
-        offer_trade = Trade('trade', 1, Offer('offer_id', pendulum.now(), 1, 1, 'S'), 'S', 'B',
-                            residual=Offer('residual_offer', pendulum.now(), 0.5, 0.5, 'S'))
-        bid_trade = Trade('bid_trade', 1, Bid('bid_id2', pendulum.now(), 1, 1, 'S', 'B'), 'S', 'B',
-                          residual=Bid('residual_bid_2', pendulum.now(), 1, 1, 'S', 'B'))
-
-        matchings = TwoSidedPayAsClear._replace_offers_bids_with_residual_in_matching_list(
-            matchings, 0, offer_trade, bid_trade
-        )
-        assert len(matchings) == 2
-        assert matchings[0].offer.id == 'residual_offer'
-        assert matchings[1].bid.id == 'residual_bid_2'
-
-    def test_matching_list_affects_only_matches_after_start_index(self):
-        matchings = [
-            BidOfferMatch(offer=Offer('offer_id', pendulum.now(), 1, 1, 'S'), offer_energy=1,
-                          bid=Bid('bid_id', pendulum.now(), 1, 1, 'B', 'S'), bid_energy=1),
-            BidOfferMatch(offer=Offer('offer_id2', pendulum.now(), 2, 2, 'S'), offer_energy=2,
-                          bid=Bid('bid_id2', pendulum.now(), 2, 2, 'B', 'S'), bid_energy=2),
-            BidOfferMatch(offer=Offer('offer_id', pendulum.now(), 1, 1, 'S'), offer_energy=1,
-                          bid=Bid('bid_id', pendulum.now(), 1, 1, 'B', 'S'), bid_energy=1)
-        ]
-
-        offer_trade = Trade('trade', 1, Offer('offer_id', pendulum.now(), 1, 1, 'S'), 'S', 'B',
-                            residual=Offer('residual_offer', pendulum.now(), 0.5, 0.5, 'S'))
-        bid_trade = Trade('bid_trade', 1, Bid('bid_id2', pendulum.now(), 1, 1, 'S', 'B'), 'S', 'B',
-                          residual=Bid('residual_bid_2', pendulum.now(), 1, 1, 'S', 'B'))
-
-        matchings = TwoSidedPayAsClear._replace_offers_bids_with_residual_in_matching_list(
-            matchings, 1, offer_trade, bid_trade
-        )
-        assert len(matchings) == 3
-        assert matchings[0].offer.id == 'offer_id'
-        assert matchings[1].bid.id == 'residual_bid_2'
-        assert matchings[2].offer.id == 'residual_offer'
+    def test_resolve_residual_returns_offer_if_not_partially_traded(self):
+        offer = Offer('offer_id', pendulum.now(), 1, 1, 'S')
+        residuals = {'other_offer': Offer('residual_offer', pendulum.now(), 0.5, 0.5, 'S')}
+        assert TwoSidedPayAsClear._resolve_residual(offer, residuals) is offer
+
+    def test_resolve_residual_follows_consecutive_partial_trades(self):
+        offer = Offer('offer_id', pendulum.now(), 1, 1, 'S')
+        residual = Offer('residual_offer', pendulum.now(), 0.5, 0.5, 'S')
+        residual_of_residual = Offer('residual_offer_2', pendulum.now(), 0.2, 0.2, 'S')
+        residuals = {'offer_id': residual, 'residual_offer': residual_of_residual}
+        assert TwoSidedPayAsClear._resolve_residual(offer, residuals) is residual_of_residual
+        assert TwoSidedPayAsClear._resolve_residual(residual, residuals) is residual_of_residual
+
+        bid = Bid('bid_id2', pendulum.now(), 2, 2, 'B', 'S')
+        residual_bid = Bid('residual_bid_2', pendulum.now(), 1, 1, 'B', 'S')
+        assert TwoSidedPayAsClear._resolve_residual(bid, {'bid_id2': residual_bid}) is \
+            residual_bid
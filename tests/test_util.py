@@ -16,10 +16,16 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 from d3a.d3a_core.cli import available_simulation_scenarios
-from d3a.d3a_core.util import validate_const_settings_for_simulation
+from d3a.d3a_core.util import validate_const_settings_for_simulation, ProfileDict, \
+    find_object_of_same_weekday_and_time
+from d3a.constants import TIME_ZONE
 from d3a_interface.constants_limits import ConstSettings
 from d3a import setup as d3a_setup
 import os
+import random
+from unittest.mock import patch
+
+import pendulum
 from parameterized import parameterized
 import pytest
 
@@ -64,3 +70,56 @@ def test_validate_one_sided_market_when_pricing_scheme_on_comparison(market_type
     assert ConstSettings.IAASettings.MARKET_TYPE == 1
     assert ConstSettings.IAASettings.AlternativePricing.PRICING_SCHEME == alt_pricing
     assert ConstSettings.IAASettings.AlternativePricing.COMPARE_PRICING_SCHEMES
+
+
+def _canary_profile(start, days, step_minutes):
+    random.seed(7)
+    return {start.add(minutes=minutes): random.random()
+            for minutes in range(0, days * 24 * 60, step_minutes)}
+
+
+@pytest.mark.parametrize("days, step_minutes", [(7, 15), (3, 60), (10, 15)])
+def test_find_object_of_same_weekday_and_time_compiled_profile_matches_canary_lookup(
+        days, step_minutes):
+    start = pendulum.datetime(2021, 3, 3, tz=TIME_ZONE)
+    plain_profile = _canary_profile(start, days, step_minutes)
+    compiled_profile = ProfileDict(plain_profile)
+    time_slots = [start.add(minutes=minutes)
+                  for minutes in range(-7 * 24 * 60, 21 * 24 * 60, 15)]
+    with patch("d3a.constants.IS_CANARY_NETWORK", True):
+        for time_slot in time_slots:
+            assert find_object_of_same_weekday_and_time(
+                compiled_profile, time_slot, ignore_not_found=True) == \
+                find_object_of_same_weekday_and_time(
+                    plain_profile, time_slot, ignore_not_found=True)
+
+
+def test_find_object_of_same_weekday_and_time_recompiles_modified_profile():
+    start = pendulum.datetime(2021, 3, 3, tz=TIME_ZONE)
+    profile = ProfileDict(_canary_profile(start, 7, 60))
+    next_week = start.add(weeks=1, hours=2)
+    with patch("d3a.constants.IS_CANARY_NETWORK", True):
+        assert find_object_of_same_weekday_and_time(profile, next_week) == \
+            profile[start.add(hours=2)]
+        profile[start.add(hours=2)] = 42
+        assert find_object_of_same_weekday_and_time(profile, next_week) == 42
+        profile.pop(start.add(hours=2))
+        assert find_object_of_same_weekday_and_time(
+            profile, next_week, ignore_not_found=True) is None
+    assert find_object_of_same_weekday_and_time(profile, start.add(hours=3)) == \
+        profile[start.add(hours=3)]
+
+
+def test_profile_dict_updates_compiled_profile_in_place():
+    start = pendulum.datetime(2021, 3, 3, tz=TIME_ZONE)
+    profile = ProfileDict(_canary_profile(start, 7, 60))
+    next_week = start.add(weeks=1, hours=2)
+    with patch("d3a.constants.IS_CANARY_NETWORK", True):
+        compiled_profile = profile.weekday_and_time_profile()
+        profile_copy = profile.copy()
+        profile_copy[start.add(hours=2)] = 42
+        assert profile_copy.weekday_and_time_profile() is not compiled_profile
+        assert find_object_of_same_weekday_and_time(profile_copy, next_week) == 42
+        assert find_object_of_same_weekday_and_time(profile, next_week) == \
+            profile[start.add(hours=2)]
+        assert profile.weekday_and_time_profile() is compiled_profile